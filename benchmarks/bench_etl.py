@@ -0,0 +1,245 @@
+"""Benchmark suite for the ETL hot paths.
+
+Times extract_pdf_text, parse_transcript, load_to_warehouse (load_batch),
+_update_prestasi_semester and populate_analisis_matakuliah separately on
+synthetic transcripts at several population sizes, and writes the results
+as JSON so runs can be compared between versions.
+
+    python benchmarks/bench_etl.py [--students 1000 10000 100000] [--batch-size 100]
+                                   [--database nilai_bench] [--output results.json] [--compare baseline.json]
+
+The database stages run against a MySQL/MariaDB server by default, or an
+embedded SQLite file with --backend sqlite; the benchmark database is dropped
+and recreated for every population size. Without a server (or with --no-db)
+those stages are recorded as skipped.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import itertools
+import subprocess
+from datetime import datetime
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import mysql.connector
+
+from etl import DB_CONFIG, MySQLBackend, SQLiteBackend, TranscriptETL, DB_ERRORS
+from synth_transcripts import generate_transcripts, write_pdf
+
+# Setiap nilai digeser satu tingkat, jadi rerun_prestasi menghitung ulang semester yang benar-benar berubah.
+REGRADE = {'A': 'AB', 'AB': 'B', 'B': 'BC', 'BC': 'C', 'C': 'D', 'D': 'E', 'E': 'A'}
+
+STAGES = ['extract_pdf_text', 'parse_transcript', 'load_to_warehouse', '_update_prestasi_semester',
+          'populate_analisis_matakuliah', 'populate_analisis_matakuliah(full_rebuild)']
+
+class StageTimer:
+    """Accumulates wall time and item counts for one stage"""
+    def __init__(self):
+        self.seconds = 0.0
+        self.items = 0
+
+    def time(self, func, *args, items: int = 1, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.seconds += time.perf_counter() - start
+        self.items += items
+        return result
+
+    def result(self) -> Dict:
+        return {'status': 'ok', 'items': self.items, 'seconds': round(self.seconds, 6),
+                'per_item_ms': round(self.seconds * 1e3 / self.items, 4) if self.items else None,
+                'items_per_s': round(self.items / self.seconds, 2) if self.seconds else None}
+
+def skipped(reason: str) -> Dict:
+    return {'status': 'skipped', 'reason': reason}
+
+def git_version() -> Dict:
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=root, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=root, capture_output=True, text=True).stdout.strip())
+        return {'git_commit': commit, 'git_dirty': dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {'git_commit': None, 'git_dirty': None}
+
+def reset_database(db_config: Dict) -> Optional[TranscriptETL]:
+    """Drop and recreate the benchmark database, returning a connected ETL with the schema in place"""
+    if 'sqlite_path' in db_config:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(db_config['sqlite_path'] + suffix):
+                os.remove(db_config['sqlite_path'] + suffix)
+        backend = SQLiteBackend(db_config['sqlite_path'])
+    else:
+        server_config = {k: v for k, v in db_config.items() if k != 'database'}
+        connection = mysql.connector.connect(**server_config)
+        try:
+            cursor = connection.cursor()
+            cursor.execute(f"DROP DATABASE IF EXISTS {db_config['database']}")
+            cursor.execute(f"CREATE DATABASE {db_config['database']}")
+            cursor.close()
+        finally:
+            connection.close()
+        backend = MySQLBackend(db_config)
+    etl = TranscriptETL(db_config, backend)
+    if not etl.connect_db() or not etl.create_warehouse_schema():
+        etl.close_connection()
+        return None
+    return etl
+
+def bench_extract(args, population: int) -> Dict:
+    """Time extract_pdf_text on a sample of generated PDFs (writing them is not timed)"""
+    sample = min(args.pdf_sample, population)
+    if not sample:
+        return skipped("--pdf-sample is 0")
+    timer, etl = StageTimer(), TranscriptETL({})
+    with tempfile.TemporaryDirectory() as folder:
+        paths = []
+        for text, expected in generate_transcripts(sample, args.courses, args.years, seed=args.seed):
+            paths.append(os.path.join(folder, f"{expected['student']['nrp']}.pdf"))
+            write_pdf(paths[-1], text)
+        for path in paths:
+            timer.time(etl.extract_pdf_text, path)
+    return timer.result()
+
+def bench_population(args, population: int, db_config: Optional[Dict]) -> Dict:
+    stages = {'extract_pdf_text': bench_extract(args, population)}
+    parse_timer, load_timer, prestasi_timer = StageTimer(), StageTimer(), StageTimer()
+    parser_etl = TranscriptETL({})
+
+    etl, db_reason = None, "--no-db" if db_config is None else None
+    if db_config is not None:
+        try:
+            etl = reset_database(db_config)
+            db_reason = None if etl else "could not create the benchmark schema"
+        except DB_ERRORS as err:
+            db_reason = f"database unavailable: {err}"
+
+    # Transkrip dibuat, di-parse dan dimuat per batch supaya memori tetap kecil pada 100k mahasiswa.
+    transcripts = generate_transcripts(population, args.courses, args.years, seed=args.seed)
+    courses_total = 0
+    try:
+        while True:
+            chunk = list(itertools.islice(transcripts, args.batch_size))
+            if not chunk:
+                break
+            batch = [parse_timer.time(parser_etl.parse_transcript, text) for text, _ in chunk]
+            courses_total += sum(len(data['courses']) for data in batch)
+            if etl is None:
+                continue
+            if args.batch_size == 1:
+                ok = load_timer.time(etl.load_to_warehouse, batch[0])
+            else:
+                ok = load_timer.time(etl.load_batch, batch, items=len(batch))
+            if not ok:
+                raise RuntimeError("load_batch failed; see transcript_etl.log")
+            rerun_prestasi(etl, batch, prestasi_timer)
+
+        stages['parse_transcript'] = parse_timer.result()
+        if etl is None:
+            for stage in STAGES[2:]:
+                stages[stage] = skipped(db_reason)
+        else:
+            stages['load_to_warehouse'] = load_timer.result()
+            stages['_update_prestasi_semester'] = prestasi_timer.result()
+            touched = len(etl.touched_analisis)
+            timer = StageTimer()
+            timer.time(etl.populate_analisis_matakuliah, items=touched)
+            stages['populate_analisis_matakuliah'] = timer.result()
+            timer = StageTimer()
+            timer.time(etl.populate_analisis_matakuliah, full_rebuild=True, items=touched)
+            stages['populate_analisis_matakuliah(full_rebuild)'] = timer.result()
+    finally:
+        if etl:
+            etl.close_connection()
+    return {'students': population, 'courses': courses_total, 'stages': stages}
+
+def rerun_prestasi(etl: TranscriptETL, batch: List[Dict], timer: StageTimer):
+    """Recompute Fact_Prestasi_Semester for an already loaded batch with every grade shifted, in its own transaction.
+
+    Unchanged semesters are skipped without writing, so the grades are shifted to time the
+    upserts too (key lookup and regrading not timed).
+    """
+    cursor = etl.connection.cursor(dictionary=True)
+    try:
+        nrps = [data['student']['nrp'] for data in batch]
+        cursor.execute(f"SELECT id_mahasiswa, NRP FROM Dim_Mahasiswa WHERE NRP IN ({', '.join(['%s'] * len(nrps))})", nrps)
+        keys = {row['NRP']: row['id_mahasiswa'] for row in cursor.fetchall()}
+        students = [(keys[data['student']['nrp']], [dict(course, huruf_nilai=REGRADE[course['huruf_nilai']]) for course in data['courses']])
+                    for data in batch]
+        timer.time(lambda: (etl._update_prestasi_semester(cursor, students), etl._commit_load()), items=len(batch))
+    finally:
+        cursor.close()
+
+def print_table(results: List[Dict], baseline: Optional[Dict]):
+    previous = {(r['students'], stage): data for r in (baseline or {}).get('results', []) for stage, data in r['stages'].items()}
+    header = f"{'students':>9} {'stage':<44} {'items':>9} {'seconds':>10} {'ms/item':>9}"
+    print(header + (f" {'vs base':>8}" if baseline else ''))
+    for result in results:
+        for stage in STAGES:
+            data = result['stages'].get(stage)
+            if not data:
+                continue
+            if data['status'] != 'ok':
+                print(f"{result['students']:>9} {stage:<44} skipped ({data['reason']})")
+                continue
+            line = f"{result['students']:>9} {stage:<44} {data['items']:>9} {data['seconds']:>10.3f} {data['per_item_ms'] or 0:>9.3f}"
+            base = previous.get((result['students'], stage))
+            if baseline and base and base.get('status') == 'ok' and data['seconds']:
+                line += f" {base['seconds'] / data['seconds']:>7.2f}x"
+            print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--students', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--courses', type=int, default=48, help="Courses per student")
+    parser.add_argument('--years', type=int, default=4, help="Study years per student")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--batch-size', type=int, default=100, help="Transcripts per load_batch call (1 = load_to_warehouse)")
+    parser.add_argument('--pdf-sample', type=int, default=200, help="PDFs generated per size to time extract_pdf_text")
+    parser.add_argument('--backend', choices=['mysql', 'sqlite'], default='mysql')
+    parser.add_argument('--sqlite-path', default=os.path.join(tempfile.gettempdir(), 'nilai_bench.sqlite'), help="Scratch database file for --backend sqlite")
+    parser.add_argument('--host', default=DB_CONFIG['host'])
+    parser.add_argument('--user', default=DB_CONFIG['user'])
+    parser.add_argument('--password', default=DB_CONFIG['password'])
+    parser.add_argument('--database', default='nilai_bench', help="Scratch database, dropped and recreated per size")
+    parser.add_argument('--no-db', action='store_true', help="Skip the database stages")
+    parser.add_argument('--output', default=None, help="JSON results file (default: benchmarks/results/etl-<timestamp>.json)")
+    parser.add_argument('--compare', default=None, help="Previous JSON results to compare against")
+    args = parser.parse_args()
+
+    if args.database == DB_CONFIG['database']:
+        sys.exit(f"Refusing to drop the production database '{args.database}'; pick another --database")
+    if args.no_db:
+        db_config = None
+    elif args.backend == 'sqlite':
+        db_config = {'sqlite_path': args.sqlite_path}
+    else:
+        db_config = {'host': args.host, 'user': args.user, 'password': args.password, 'database': args.database}
+
+    started = datetime.now()
+    results = [bench_population(args, population, db_config) for population in args.students]
+    report = {'benchmark': 'etl', 'started_at': started.isoformat(timespec='seconds'), **git_version(),
+              'python': platform.python_version(), 'platform': platform.platform(),
+              'config': {k: getattr(args, k) for k in ('backend', 'courses', 'years', 'seed', 'batch_size', 'pdf_sample')},
+              'results': results}
+
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results', f"etl-{started:%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump(report, file, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+    print_table(results, baseline)
+    print(f"Results written to {output}")
+
+if __name__ == "__main__":
+    main()
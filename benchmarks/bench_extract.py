@@ -0,0 +1,76 @@
+"""PDF text extraction per engine, cold and from the page cache.
+
+Writes synthetic transcript PDFs to a scratch folder and extracts them with
+every installed PDF engine, first into an empty page cache (cold) and then
+again from it (warm), the way a re-run after a parsing rule fix would. Checks
+that each engine's text parses into the transcripts that were generated.
+
+    python benchmarks/bench_extract.py [--students 200] [--engines pypdf2 pymupdf] [--output results.json]
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from etl import PDF_ENGINES, PageTextExtractor, TranscriptETL
+from bench_etl import git_version
+from synth_transcripts import generate_transcripts, write_pdf
+
+def bench_engine(engine: str, paths, expected, cache_path: str):
+    extractor = PageTextExtractor(engine, cache_path)
+    parser_etl = TranscriptETL({})
+    result = {'engine': extractor.engine.name}
+    for label in ('cold', 'warm'):
+        start = time.perf_counter()
+        texts = []
+        for path in paths:
+            with open(path, 'rb') as file:
+                texts.append(extractor.extract(file.read())[0])
+        seconds = time.perf_counter() - start
+        result[label] = {'seconds': round(seconds, 6), 'pdfs_per_s': round(len(paths) / seconds, 2) if seconds else None}
+    extractor.cache.close()
+    result['parsed_ok'] = sum(parser_etl.parse_transcript(text) == data for text, data in zip(texts, expected))
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--students', type=int, default=200)
+    parser.add_argument('--courses', type=int, default=48, help="Courses per student")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--engines', nargs='+', default=[engine.name for engine in PDF_ENGINES if engine.available()])
+    parser.add_argument('--output', default=None, help="JSON results file (default: benchmarks/results/extract-<timestamp>.json)")
+    args = parser.parse_args()
+
+    started = datetime.now()
+    results = []
+    print(f"{'engine':>8} {'pdfs':>6} {'cold s':>8} {'warm s':>8} {'speedup':>8} {'parsed':>7}")
+    with tempfile.TemporaryDirectory() as folder:
+        paths, expected = [], []
+        for text, data in generate_transcripts(args.students, args.courses, seed=args.seed):
+            paths.append(os.path.join(folder, f"{data['student']['nrp']}.pdf"))
+            write_pdf(paths[-1], text)
+            expected.append(data)
+        for engine in args.engines:
+            result = bench_engine(engine, paths, expected, os.path.join(folder, f"cache-{engine}.sqlite"))
+            results.append(result)
+            cold, warm = result['cold']['seconds'], result['warm']['seconds']
+            print(f"{result['engine']:>8} {len(paths):>6} {cold:>8.3f} {warm:>8.3f} {cold / warm if warm else 0:>7.1f}x {result['parsed_ok']:>7}")
+
+    report = {'benchmark': 'extract', 'started_at': started.isoformat(timespec='seconds'), **git_version(),
+              'python': platform.python_version(), 'platform': platform.platform(),
+              'config': {k: getattr(args, k) for k in ('students', 'courses', 'seed')},
+              'results': results}
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results', f"extract-{started:%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Micro-benchmark for the page text normalizer used by extract_pdf_text.
+
+Checks that TextNormalizer gives byte-identical output to the previous
+per-page cleanup on a corpus of sample transcript pages (plus randomized
+fragments), then reports the per-page time of both implementations.
+
+    python benchmarks/bench_normalizer.py [--pages 200] [--repeat 5]
+"""
+import os
+import re
+import sys
+import random
+import argparse
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from etl import TEXT_NORMALIZER, CONJUNCTIONS
+
+COURSE_WORDS = ['Pemrograman', 'Dasar', 'Sistem', 'Basis', 'Data', 'Matematika', 'Fisika', 'Kimia', 'Analisis',
+                'Perancangan', 'Jaringan', 'Komputer', 'Interaksi', 'Manusia', 'Administrasi', 'Struktur',
+                'Algoritma', 'Kewarganegaraan', 'Agama', 'Bahasa', 'Inggris', 'Enterprise', 'Statistika']
+
+def legacy_normalize_page(page_text: str) -> str:
+    """Cleanup exactly as extract_pdf_text did it before TextNormalizer"""
+    cleaned_text = re.sub(r'([a-zA-Z])\s([a-z])', r'\1\2', page_text)
+    for word in CONJUNCTIONS:
+        pattern = re.compile(f'([a-z])({word}\\b)', re.IGNORECASE)
+        cleaned_text = pattern.sub(r'\1 \2', cleaned_text)
+    cleaned_text = re.sub(r"([a-z])([A-Z])", r"\1 \2", cleaned_text)
+    cleaned_text = re.sub(r'\s+', ' ', cleaned_text).strip()
+    return cleaned_text
+
+def _mangle(text: str, rng: random.Random) -> str:
+    """Imitate PyPDF2 artifacts: split words, glued words and glued conjunctions"""
+    out = []
+    for token in text.split(' '):
+        roll = rng.random()
+        if roll < 0.15 and len(token) > 4:
+            cut = rng.randint(1, len(token) - 1)
+            token = token[:cut] + ' ' + token[cut:]
+        elif roll < 0.25:
+            token = token + rng.choice(CONJUNCTIONS)
+        out.append(token)
+    return ' '.join(out)
+
+def sample_pages(count: int, seed: int = 0):
+    """Build raw transcript pages similar to what PyPDF2 returns"""
+    rng = random.Random(seed)
+    pages = []
+    for n in range(count):
+        lines = [f"NRP / Nama 50262{n:05d} / Mahasiswa Contoh {n} SKS Tempuh / SKS Lulus 144 / 140",
+                 "Status Normal/Aktif IPK 3.51 Tahap: Persiapan"]
+        for i in range(rng.randint(20, 45)):
+            name = ' '.join(rng.choice(COURSE_WORDS) for _ in range(rng.randint(1, 4)))
+            year = rng.randint(2019, 2024)
+            lines.append(f"IF{184100 + i} {name} {rng.randint(2, 4)} {year}/{rng.choice(['Gs', 'Gn'])}/{rng.choice(['A', 'AB', 'B'])} {rng.choice(['A', 'AB', 'B', 'BC', 'C', 'D', 'E'])}")
+        lines.append("IP Tahap Persiapan : 3.45 Total Sks Tahap Persiapan : 36")
+        pages.append('\n'.join(_mangle(line, rng) for line in lines))
+    return pages
+
+def random_fragments(count: int, seed: int = 1):
+    """Short random strings dense in conjunctions, case changes and whitespace"""
+    rng = random.Random(seed)
+    alphabet = list('adnturskepiADNTURSKEPI  \n\t.,1') + CONJUNCTIONS + ['Ke', 'DAN', 'Atau']
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 30))) for _ in range(count)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    pages = sample_pages(args.pages)
+    for text in pages + random_fragments(50000):
+        expected, actual = legacy_normalize_page(text), TEXT_NORMALIZER.normalize_page(text)
+        if expected != actual:
+            sys.exit(f"Output mismatch for {text!r}:\n  legacy: {expected!r}\n  new:    {actual!r}")
+    legacy_full = ''.join(legacy_normalize_page(p) + "\n" for p in pages)
+    assert TEXT_NORMALIZER.normalize_pages(pages) == legacy_full
+    print(f"Output identical on {len(pages)} pages and 50000 random fragments")
+
+    legacy_time = min(timeit.repeat(lambda: [legacy_normalize_page(p) for p in pages], number=1, repeat=args.repeat))
+    new_time = min(timeit.repeat(lambda: TEXT_NORMALIZER.normalize_pages(pages), number=1, repeat=args.repeat))
+    print(f"legacy:         {legacy_time / len(pages) * 1e6:8.1f} us/page")
+    print(f"TextNormalizer: {new_time / len(pages) * 1e6:8.1f} us/page")
+    print(f"speedup:        {legacy_time / new_time:8.2f}x")
+
+if __name__ == "__main__":
+    main()
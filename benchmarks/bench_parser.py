@@ -0,0 +1,116 @@
+"""Benchmark for the single-pass transcript parser.
+
+Checks that TranscriptScanner (used by parse_transcript) returns the same
+student header and course records as the previous regex cascade, on long
+multi-page transcripts and on randomized token soup, then times both.
+
+    python benchmarks/bench_parser.py [--courses 40 400 4000] [--repeat 5]
+"""
+import os
+import re
+import sys
+import random
+import argparse
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from etl import TRANSCRIPT_SCANNER
+
+COURSE_WORDS = ['Matematika', 'Fisika', 'Sistem', 'Basis', 'Data', 'Pemrograman', 'Dasar', 'Jaringan', 'Komputer',
+                'Analisis', 'dan', 'Perancangan', 'Interaksi', 'Manusia', 'Administrasi', 'Statistika', 'II']
+
+def legacy_parse_student_info(text: str):
+    """_parse_student_info as it was before TranscriptScanner"""
+    try:
+        nrp_nama_match = re.search(r'NRP\s*/\s*Nama\s*(\d+)\s*/\s*(.*?)\s*SKS Tempuh', text, re.DOTALL)
+        sks_match = re.search(r'SKS\s*Tempuh\s*/\s*SKS\s*Lulus\s*(\d+)\s*/\s*(\d+)', text)
+        status_match = re.search(r'Status\s*(.*?)(?=\s*Tahap|---)', text, re.DOTALL)
+        ipk_match = re.search(r'IPK\s*([\d.]+)', text)
+        ip_persiapan_match = re.search(r'IP Tahap Persiapan\s*:\s*([\d.]+)', text, re.IGNORECASE)
+        sks_persiapan_match = re.search(r'Total Sks Tahap Persiapan\s*:\s*(\d+)', text, re.IGNORECASE)
+        ip_sarjana_match = re.search(r'IP Tahap Sarjana\s*:\s*([\d.]+)', text, re.IGNORECASE)
+        sks_sarjana_match = re.search(r'Total Sks Tahap Sarjana\s*:\s*(\d+)', text, re.IGNORECASE)
+        if not all([nrp_nama_match, sks_match, status_match, ipk_match]): return None
+        nama = re.sub(r'\s+', ' ', nrp_nama_match.group(2)).strip()
+        status = re.sub(r'\s+', ' ', status_match.group(1)).strip()
+        return {'nrp': nrp_nama_match.group(1).strip(), 'nama_mahasiswa': nama, 'status_mahasiswa': status, 'sks_tempuh': int(sks_match.group(1)), 'sks_lulus': int(sks_match.group(2)), 'ipk': float(ipk_match.group(1)), 'ip_persiapan': float(ip_persiapan_match.group(1)) if ip_persiapan_match else 0.0, 'sks_persiapan': int(sks_persiapan_match.group(1)) if sks_persiapan_match else 0, 'ip_sarjana': float(ip_sarjana_match.group(1)) if ip_sarjana_match else 0.0, 'sks_sarjana': int(sks_sarjana_match.group(1)) if sks_sarjana_match else 0}
+    except Exception:
+        return None
+
+def legacy_parse_courses(text: str):
+    """_parse_courses as it was before TranscriptScanner"""
+    courses = []
+    course_pattern = r'([A-Z]{2}\d{5,6})\s*(.*?)\s*(\d)\s*(\d{4}/(?:Gs|Gn)/[A-Z]{1,2})\s*([A-Z]{1,2})'
+    matches = re.finditer(course_pattern, text, re.DOTALL)
+    sarjana_start_match = re.search(r'Tahap:\s*Sarjana', text)
+    sarjana_start_pos = sarjana_start_match.start() if sarjana_start_match else -1
+    for match in matches:
+        course_name = re.sub(r'\s+', ' ', match.group(2)).strip()
+        sks = int(match.group(3))
+        hist_info = match.group(4)
+        grade = match.group(5)
+        year_sem_match = re.search(r'(\d{4})/(Gs|Gn)', hist_info)
+        if not year_sem_match: continue
+        year, sem_code = year_sem_match.groups()
+        phase = 'Sarjana' if sarjana_start_pos != -1 and match.start() > sarjana_start_pos else 'Persiapan'
+        semester = 'Gasal' if sem_code == 'Gs' else 'Genap'
+        courses.append({'kode_mk': match.group(1).strip(), 'nama_mk': course_name, 'sks_mk': sks, 'tahun': int(year), 'semester': semester, 'huruf_nilai': grade.strip(), 'tahap_mk': phase})
+    return courses
+
+def legacy_parse(text: str):
+    return legacy_parse_student_info(text), legacy_parse_courses(text)
+
+def sample_transcript(n_courses: int, seed: int = 0, orphan_codes: int = 0) -> str:
+    """Multi-page transcript text in the layout the parser expects"""
+    rng = random.Random(seed)
+    lines = ["Transkrip Akademik",
+             "NRP / Nama 5026231146 / Mahasiswa Contoh SKS Tempuh / SKS Lulus 144 / 140 Status Normal/Aktif IPK 3.51",
+             "Tahap: Persiapan", "Kode Nama Mata Kuliah SKS Historis Nilai Nilai"]
+    for i in range(n_courses):
+        if i == n_courses // 2:
+            lines += ["IP Tahap Persiapan : 3.45 Total Sks Tahap Persiapan : 36", "Tahap: Sarjana",
+                      "Kode Nama Mata Kuliah SKS Historis Nilai Nilai"]
+        name = ' '.join(rng.choice(COURSE_WORDS) for _ in range(rng.randint(1, 4)))
+        lines.append(f"{rng.choice(['IF', 'KM', 'SI', 'UG'])}{184100 + i} {name} {rng.randint(2, 4)} "
+                     f"{rng.randint(2019, 2024)}/{rng.choice(['Gs', 'Gn'])}/{rng.choice(['A', 'AB', 'B'])} {rng.choice(['A', 'AB', 'B', 'BC', 'C', 'D', 'E'])}")
+        if i % 25 == 24:
+            lines.append(f"Halaman {i // 25 + 1} dari {n_courses // 25 + 1} ---")
+    lines.append("IP Tahap Sarjana : 3.55 Total Sks Tahap Sarjana : 108")
+    # Kode tanpa pasangan (mis. nomor dokumen di footer) memaksa pola lazy memindai jauh ke depan.
+    for i in range(orphan_codes):
+        lines.insert(rng.randint(4, len(lines)), f"Dokumen DK{1000000 + i} dicetak")
+    return '\n'.join(lines) + '\n'
+
+def token_soup(count: int, seed: int = 1):
+    """Random strings built from transcript tokens, overlapping and out of order"""
+    rng = random.Random(seed)
+    tokens = ['NRP', ' / ', 'Nama ', '5026', 'Ani Budi ', 'SKS Tempuh', 'SKS Lulus ', '144', ' / ', 'Status ', 'Normal/Aktif ',
+              'Tahap', 'Tahap: Sarjana', '---', 'IPK ', '3.51', '3.5.1', 'IP Tahap Persiapan : ', 'ip tahap sarjana: ',
+              'TOTAL SKS TAHAP SARJANA : ', 'Total Sks Tahap Persiapan : ', '36', 'IF184101 ', 'KM12345', 'iF123456 ',
+              'Matematika ', ' 3 ', '2023/Gs/A ', '2022/Gn/AB ', 'A', 'BC', 'E ', '\n', ' ', 'x', 'IPK12345 ']
+    return [''.join(rng.choice(tokens) for _ in range(rng.randint(1, 40))) for _ in range(count)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--courses', type=int, nargs='+', default=[40, 400, 4000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    documents = {f"{n} courses": sample_transcript(n) for n in args.courses}
+    documents.update({f"{n} courses + {n // 20} orphan codes": sample_transcript(n, orphan_codes=n // 20) for n in args.courses})
+    for text in list(documents.values()) + token_soup(20000):
+        expected, actual = legacy_parse(text), TRANSCRIPT_SCANNER.scan(text)
+        if expected != actual:
+            sys.exit(f"Output mismatch for {text!r}:\n  legacy: {expected!r}\n  new:    {actual!r}")
+    print(f"Output identical on {len(documents)} transcripts and 20000 random token strings")
+
+    print(f"{'document':<36} {'legacy ms':>10} {'scanner ms':>11} {'speedup':>8}")
+    for label, text in documents.items():
+        number = max(1, 400 // max(1, len(text) // 1000))
+        legacy_time = min(timeit.repeat(lambda: legacy_parse(text), number=number, repeat=args.repeat)) / number
+        new_time = min(timeit.repeat(lambda: TRANSCRIPT_SCANNER.scan(text), number=number, repeat=args.repeat)) / number
+        print(f"{label:<36} {legacy_time * 1e3:10.2f} {new_time * 1e3:11.2f} {legacy_time / new_time:7.2f}x")
+
+if __name__ == "__main__":
+    main()
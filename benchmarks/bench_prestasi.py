@@ -0,0 +1,117 @@
+"""Benchmark for the batched Fact_Prestasi_Semester computation.
+
+Checks that TranscriptETL._prestasi_semester_rows produces exactly the values
+the previous per-student loop stored (its Decimal results rounded the way MySQL
+stores DECIMAL(3,2)/(4,2) columns) on synthetic transcripts and on random
+semesters built to hit rounding ties, then times both per batch.
+
+    python benchmarks/bench_prestasi.py [--batch-sizes 100 1000 10000] [--repeat 5]
+"""
+import os
+import sys
+import random
+import argparse
+import timeit
+from collections import defaultdict
+from decimal import Decimal, ROUND_HALF_UP
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from etl import TranscriptETL
+from synth_transcripts import generate_transcripts
+
+GRADES = [('A', '4.00'), ('AB', '3.50'), ('B', '3.00'), ('BC', '2.50'), ('C', '2.00'), ('D', '1.00'), ('E', '0.00')]
+
+def make_etl() -> TranscriptETL:
+    """ETL whose dimension cache looks like a preloaded MySQL warehouse (bobot_nilai as Decimal)"""
+    etl = TranscriptETL({})
+    etl.dim_cache.nilai = {huruf: (i, Decimal(bobot)) for i, (huruf, bobot) in enumerate(GRADES, 1)}
+    etl.dim_cache.waktu = {(tahun, semester): (tahun - 2000) * 2 + (semester == 'Genap')
+                           for tahun in range(2000, 2100) for semester in ('Gasal', 'Genap')}
+    etl.dim_cache.loaded = True
+    return etl
+
+def legacy_prestasi_rows(etl: TranscriptETL, students):
+    """_update_prestasi_semester's per-student loop as it was before the batched computation"""
+    grade_weights = {huruf: bobot for huruf, (_, bobot) in etl.dim_cache.nilai.items()}
+    prestasi_rows = []
+    for id_mahasiswa, all_courses in students:
+        courses_by_semester = defaultdict(list)
+        for course in all_courses:
+            courses_by_semester[(course['tahun'], course['semester'])].append(course)
+        total_sks_kumulatif, total_poin_kumulatif, ips_sebelumnya = 0, 0, 0.0
+        for (tahun, semester), courses_in_sem in sorted(courses_by_semester.items()):
+            sks_diambil_semester = sum(c['sks_mk'] for c in courses_in_sem)
+            poin_semester = sum(c['sks_mk'] * grade_weights.get(c['huruf_nilai'], 0) for c in courses_in_sem)
+            ips = (poin_semester / sks_diambil_semester) if sks_diambil_semester > 0 else 0.0
+            total_sks_kumulatif += sks_diambil_semester
+            total_poin_kumulatif += poin_semester
+            ipk_saat_itu = (total_poin_kumulatif / total_sks_kumulatif) if total_sks_kumulatif > 0 else 0.0
+            id_waktu = etl._get_waktu_key(None, tahun, semester)
+            sks_lulus_semester = sum(c['sks_mk'] for c in courses_in_sem if c['huruf_nilai'] not in ['D', 'E'])
+            perubahan_ips = ips - ips_sebelumnya if ips_sebelumnya > 0 else 0.0
+            prestasi_rows.append((id_mahasiswa, id_waktu, ips, sks_diambil_semester, sks_lulus_semester, len(courses_in_sem), ipk_saat_itu, perubahan_ips))
+            ips_sebelumnya = ips
+    return prestasi_rows
+
+def legacy_supported(etl: TranscriptETL, student) -> bool:
+    try:
+        legacy_prestasi_rows(etl, [student])
+        return True
+    except TypeError:
+        return False
+
+def stored(value) -> Decimal:
+    """Value as MySQL stores it in a DECIMAL(x,2) column (round half away from zero)"""
+    return Decimal(str(value)).quantize(Decimal('0.01'), ROUND_HALF_UP)
+
+def as_stored(rows):
+    return [(r[0], r[1], stored(r[2]), r[3], r[4], r[5], stored(r[6]), stored(r[7])) for r in rows]
+
+def synthetic_batch(size: int, seed: int = 0):
+    return [(i + 1, expected['courses']) for i, (_, expected) in enumerate(generate_transcripts(size, seed=seed))]
+
+def tie_batch(size: int, seed: int = 1):
+    """Students with few large-SKS semesters, so exact ratios often land on .xx5"""
+    rng = random.Random(seed)
+    students = []
+    for i in range(size):
+        courses = []
+        for sem_index in range(rng.randint(1, 6)):
+            for _ in range(rng.randint(1, 5)):
+                courses.append({'sks_mk': rng.choice([0, 1, 2, 3, 4, 6, 8, 20, 25, 40]), 'huruf_nilai': rng.choice([g for g, _ in GRADES] + ['X']),
+                                'tahun': 2020 + sem_index // 2, 'semester': 'Gasal' if sem_index % 2 == 0 else 'Genap'})
+        students.append((i + 1, courses))
+    return students
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    etl = make_etl()
+    checks = {'synthetic transcripts': synthetic_batch(2000), 'tie-prone semesters': tie_batch(20000)}
+    for label, students in checks.items():
+        # Loop lama gagal (float - Decimal) bila semester ber-IPS float, mis. tanpa SKS atau hanya nilai
+        # yang tidak dikenal, diikuti semester lain; mahasiswa seperti itu dilewati dalam perbandingan.
+        students = [student for student in students if legacy_supported(etl, student)]
+        expected = as_stored(legacy_prestasi_rows(etl, students))
+        actual = etl._prestasi_semester_rows(None, students)
+        if expected != actual:
+            for old, new in zip(expected, actual):
+                if old != new:
+                    sys.exit(f"Output mismatch on {label}:\n  legacy:  {old!r}\n  batched: {new!r}")
+            sys.exit(f"Row count mismatch on {label}: {len(expected)} vs {len(actual)}")
+        print(f"Output identical on {len(students)} students ({label}, {len(actual)} semester rows)")
+
+    print(f"{'students/batch':>14} {'legacy ms':>10} {'batched ms':>11} {'speedup':>8}")
+    for size in args.batch_sizes:
+        students = synthetic_batch(size)
+        number = max(1, 2000 // size)
+        legacy_time = min(timeit.repeat(lambda: legacy_prestasi_rows(etl, students), number=number, repeat=args.repeat)) / number
+        new_time = min(timeit.repeat(lambda: etl._prestasi_semester_rows(None, students), number=number, repeat=args.repeat)) / number
+        print(f"{size:>14} {legacy_time * 1e3:10.2f} {new_time * 1e3:11.2f} {legacy_time / new_time:7.2f}x")
+
+if __name__ == "__main__":
+    main()
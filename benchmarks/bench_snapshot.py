@@ -0,0 +1,131 @@
+"""Analytics snapshot queries versus SQL, and patching versus rebuilding.
+
+Loads synthetic transcripts into a scratch SQLite warehouse, writes the
+columnar snapshot and times its queries (memory-mapped from disk) against the
+equivalent SQL on the warehouse, checking that both return the same rows.
+Then reloads --changed students with a different status and times patching
+the snapshot with them against a full rebuild.
+
+SQLite runs in-process, so the SQL timings are a lower bound for a MySQL
+server reached over the network.
+
+    python benchmarks/bench_snapshot.py [--students 10000] [--changed 100] [--output results.json]
+"""
+import os
+import sys
+import copy
+import json
+import time
+import timeit
+import platform
+import argparse
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from etl import AnalyticsSnapshot
+from bench_etl import reset_database, git_version
+from synth_transcripts import generate_transcripts
+
+def rounded(rows):
+    return [{k: round(v, 2) if isinstance(v, float) else v for k, v in row.items()} for row in rows]
+
+def sql_queries(cursor, nrp: str, kode_mk: str):
+    """The SQL a dashboard would run for the same answers as the snapshot queries"""
+    def run(query, params=()):
+        cursor.execute(query, params)
+        return rounded(cursor.fetchall())
+    return {
+        'top_students': lambda: run(
+            "SELECT NRP, nama_mahasiswa, status_mahasiswa, ipk_kumulatif, sks_tempuh, sks_lulus, ip_persiapan, sks_persiapan, ip_sarjana, sks_sarjana "
+            "FROM Dim_Mahasiswa ORDER BY ipk_kumulatif DESC, NRP LIMIT 10"),
+        'student_history': lambda: run(
+            "SELECT w.tahun, w.semester, p.ips, p.sks_diambil_semester, p.sks_lulus_semester, p.jumlah_mk_semester, p.ipk_saat_itu, p.perubahan_ips "
+            "FROM Fact_Prestasi_Semester p JOIN Dim_Mahasiswa m ON m.id_mahasiswa = p.id_mahasiswa JOIN Dim_Waktu w ON w.id_waktu = p.id_waktu "
+            "WHERE m.NRP = %s ORDER BY w.tahun, w.semester", (nrp,)),
+        'course_distribution': lambda: run(
+            "SELECT w.tahun, w.semester, a.jumlah_pengambil_mk, a.rata_rata_bobot_nilai, a.persentase_kelulusan, a.jumlah_nilai_A, a.jumlah_nilai_AB, "
+            "a.jumlah_nilai_B, a.jumlah_nilai_BC, a.jumlah_nilai_C, a.jumlah_nilai_D, a.jumlah_nilai_E "
+            "FROM Fact_Analisis_MataKuliah a JOIN Dim_MataKuliah k ON k.id_mk = a.id_mk JOIN Dim_Waktu w ON w.id_waktu = a.id_waktu "
+            "WHERE k.kode_mk = %s ORDER BY w.tahun, w.semester", (kode_mk,)),
+    }
+
+def snapshot_queries(snapshot: AnalyticsSnapshot, nrp: str, kode_mk: str):
+    return {
+        'top_students': lambda: snapshot.top_students(10),
+        'student_history': lambda: snapshot.student_history(nrp),
+        'course_distribution': lambda: snapshot.course_distribution(kode_mk),
+    }
+
+def per_call_us(func, repeat: int) -> float:
+    number = 100
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--students', type=int, default=10000)
+    parser.add_argument('--courses', type=int, default=48, help="Courses per student")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--changed', type=int, default=100, help="Students reloaded before patching the snapshot")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default=None, help="JSON results file (default: benchmarks/results/snapshot-<timestamp>.json)")
+    args = parser.parse_args()
+
+    started = datetime.now()
+    transcripts = [expected for _, expected in generate_transcripts(args.students, args.courses, seed=args.seed)]
+    with tempfile.TemporaryDirectory() as folder:
+        etl = reset_database({'sqlite_path': os.path.join(folder, 'warehouse.sqlite')})
+        if etl is None:
+            sys.exit("Could not create the benchmark schema")
+        snapshot_path = os.path.join(folder, 'snapshot')
+        try:
+            etl.load_transcripts(copy.deepcopy(transcripts), batch_size=500)
+            etl.refresh_aggregates(full_rebuild=True)
+            start = time.perf_counter()
+            etl.refresh_snapshot(snapshot_path, full_rebuild=True)
+            build_seconds = time.perf_counter() - start
+            snapshot = AnalyticsSnapshot.load(snapshot_path)
+
+            nrp, kode_mk = transcripts[0]['student']['nrp'], transcripts[0]['courses'][0]['kode_mk']
+            cursor = etl._cursor(dictionary=True)
+            sql, columnar = sql_queries(cursor, nrp, kode_mk), snapshot_queries(snapshot, nrp, kode_mk)
+            queries = []
+            print(f"{'query':<20} {'sql us':>10} {'snapshot us':>12} {'speedup':>8} {'same':>5}")
+            for name in sql:
+                same = sql[name]() == columnar[name]()
+                sql_us, snapshot_us = per_call_us(sql[name], args.repeat), per_call_us(columnar[name], args.repeat)
+                queries.append({'query': name, 'sql_us': round(sql_us, 2), 'snapshot_us': round(snapshot_us, 2), 'same': same})
+                print(f"{name:<20} {sql_us:>10.1f} {snapshot_us:>12.1f} {sql_us / snapshot_us:>7.1f}x {str(same):>5}")
+            cursor.close()
+
+            changed = copy.deepcopy(transcripts[:args.changed])
+            for data in changed:
+                data['student']['status_mahasiswa'] = 'Cuti'
+            etl.load_transcripts(changed, batch_size=500)
+            etl.refresh_aggregates()
+            start = time.perf_counter()
+            patched = etl.refresh_snapshot(snapshot_path)
+            patch_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            rebuilt = etl.refresh_snapshot(snapshot_path, full_rebuild=True)
+            rebuild_seconds = time.perf_counter() - start
+            identical = patched.meta['rows'] == rebuilt.meta['rows'] and patched.top_students(50, status='Cuti') == rebuilt.top_students(50, status='Cuti')
+        finally:
+            etl.close_connection()
+
+    print(f"Snapshot of {args.students} students built in {build_seconds:.3f}s; {args.changed} changed students "
+          f"patched in {patch_seconds:.3f}s vs rebuilt in {rebuild_seconds:.3f}s ({rebuild_seconds / patch_seconds:.1f}x), identical: {identical}")
+    report = {'benchmark': 'snapshot', 'started_at': started.isoformat(timespec='seconds'), **git_version(),
+              'python': platform.python_version(), 'platform': platform.platform(),
+              'config': {k: getattr(args, k) for k in ('students', 'courses', 'seed', 'changed')},
+              'results': {'queries': queries, 'build_seconds': round(build_seconds, 6), 'patch_seconds': round(patch_seconds, 6),
+                          'rebuild_seconds': round(rebuild_seconds, 6), 'patch_identical': identical}}
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results', f"snapshot-{started:%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {output}")
+
+if __name__ == "__main__":
+    main()
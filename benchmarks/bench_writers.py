@@ -0,0 +1,90 @@
+"""Load throughput versus number of concurrent writers.
+
+Loads the same synthetic transcripts into a freshly recreated benchmark
+database with process_folder's loader (TranscriptETL.load_transcripts) at
+several --writers settings, and reports transcripts/s, the speedup over a
+single writer and how many transactions were retried after a deadlock or
+lock wait timeout. A small --catalog-size makes the shared Dim_MataKuliah
+and Fact_Kelulusan rows hotter.
+
+    python benchmarks/bench_writers.py [--students 5000] [--writers 1 2 4 8] [--batch-size 100]
+                                       [--catalog-size 300] [--database nilai_bench] [--output results.json]
+
+Needs a MySQL/MariaDB server: SQLite serialises writers, so the load falls
+back to a single writer there.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from etl import DB_CONFIG, DB_ERRORS
+from bench_etl import reset_database, git_version
+from synth_transcripts import generate_transcripts
+
+def bench_writers(db_config, transcripts, writers: int, batch_size: int):
+    etl = reset_database(db_config)
+    if etl is None:
+        raise RuntimeError("could not create the benchmark schema")
+    try:
+        start = time.perf_counter()
+        stats = etl.load_transcripts(transcripts, batch_size=batch_size, writers=writers)
+        seconds = time.perf_counter() - start
+    finally:
+        etl.close_connection()
+    if stats['failed']:
+        raise RuntimeError(f"{stats['failed']} transcripts failed to load; see transcript_etl.log")
+    return {'writers': writers, 'transcripts': stats['processed'], 'seconds': round(seconds, 6),
+            'transcripts_per_s': round(stats['processed'] / seconds, 2) if seconds else None,
+            'retries': sum(etl.metrics.retries.values()), 'retry_reasons': dict(etl.metrics.retries)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--students', type=int, default=5000)
+    parser.add_argument('--courses', type=int, default=48, help="Courses per student")
+    parser.add_argument('--catalog-size', type=int, default=300, help="Distinct courses shared by all students")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--writers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--batch-size', type=int, default=100, help="Transcripts per load transaction")
+    parser.add_argument('--host', default=DB_CONFIG['host'])
+    parser.add_argument('--user', default=DB_CONFIG['user'])
+    parser.add_argument('--password', default=DB_CONFIG['password'])
+    parser.add_argument('--database', default='nilai_bench', help="Scratch database, dropped and recreated per writer count")
+    parser.add_argument('--output', default=None, help="JSON results file (default: benchmarks/results/writers-<timestamp>.json)")
+    args = parser.parse_args()
+
+    if args.database == DB_CONFIG['database']:
+        sys.exit(f"Refusing to drop the production database '{args.database}'; pick another --database")
+    db_config = {'host': args.host, 'user': args.user, 'password': args.password, 'database': args.database}
+
+    # Hasil generator sama dengan hasil parse_transcript, jadi parsing tidak ikut diukur.
+    transcripts = [expected for _, expected in generate_transcripts(args.students, args.courses, catalog_size=args.catalog_size, seed=args.seed)]
+    started = datetime.now()
+    results = []
+    print(f"{'writers':>7} {'transcripts':>11} {'seconds':>9} {'per s':>9} {'speedup':>8} {'retries':>8}")
+    for writers in args.writers:
+        try:
+            result = bench_writers(db_config, transcripts, writers, args.batch_size)
+        except DB_ERRORS as err:
+            sys.exit(f"Database unavailable: {err}")
+        results.append(result)
+        speedup = results[0]['seconds'] / result['seconds'] if result['seconds'] else 0
+        print(f"{writers:>7} {result['transcripts']:>11} {result['seconds']:>9.2f} {result['transcripts_per_s'] or 0:>9.1f} {speedup:>7.2f}x {result['retries']:>8}")
+
+    report = {'benchmark': 'writers', 'started_at': started.isoformat(timespec='seconds'), **git_version(),
+              'python': platform.python_version(), 'platform': platform.platform(),
+              'config': {k: getattr(args, k) for k in ('students', 'courses', 'catalog_size', 'seed', 'batch_size')},
+              'results': results}
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results', f"writers-{started:%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {output}")
+
+if __name__ == "__main__":
+    main()
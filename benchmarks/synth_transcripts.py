@@ -0,0 +1,151 @@
+"""Synthetic transcript generator.
+
+Produces transcript text in the layout TranscriptScanner expects (and, with
+--pdf, minimal PDFs PyPDF2 can read back), so the ETL can be exercised and
+benchmarked without real student data.
+
+    python benchmarks/synth_transcripts.py --students 100 --out source/ [--courses 48] [--years 4] [--pdf]
+"""
+import os
+import sys
+import random
+import argparse
+from typing import Dict, Iterator, List, Tuple
+
+GRADES = ['A', 'AB', 'B', 'BC', 'C', 'D', 'E']
+GRADE_WEIGHTS = {'A': 4.0, 'AB': 3.5, 'B': 3.0, 'BC': 2.5, 'C': 2.0, 'D': 1.0, 'E': 0.0}
+GRADE_DISTRIBUTION = [30, 20, 20, 12, 10, 5, 3]
+STATUSES = ['Normal/Aktif'] * 8 + ['Cuti', 'Lulus']
+
+FIRST_NAMES = ['Ahmad', 'Budi', 'Citra', 'Dewi', 'Eko', 'Fajar', 'Gita', 'Hadi', 'Indah', 'Joko', 'Kartika', 'Lestari',
+               'Muhammad', 'Nur', 'Putri', 'Rizky', 'Sari', 'Teguh', 'Umar', 'Wulan', 'Yusuf', 'Zahra']
+LAST_NAMES = ['Pratama', 'Saputra', 'Wijaya', 'Hidayat', 'Nugroho', 'Kusuma', 'Santoso', 'Rahmawati', 'Setiawan',
+              'Permata', 'Ramadhan', 'Syahputra', 'Utami', 'Firmansyah']
+COURSE_WORDS = ['Matematika', 'Fisika', 'Sistem', 'Basis', 'Data', 'Pemrograman', 'Dasar', 'Jaringan', 'Komputer',
+                'Analisis', 'Perancangan', 'Interaksi', 'Manusia', 'Administrasi', 'Statistika', 'Keamanan',
+                'Informasi', 'Manajemen', 'Proyek', 'Perangkat', 'Lunak', 'Kecerdasan', 'Buatan']
+COURSE_SUFFIXES = ['', '', '', ' I', ' II', ' Lanjut']
+COURSE_PREFIXES = ['IF', 'KM', 'SI', 'UG']
+
+# Fase persiapan mencakup dua semester pertama, sesuai struktur transkrip.
+PERSIAPAN_SEMESTERS = 2
+
+def course_catalog(size: int = 300, seed: int = 0) -> Dict[str, List[Tuple[str, str, int]]]:
+    """Course pool per phase as (kode_mk, nama_mk, sks_mk); codes are unique across phases"""
+    rng = random.Random(seed)
+    catalog = {'Persiapan': [], 'Sarjana': []}
+    for i in range(size):
+        words = rng.sample(COURSE_WORDS, rng.randint(1, 3))
+        name = ' '.join(words) + rng.choice(COURSE_SUFFIXES)
+        phase = 'Persiapan' if i < size // 6 else 'Sarjana'
+        catalog[phase].append((f"{rng.choice(COURSE_PREFIXES)}{184000 + i}", name, rng.choice([2, 3, 3, 4])))
+    return catalog
+
+def generate_student(index: int, rng: random.Random, catalog: Dict[str, List[Tuple[str, str, int]]],
+                     courses: int = 48, years: int = 4, start_year: int = 2019, cohorts: int = 4) -> Tuple[str, Dict]:
+    """One transcript as (text, expected parse result)"""
+    angkatan = start_year + rng.randrange(cohorts)
+    semesters = max(1, years * 2)
+    nrp = f"5026{angkatan % 100:02d}{index:06d}"
+    nama = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+    n_persiapan = min(len(catalog['Persiapan']), courses * min(PERSIAPAN_SEMESTERS, semesters) // semesters)
+    picked = {'Persiapan': rng.sample(catalog['Persiapan'], n_persiapan),
+              'Sarjana': rng.sample(catalog['Sarjana'], min(len(catalog['Sarjana']), courses - n_persiapan))}
+
+    records = {}
+    for phase, phase_courses in picked.items():
+        first, count = (0, min(PERSIAPAN_SEMESTERS, semesters)) if phase == 'Persiapan' else (PERSIAPAN_SEMESTERS, max(1, semesters - PERSIAPAN_SEMESTERS))
+        records[phase] = []
+        for i, (kode, nama_mk, sks) in enumerate(phase_courses):
+            sem_index = min(semesters - 1, first + i * count // len(phase_courses))
+            tahun, semester = angkatan + sem_index // 2, 'Gasal' if sem_index % 2 == 0 else 'Genap'
+            huruf = rng.choices(GRADES, GRADE_DISTRIBUTION)[0]
+            records[phase].append({'kode_mk': kode, 'nama_mk': nama_mk, 'sks_mk': sks, 'tahun': tahun, 'semester': semester,
+                                   'huruf_nilai': huruf, 'tahap_mk': phase})
+
+    def ip(rows):
+        sks = sum(c['sks_mk'] for c in rows)
+        return round(sum(c['sks_mk'] * GRADE_WEIGHTS[c['huruf_nilai']] for c in rows) / sks, 2) if sks else 0.0
+
+    all_courses = records['Persiapan'] + records['Sarjana']
+    student = {'nrp': nrp, 'nama_mahasiswa': nama, 'status_mahasiswa': rng.choice(STATUSES),
+               'sks_tempuh': sum(c['sks_mk'] for c in all_courses),
+               'sks_lulus': sum(c['sks_mk'] for c in all_courses if c['huruf_nilai'] not in ['D', 'E']),
+               'ipk': ip(all_courses),
+               'ip_persiapan': ip(records['Persiapan']), 'sks_persiapan': sum(c['sks_mk'] for c in records['Persiapan']),
+               'ip_sarjana': ip(records['Sarjana']), 'sks_sarjana': sum(c['sks_mk'] for c in records['Sarjana'])}
+
+    lines = ["Transkrip Akademik",
+             f"NRP / Nama {nrp} / {nama} SKS Tempuh / SKS Lulus {student['sks_tempuh']} / {student['sks_lulus']} "
+             f"IPK {student['ipk']:.2f} Status {student['status_mahasiswa']}"]
+    for phase in ('Persiapan', 'Sarjana'):
+        lines += [f"Tahap: {phase}", "Kode Nama Mata Kuliah SKS Historis Nilai Nilai"]
+        for c in records[phase]:
+            sem_code = 'Gs' if c['semester'] == 'Gasal' else 'Gn'
+            lines.append(f"{c['kode_mk']} {c['nama_mk']} {c['sks_mk']} {c['tahun']}/{sem_code}/{c['huruf_nilai']} {c['huruf_nilai']}")
+        lines.append(f"IP Tahap {phase} : {student['ip_' + phase.lower()]:.2f} Total Sks Tahap {phase} : {student['sks_' + phase.lower()]}")
+    return '\n'.join(lines) + '\n', {'student': student, 'courses': all_courses}
+
+def generate_transcripts(students: int, courses: int = 48, years: int = 4, start_year: int = 2019, cohorts: int = 4,
+                         catalog_size: int = 300, seed: int = 0) -> Iterator[Tuple[str, Dict]]:
+    """Yield (text, expected parse result) for `students` transcripts, deterministically for a given seed"""
+    rng = random.Random(seed)
+    catalog = course_catalog(catalog_size, seed)
+    for index in range(students):
+        yield generate_student(index, rng, catalog, courses, years, start_year, cohorts)
+
+def _pdf_string(line: str) -> bytes:
+    escaped = line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+    return b'(' + escaped.encode('latin-1', 'replace') + b')'
+
+def write_pdf(path: str, text: str, lines_per_page: int = 50):
+    """Write `text` as a minimal multi-page Helvetica PDF, one text line per PDF line"""
+    lines = text.splitlines()
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    # Objek 1 = katalog, 2 = daftar halaman, 3 = font, lalu pasangan (halaman, konten).
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>",
+               b"<< /Type /Pages /Kids [" + b' '.join(b"%d 0 R" % pid for pid in page_ids) + b"] /Count %d >>" % len(pages),
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    for pid, page_lines in zip(page_ids, pages):
+        content = b"BT /F1 9 Tf 12 TL 40 800 Td " + b' '.join(_pdf_string(line) + b" Tj T*" for line in page_lines) + b" ET"
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (pid + 1))
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b''.join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, 'wb') as file:
+        file.write(out)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--students', type=int, default=100)
+    parser.add_argument('--courses', type=int, default=48, help="Courses per student")
+    parser.add_argument('--years', type=int, default=4, help="Study years per student")
+    parser.add_argument('--start-year', type=int, default=2019)
+    parser.add_argument('--cohorts', type=int, default=4, help="Number of intake years, starting at --start-year")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', required=True, help="Output folder")
+    parser.add_argument('--pdf', action='store_true', help="Write PDFs instead of .txt files")
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    for text, expected in generate_transcripts(args.students, args.courses, args.years, args.start_year, args.cohorts, seed=args.seed):
+        path = os.path.join(args.out, f"{expected['student']['nrp']}.{'pdf' if args.pdf else 'txt'}")
+        if args.pdf:
+            write_pdf(path, text)
+        else:
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(text)
+    print(f"Wrote {args.students} transcripts to {args.out}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
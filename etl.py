@@ -1,12 +1,40 @@
 import os
 import re
 import logging
+import argparse
+import bisect
+import cProfile
+import ctypes
+import ctypes.util
+import hashlib
+import importlib
+import io
+import json
+import pstats
+import queue
+import random
+import select
+import shutil
+import signal
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+import numpy as np
 import pandas as pd
 import mysql.connector
 from PyPDF2 import PdfReader
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple
-from collections import defaultdict
+from datetime import datetime, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from collections import defaultdict, deque
+from itertools import chain
+from operator import itemgetter
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 
 # Configure logging
 logging.basicConfig(
@@ -27,23 +55,1345 @@ DB_CONFIG = {
     'database': 'nilai'
 }
 
+# Kata sambung yang sering menempel pada kata sebelumnya dalam hasil ekstraksi PyPDF2.
+CONJUNCTIONS = ['dan', 'atau', 'serta', 'untuk', 'ke', 'dari', 'pada']
+
+# Index sekunder (tabel, nama index, kolom) di luar primary/unique key.
+SECONDARY_INDEXES = [
+    # Agregasi inkremental Fact_Analisis_MataKuliah membaca Fact_Transkrip per (id_mk, id_waktu).
+    ('Fact_Transkrip', 'idx_transkrip_mk_waktu', 'id_mk, id_waktu'),
+    ('Etl_Manifest', 'idx_manifest_hash', 'content_hash'),
+    # --resume mencari file yang sudah di-commit sejak awal run yang terputus.
+    ('Etl_Manifest', 'idx_manifest_loaded', 'loaded_at'),
+    # Peringkat dan filter pada query insight.sql dibaca lewat index, bukan full scan + sort.
+    ('Dim_Mahasiswa', 'idx_mahasiswa_ipk', 'ipk_kumulatif'),
+    ('Dim_Mahasiswa', 'idx_mahasiswa_ip_sarjana', 'ip_sarjana'),
+    ('Dim_Mahasiswa', 'idx_mahasiswa_ip_persiapan', 'ip_persiapan'),
+    ('Dim_Mahasiswa', 'idx_mahasiswa_sks_lulus', 'sks_lulus'),
+    ('Dim_Mahasiswa', 'idx_mahasiswa_status', 'status_mahasiswa, ip_sarjana'),
+    ('Dim_MataKuliah', 'idx_matakuliah_nama', 'nama_mk'),
+    ('Dim_MataKuliah', 'idx_matakuliah_sks', 'sks_mk'),
+    ('Fact_Prestasi_Semester', 'idx_prestasi_waktu', 'id_waktu'),
+    ('Fact_Prestasi_Semester', 'idx_prestasi_perubahan', 'perubahan_ips'),
+    ('Fact_Kelulusan', 'idx_kelulusan_tidak_lulus', 'jml_mahasiswa_tidak_lulus'),
+    ('Fact_Analisis_MataKuliah', 'idx_analisis_bobot', 'rata_rata_bobot_nilai'),
+    ('Insight_MataKuliah', 'idx_insight_mk_bobot', 'rata_rata_bobot_nilai'),
+    ('Insight_MataKuliah', 'idx_insight_mk_pengambil', 'jumlah_pengambil_mk'),
+    ('Insight_Semester', 'idx_insight_semester_ips', 'rata_rata_ips'),
+]
+
+# Tabel ringkasan untuk query insight.sql: (tabel, kolom, kolom kunci, ekspresi kunci di query, query agregasi).
+# Baris untuk kunci yang disentuh load dihapus lalu dihitung ulang dari tabel fakta/dimensi.
+INSIGHT_TABLES = [
+    ('Insight_MataKuliah', ['id_mk', 'jumlah_pengambil_mk', 'rata_rata_bobot_nilai'], 'id_mk', 'ft.id_mk',
+     "SELECT ft.id_mk, COUNT(ft.id_transkrip) AS jumlah_pengambil_mk, AVG(dn.bobot_nilai) AS rata_rata_bobot_nilai FROM Fact_Transkrip ft JOIN Dim_Nilai dn ON ft.id_nilai = dn.id_nilai {where} GROUP BY ft.id_mk"),
+    ('Insight_SebaranNilai', ['id_mk', 'id_nilai', 'jumlah_mahasiswa'], 'id_mk', 'ft.id_mk',
+     "SELECT ft.id_mk, ft.id_nilai, COUNT(ft.id_transkrip) AS jumlah_mahasiswa FROM Fact_Transkrip ft {where} GROUP BY ft.id_mk, ft.id_nilai"),
+    ('Insight_Semester', ['id_waktu', 'jumlah_mahasiswa', 'rata_rata_ips', 'rata_rata_ipk_kumulatif', 'rata_rata_sks_diambil_aktif'], 'id_waktu', 'fps.id_waktu',
+     "SELECT fps.id_waktu, COUNT(fps.id_prestasi_semester) AS jumlah_mahasiswa, AVG(fps.ips) AS rata_rata_ips, AVG(dm.ipk_kumulatif) AS rata_rata_ipk_kumulatif, AVG(CASE WHEN dm.status_mahasiswa = 'Normal/Aktif' THEN fps.sks_diambil_semester END) AS rata_rata_sks_diambil_aktif FROM Fact_Prestasi_Semester fps JOIN Dim_Mahasiswa dm ON fps.id_mahasiswa = dm.id_mahasiswa {where} GROUP BY fps.id_waktu"),
+    ('Insight_Status', ['status_mahasiswa', 'jumlah_mahasiswa', 'jumlah_ipk', 'total_ipk_kumulatif'], 'status_mahasiswa', 'status_mahasiswa',
+     "SELECT status_mahasiswa, COUNT(id_mahasiswa) AS jumlah_mahasiswa, COUNT(ipk_kumulatif) AS jumlah_ipk, SUM(ipk_kumulatif) AS total_ipk_kumulatif FROM Dim_Mahasiswa {where} GROUP BY status_mahasiswa"),
+    ('Insight_Angkatan', ['tahun_angkatan', 'jumlah_mahasiswa'], 'tahun_angkatan', 'SUBSTR(NRP, 5, 2)',
+     "SELECT SUBSTR(NRP, 5, 2) AS tahun_angkatan, COUNT(id_mahasiswa) AS jumlah_mahasiswa FROM Dim_Mahasiswa {where} GROUP BY SUBSTR(NRP, 5, 2)"),
+]
+
+# Kolom mata kuliah yang dipakai perhitungan Fact_Prestasi_Semester.
+COURSE_FIELDS = itemgetter('tahun', 'semester', 'sks_mk', 'huruf_nilai')
+
+# Kolom Dim_Mahasiswa dan Fact_Prestasi_Semester yang ditulis loader; kolom DECIMAL(x,2) dibandingkan
+# dalam bentuk tersimpan saat menentukan baris mana yang benar-benar berubah.
+MAHASISWA_COLUMNS = ['NRP', 'nama_mahasiswa', 'status_mahasiswa', 'ipk_kumulatif', 'sks_tempuh', 'sks_lulus', 'ip_persiapan', 'sks_persiapan', 'ip_sarjana', 'sks_sarjana']
+MAHASISWA_KEYS = ('nrp', 'nama_mahasiswa', 'status_mahasiswa', 'ipk', 'sks_tempuh', 'sks_lulus', 'ip_persiapan', 'sks_persiapan', 'ip_sarjana', 'sks_sarjana')
+MAHASISWA_FIELDS = itemgetter(*MAHASISWA_KEYS)
+MAHASISWA_DECIMALS = (3, 6, 8)
+PRESTASI_COLUMNS = ['id_mahasiswa', 'id_waktu', 'ips', 'sks_diambil_semester', 'sks_lulus_semester', 'jumlah_mk_semester', 'ipk_saat_itu', 'perubahan_ips']
+PRESTASI_DECIMALS = (2, 6, 7)
+
+# Jumlah baris maksimum per statement multi-row (menjaga ukuran paket di bawah max_allowed_packet).
+BULK_CHUNK_ROWS = 1000
+
+# Transaksi load yang gagal karena deadlock/lock wait timeout diulang dengan backoff eksponensial
+# (detik awal, batas atas) dan jitter, paling banyak LOAD_RETRY_ATTEMPTS kali.
+LOAD_RETRY_ATTEMPTS = 5
+LOAD_RETRY_BACKOFF = (0.05, 2.0)
+
+# Mode watch: satu micro-batch dikumpulkan sampai folder tenang WATCH_SETTLE_S detik (paling lama
+# WATCH_MAX_BATCH_S), dan refresh agregat digabung sampai tidak ada upload selama AGGREGATE_QUIET_S
+# detik (paling lama AGGREGATE_MAX_DELAY_S setelah perubahan pertama yang belum diagregasi).
+WATCH_SETTLE_S = 1.0
+WATCH_MAX_BATCH_S = 10.0
+AGGREGATE_QUIET_S = 5.0
+AGGREGATE_MAX_DELAY_S = 60.0
+
+# Event inotify yang menandakan file selesai ditulis atau dipindahkan ke folder.
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+INOTIFY_EVENT = struct.Struct('iIII')
+
+# Run ter-shard: setiap node memuat PDF bagiannya ke database staging SQLite sendiri, lalu --merge
+# menggabungkan semua shard ke warehouse.
+SHARD_STAGING_FILE = 'shard-{index}-of-{count}.sqlite'
+SHARD_STAGING_PATTERN = re.compile(r'^shard-(\d+)-of-(\d+)\.sqlite$')
+
+# Snapshot analitik kolumnar yang diperbarui di akhir setiap run: satu subfolder .npy per versi,
+# dengan file pointer yang menunjuk versi aktif.
+SNAPSHOT_PATH = 'analytics_snapshot'
+SNAPSHOT_POINTER = 'CURRENT'
+
+# Cache teks halaman hasil ekstraksi (file SQLite) dan batas ukurannya sebelum entri terlama dibuang.
+PAGE_CACHE_PATH = 'page_cache.sqlite'
+PAGE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+class TextNormalizer:
+    """Cleanup for PyPDF2 page text, compiled once and applied in two regex passes"""
+
+    def __init__(self, conjunctions: List[str] = CONJUNCTIONS):
+        # Pass 1: gabungkan huruf yang terpisah satu spasi oleh PyPDF2.
+        self.join_pattern = re.compile(r'([a-zA-Z])\s([a-z])')
+        # Pass 2: semua perubahan spasi sekaligus -- rapikan whitespace, pisahkan
+        # huruf kecil-besar ("DasarPemrograman") dan kata sambung yang menempel.
+        conjunction_split = '|'.join(word + self._split_condition(conjunctions, order) for order, word in enumerate(conjunctions))
+        self.space_pattern = re.compile(
+            r'\s+|(?<=[a-z])(?=[A-Z])|(?i:(?<=[a-z])(?=[' + ''.join(sorted({w[0] for w in conjunctions})) + r'])(?=' + conjunction_split + '))'
+        )
+        # Teks halaman yang di-cache hanya berlaku untuk aturan pembersihan yang sama.
+        self.fingerprint = hashlib.sha256(f"{self.join_pattern.pattern}\0{self.space_pattern.pattern}".encode('utf-8')).hexdigest()[:16]
+
+    @classmethod
+    def _split_condition(cls, conjunctions: List[str], order: int) -> str:
+        """Lookahead tail deciding whether the conjunction at `order` gets split off"""
+        # Versi lama menjalankan satu pass per kata sambung sesuai urutan list. Spasi dari
+        # pass sebelumnya membentuk batas kata baru (mis. "xkedan" -> "xke dan" -> "x ke dan"),
+        # jadi kata sambung juga dipisah bila langsung diikuti kata sambung yang urutannya
+        # lebih awal dan ikut dipisah. Rantai itu ditulis eksplisit agar satu pass memberi hasil yang sama.
+        alternatives = [r'\b'] + [conjunctions[earlier] + cls._split_condition(conjunctions, earlier) for earlier in range(order)]
+        return '(?:' + '|'.join(alternatives) + ')'
+
+    def normalize_page(self, page_text: str) -> str:
+        cleaned_text = self.join_pattern.sub(r'\1\2', page_text)
+        return self.space_pattern.sub(' ', cleaned_text).strip()
+
+    def normalize_pages(self, pages: Iterable[str]) -> str:
+        """Normalize every page and join them, one line per page"""
+        return ''.join([self.normalize_page(page_text) + "\n" for page_text in pages])
+
+TEXT_NORMALIZER = TextNormalizer()
+
+class PdfEngine(ABC):
+    """Page text extraction with one PDF library, imported lazily so it stays an optional dependency"""
+    name = ''
+    module = ''
+
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            importlib.import_module(cls.module)
+            return True
+        except ImportError:
+            return False
+
+    @abstractmethod
+    def open(self, data: bytes):
+        """Parse the PDF bytes into the library's document object"""
+
+    @abstractmethod
+    def page_count(self, document) -> int:
+        """Number of pages in the document"""
+
+    @abstractmethod
+    def page_text(self, document, index: int) -> str:
+        """Raw text of one page"""
+
+    def close(self, document):
+        pass
+
+class PyMuPDFEngine(PdfEngine):
+    name, module = 'pymupdf', 'fitz'
+
+    def open(self, data: bytes):
+        return importlib.import_module(self.module).open(stream=data, filetype='pdf')
+
+    def page_count(self, document) -> int:
+        return document.page_count
+
+    def page_text(self, document, index: int) -> str:
+        return document.load_page(index).get_text()
+
+    def close(self, document):
+        document.close()
+
+class PdfiumEngine(PdfEngine):
+    name, module = 'pdfium', 'pypdfium2'
+
+    def open(self, data: bytes):
+        return importlib.import_module(self.module).PdfDocument(data)
+
+    def page_count(self, document) -> int:
+        return len(document)
+
+    def page_text(self, document, index: int) -> str:
+        page = document[index]
+        text_page = page.get_textpage()
+        try:
+            return text_page.get_text_range()
+        finally:
+            text_page.close()
+            page.close()
+
+    def close(self, document):
+        document.close()
+
+class PyPDF2Engine(PdfEngine):
+    name, module = 'pypdf2', 'PyPDF2'
+
+    def open(self, data: bytes):
+        return PdfReader(io.BytesIO(data))
+
+    def page_count(self, document) -> int:
+        return len(document.pages)
+
+    def page_text(self, document, index: int) -> str:
+        return document.pages[index].extract_text() or ""
+
+# Urutan preferensi untuk engine 'auto': library native yang lebih cepat dulu, PyPDF2 sebagai cadangan.
+# Default tetap PyPDF2: parser transkrip ditulis untuk teks keluarannya, engine lain harus dipilih secara eksplisit.
+PDF_ENGINES = [PyMuPDFEngine, PdfiumEngine, PyPDF2Engine]
+
+def pdf_engine(name: str = 'auto') -> PdfEngine:
+    """The named PDF engine, or the fastest installed one for 'auto'; falls back to PyPDF2 if it is missing"""
+    engines = {engine.name: engine for engine in PDF_ENGINES}
+    if name != 'auto' and name not in engines:
+        raise ValueError(f"Unknown PDF engine '{name}' (choose from auto, {', '.join(engines)})")
+    for engine in PDF_ENGINES if name == 'auto' else [engines[name]]:
+        if engine.available():
+            return engine()
+    logger.warning(f"PDF engine '{name}' is not installed; falling back to {PyPDF2Engine.name}")
+    return PyPDF2Engine()
+
+class PageTextCache:
+    """On-disk cache of normalized page text keyed by PDF content hash and page index, evicted LRU by size.
+
+    Entries live in a SQLite file shared by the worker processes; every process opens its own connection.
+    A cache that cannot be read or written only costs a re-extraction, never a failed transcript.
+    """
+
+    def __init__(self, path: str = PAGE_CACHE_PATH, max_bytes: int = PAGE_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._connection = None
+        self._pid = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # Koneksi tidak dibawa melewati fork: proses worker membuka koneksinya sendiri.
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("""CREATE TABLE IF NOT EXISTS page_text (
+                content_hash TEXT NOT NULL,
+                extractor TEXT NOT NULL,
+                page_index INTEGER NOT NULL,
+                page_count INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                text TEXT NOT NULL,
+                PRIMARY KEY (content_hash, extractor, page_index)
+            )""")
+            # Index (last_used, size) mencakup seluruh urutan LRU, jadi eviction tidak membaca kolom text.
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_page_text_lru ON page_text (last_used, size)")
+            # Total ukuran dijaga trigger di tabel satu baris, sehingga semua proses worker melihat angka yang sama
+            # tanpa SUM atas seluruh cache; total awal dihitung sekali setelah trigger ada.
+            connection.execute("CREATE TABLE IF NOT EXISTS page_text_size (total INTEGER NOT NULL)")
+            connection.execute("CREATE TRIGGER IF NOT EXISTS page_text_added AFTER INSERT ON page_text BEGIN UPDATE page_text_size SET total = total + NEW.size; END")
+            connection.execute("CREATE TRIGGER IF NOT EXISTS page_text_removed AFTER DELETE ON page_text BEGIN UPDATE page_text_size SET total = total - OLD.size; END")
+            connection.execute("INSERT INTO page_text_size (total) SELECT COALESCE(SUM(size), 0) FROM page_text WHERE NOT EXISTS (SELECT 1 FROM page_text_size)")
+            connection.commit()
+            self._connection, self._pid = connection, os.getpid()
+        return self._connection
+
+    def get(self, content_hash: str, extractor: str) -> Tuple[Optional[int], Dict[int, str]]:
+        """(page count, cached pages by index) of a document; (None, {}) when nothing is cached"""
+        try:
+            connection = self._connect()
+            rows = connection.execute("SELECT page_index, page_count, text FROM page_text WHERE content_hash = ? AND extractor = ?",
+                                      (content_hash, extractor)).fetchall()
+            if not rows:
+                return None, {}
+            connection.execute("UPDATE page_text SET last_used = ? WHERE content_hash = ? AND extractor = ?", (time.time(), content_hash, extractor))
+            connection.commit()
+            return rows[0][1], {page_index: text for page_index, _, text in rows}
+        except sqlite3.Error as err:
+            logger.warning(f"Page cache unavailable ({err}); extracting without it")
+            return None, {}
+
+    def put(self, content_hash: str, extractor: str, page_count: int, pages: Dict[int, str]):
+        """Store freshly extracted pages, then evict the least recently used ones beyond `max_bytes`"""
+        if not pages:
+            return
+        now = time.time()
+        try:
+            connection = self._connect()
+            # DELETE eksplisit, bukan INSERT OR REPLACE: penghapusan karena REPLACE tidak menjalankan trigger ukuran.
+            connection.executemany("DELETE FROM page_text WHERE content_hash = ? AND extractor = ? AND page_index = ?",
+                                   [(content_hash, extractor, index) for index in pages])
+            connection.executemany("INSERT INTO page_text (content_hash, extractor, page_index, page_count, size, last_used, text) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                   [(content_hash, extractor, index, page_count, len(text.encode('utf-8')), now, text) for index, text in pages.items()])
+            self._evict(connection)
+            connection.commit()
+        except sqlite3.Error as err:
+            logger.warning(f"Could not write to the page cache: {err}")
+
+    def _evict(self, connection: sqlite3.Connection):
+        excess = connection.execute("SELECT total FROM page_text_size").fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        # Halaman terlama dibuang sampai total ukuran kembali di bawah batas.
+        evicted = []
+        for rowid, size in connection.execute("SELECT rowid, size FROM page_text ORDER BY last_used, size"):
+            evicted.append((rowid,))
+            excess -= size
+            if excess <= 0:
+                break
+        connection.executemany("DELETE FROM page_text WHERE rowid = ?", evicted)
+
+    def close(self):
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+class PageTextExtractor:
+    """Normalized PDF text through a pluggable engine, reusing cached pages of previously seen documents"""
+
+    def __init__(self, engine: str = 'pypdf2', cache_path: Optional[str] = None, cache_max_bytes: int = PAGE_CACHE_MAX_BYTES,
+                 normalizer: TextNormalizer = TEXT_NORMALIZER):
+        self.engine = pdf_engine(engine)
+        self.cache = PageTextCache(cache_path, cache_max_bytes) if cache_path else None
+        self.normalizer = normalizer
+        # Engine lain menghasilkan teks lain, jadi nama engine ikut menjadi bagian kunci cache.
+        self.extractor_key = f"{self.engine.name}:{normalizer.fingerprint}"
+        self.settings = (engine, cache_path, cache_max_bytes)
+
+    def extract(self, data: bytes, content_hash: Optional[str] = None) -> Tuple[str, int, int]:
+        """(normalized text, pages served from the cache, pages extracted) for the PDF bytes.
+
+        `content_hash` is the SHA-256 of `data` when the caller already has it (the manifest hash).
+        """
+        if self.cache and content_hash is None:
+            content_hash = hashlib.sha256(data).hexdigest()
+        page_count, pages = self.cache.get(content_hash, self.extractor_key) if self.cache else (None, {})
+        cached = len(pages)
+        if page_count is None or cached < page_count:
+            document = self.engine.open(data)
+            try:
+                page_count = self.engine.page_count(document)
+                fresh = {index: self.normalizer.normalize_page(self.engine.page_text(document, index))
+                         for index in range(page_count) if index not in pages}
+            finally:
+                self.engine.close(document)
+            pages.update(fresh)
+            if self.cache:
+                self.cache.put(content_hash, self.extractor_key, page_count, fresh)
+        return ''.join(pages[index] + "\n" for index in range(page_count)), cached, page_count - cached
+
+TEXT_EXTRACTOR = PageTextExtractor(engine='pypdf2')
+
+def configure_extraction(engine: str = 'pypdf2', cache_path: Optional[str] = PAGE_CACHE_PATH, cache_max_bytes: int = PAGE_CACHE_MAX_BYTES):
+    """Select the PDF engine and page cache used by extract_pdf_text (also the worker process initializer)"""
+    global TEXT_EXTRACTOR
+    TEXT_EXTRACTOR = PageTextExtractor(engine, cache_path, cache_max_bytes)
+
+class TranscriptScanner:
+    """Single-pass tokenizer for normalized transcript text (student header fields and course rows)"""
+
+    # Semua token dicari dalam satu regex. Setiap alternatif diawali satu karakter dari kelas
+    # yang sama sehingga `finditer` bisa melompati teks lain dengan cepat, dan isi token
+    # ditangkap lewat lookahead agar token yang bertumpuk (mis. "IPK" di dalam teks status)
+    # tetap terbaca persis seperti pencarian terpisah versi lama.
+    TOKEN_PATTERN = r'''[A-Zitİı](?:
+          (?<=[A-Z])(?P<kode_rest>[A-Z]\d{5,6})(?=(?s:\s*(?P<nama_mk>.*?))\s*(?P<sks_mk>\d)\s*(?P<tahun>\d{4})/(?P<sem>Gs|Gn)/[A-Z]{1,2}\s*(?P<huruf_nilai>[A-Z]{1,2}))
+        | R(?<=NR)(?=P(?s:\s*/\s*Nama\s*(?P<nrp>\d+)\s*/\s*(?P<nama_mahasiswa>.*?)\s*SKS\ Tempuh))
+        | K(?<=SK)(?=S\s*Tempuh\s*/\s*SKS\s*Lulus\s*(?P<sks_tempuh>\d+)\s*/\s*(?P<sks_lulus>\d+))
+        | t(?<=St)(?=atus(?s:\s*(?P<status_mahasiswa>.*?))(?=\s*Tahap|---))
+        | a(?<=Ta)(?=hap:\s*Sarjana)(?P<tahap_sarjana>)
+        | (?<=I)(?=PK\s*(?P<ipk>[\d.]+))
+        | (?i:(?<=i)(?=p\ tahap\ (?:persiapan\s*:\s*(?P<ip_persiapan>[\d.]+)|sarjana\s*:\s*(?P<ip_sarjana>[\d.]+))))
+        | (?i:(?<=t)(?=otal\ sks\ tahap\ (?:persiapan\s*:\s*(?P<sks_persiapan>\d+)|sarjana\s*:\s*(?P<sks_sarjana>\d+))))
+    )'''
+
+    def __init__(self):
+        self.token_pattern = re.compile(self.TOKEN_PATTERN, re.VERBOSE)
+
+    def scan(self, text: str) -> Tuple[Optional[Dict], List[Dict]]:
+        """Walk the text once and return (student header fields, course records)"""
+        header: Dict[str, re.Match] = {}
+        courses = []
+        tahap_mk, course_end = 'Persiapan', -1
+
+        for match in self.token_pattern.finditer(text):
+            token = match.lastgroup
+            if token == 'huruf_nilai':
+                start = match.start()
+                # Baris mata kuliah tidak boleh bertumpuk, sama seperti `finditer` pada pola lama.
+                if start < course_end: continue
+                course_end = match.end(token)
+                kode_rest, nama_mk, sks_mk, tahun, sem_code, huruf_nilai = match.group('kode_rest', 'nama_mk', 'sks_mk', 'tahun', 'sem', 'huruf_nilai')
+                courses.append({'kode_mk': text[start] + kode_rest, 'nama_mk': ' '.join(nama_mk.split()), 'sks_mk': int(sks_mk), 'tahun': int(tahun), 'semester': 'Gasal' if sem_code == 'Gs' else 'Genap', 'huruf_nilai': huruf_nilai, 'tahap_mk': tahap_mk})
+            elif token == 'tahap_sarjana':
+                # Penanda "Tahap: Sarjana" mengubah state; mata kuliah sesudahnya masuk tahap Sarjana.
+                tahap_mk = 'Sarjana'
+            elif token not in header:
+                header[token] = match
+
+        return self._student_info(header), courses
+
+    def _student_info(self, header: Dict[str, re.Match]) -> Optional[Dict]:
+        try:
+            if not all(token in header for token in ('nama_mahasiswa', 'sks_lulus', 'status_mahasiswa', 'ipk')): return None
+            optional = lambda token, cast, default: cast(header[token].group(token)) if token in header else default
+            return {'nrp': header['nama_mahasiswa'].group('nrp').strip(), 'nama_mahasiswa': ' '.join(header['nama_mahasiswa'].group('nama_mahasiswa').split()), 'status_mahasiswa': ' '.join(header['status_mahasiswa'].group('status_mahasiswa').split()), 'sks_tempuh': int(header['sks_lulus'].group('sks_tempuh')), 'sks_lulus': int(header['sks_lulus'].group('sks_lulus')), 'ipk': float(header['ipk'].group('ipk')), 'ip_persiapan': optional('ip_persiapan', float, 0.0), 'sks_persiapan': optional('sks_persiapan', int, 0), 'ip_sarjana': optional('ip_sarjana', float, 0.0), 'sks_sarjana': optional('sks_sarjana', int, 0)}
+        except Exception as e:
+            logger.error(f"Error parsing student info: {e}")
+            return None
+
+TRANSCRIPT_SCANNER = TranscriptScanner()
+
+class DimensionCache:
+    """In-process cache of dimension keys, preloaded once per run and kept in sync with inserts"""
+
+    def __init__(self):
+        self.matakuliah: Dict[str, int] = {}
+        self.waktu: Dict[Tuple[int, str], int] = {}
+        self.nilai: Dict[str, Tuple[int, float]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.loaded = False
+        self._pending: List[Tuple[Dict, object]] = []
+
+    def preload(self, cursor):
+        """Read all existing dimension keys in one round trip per table"""
+        cursor.execute("SELECT id_mk, kode_mk FROM Dim_MataKuliah")
+        self.matakuliah = {row['kode_mk']: row['id_mk'] for row in cursor.fetchall()}
+        cursor.execute("SELECT id_waktu, tahun, semester FROM Dim_Waktu")
+        self.waktu = {(row['tahun'], row['semester']): row['id_waktu'] for row in cursor.fetchall()}
+        cursor.execute("SELECT id_nilai, huruf_nilai, bobot_nilai FROM Dim_Nilai")
+        self.nilai = {row['huruf_nilai']: (row['id_nilai'], row['bobot_nilai']) for row in cursor.fetchall()}
+        self._pending.clear()
+        self.loaded = True
+
+    def get(self, table: Dict, key):
+        """Look up a key, counting hits and misses"""
+        value = table.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def add(self, table: Dict, key, value):
+        """Remember a key resolved inside the current (uncommitted) transaction"""
+        table[key] = value
+        self._pending.append((table, key))
+
+    def commit(self):
+        self._pending.clear()
+
+    def rollback(self):
+        """Forget keys whose rows may have disappeared with a rolled back transaction"""
+        for table, key in self._pending:
+            table.pop(key, None)
+        self._pending.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses}
+
+class InsightChanges:
+    """Keys of the Insight_* rows made stale by the loads since the last refresh"""
+
+    def __init__(self):
+        self.courses: Set[int] = set()
+        self.semesters: Set[int] = set()
+        self.students: Set[int] = set()
+        self.statuses: Set[str] = set()
+        self.angkatan: Set[str] = set()
+
+    def update(self, other: "InsightChanges"):
+        for name in ('courses', 'semesters', 'students', 'statuses', 'angkatan'):
+            getattr(self, name).update(getattr(other, name))
+
+    def clear(self):
+        for name in ('courses', 'semesters', 'students', 'statuses', 'angkatan'):
+            getattr(self, name).clear()
+
+    def __bool__(self) -> bool:
+        return bool(self.courses or self.semesters or self.students or self.statuses or self.angkatan)
+
+class PipelineMonitor:
+    """Live queue depths and per-stage throughput of a running process_folder"""
+
+    def __init__(self, parsed_queue: "queue.Queue", interval: float = 10.0):
+        self.parsed_queue = parsed_queue
+        self.interval = interval
+        self.started = time.monotonic()
+        self.last_logged = self.started
+        self.counts = {'scanned': 0, 'skipped': 0, 'parsed': 0, 'processed': 0, 'failed': 0}
+        self.in_flight = 0
+
+    def count(self, stage: str, n: int = 1):
+        self.counts[stage] += n
+
+    def update(self, stats: Dict[str, int]):
+        """Take over the loader's processed/failed counters and log progress when due"""
+        self.counts['processed'] = stats['processed']
+        self.counts['failed'] = stats['failed']
+        self.log_progress()
+
+    def snapshot(self) -> Dict:
+        """Current counters, queue depths and rates; safe to call from another thread"""
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        snapshot = dict(self.counts)
+        snapshot.update({
+            'elapsed_s': round(elapsed, 2),
+            'parse_in_flight': self.in_flight,
+            'load_queue_depth': self.parsed_queue.qsize(),
+            'load_queue_max': self.parsed_queue.maxsize,
+            'scanned_per_s': round(self.counts['scanned'] / elapsed, 2),
+            'parsed_per_s': round(self.counts['parsed'] / elapsed, 2),
+            'processed_per_s': round(self.counts['processed'] / elapsed, 2),
+        })
+        return snapshot
+
+    def log_progress(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self.last_logged < self.interval:
+            return
+        self.last_logged = now
+        s = self.snapshot()
+        logger.info(f"Pipeline: scanned {s['scanned']} ({s['scanned_per_s']}/s), skipped {s['skipped']}, parsed {s['parsed']} ({s['parsed_per_s']}/s), "
+                    f"loaded {s['processed']} ({s['processed_per_s']}/s), failed {s['failed']} | in flight {s['parse_in_flight']}, load queue {s['load_queue_depth']}/{s['load_queue_max']}")
+
+# Batas bucket histogram (detik untuk latensi, jumlah untuk round trip per transkrip).
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+ROUND_TRIP_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+STATEMENT_TABLE_PATTERN = re.compile(r'\b(?:INTO|FROM|UPDATE|TABLE(?:\s+IF(?:\s+NOT)?\s+EXISTS)?|INDEX(?:\s+IF\s+NOT\s+EXISTS)?\s+\w+\s+ON)\s+(\w+)', re.IGNORECASE)
+
+@lru_cache(maxsize=512)
+def _statement_type(sql: str) -> Tuple[str, str]:
+    """Classify a statement as (verb, table) for per-statement-type metrics"""
+    verb = sql.split(None, 1)[0].upper() if sql.strip() else ''
+    table = STATEMENT_TABLE_PATTERN.search(sql)
+    return verb, table.group(1) if table else ''
+
+class Histogram:
+    """Latency/count histogram with cumulative buckets in the Prometheus layout"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float, n: int = 1):
+        self.counts[bisect.bisect_left(self.buckets, value)] += n
+        self.count += n
+        self.sum += value * n
+        self.max = max(self.max, value)
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, cumulative count) pairs including +Inf"""
+        total, result = 0, []
+        for bound, count in zip([str(b) for b in self.buckets] + ['+Inf'], self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (max for the overflow bucket)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        for (bound, total), upper in zip(self.cumulative(), list(self.buckets) + [self.max]):
+            if total >= rank:
+                return min(upper, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict:
+        return {'count': self.count, 'sum': round(self.sum, 6), 'mean': round(self.sum / self.count, 6) if self.count else None,
+                'max': round(self.max, 6), 'p50': self.quantile(0.5), 'p95': self.quantile(0.95), 'p99': self.quantile(0.99),
+                'buckets': dict(self.cumulative())}
+
+class RunMetrics:
+    """Wall time per PDF, stage and SQL statement type, round trips, rows written and failure reasons of one run"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.stages: Dict[str, Histogram] = defaultdict(Histogram)
+        self.statements: Dict[Tuple[str, str], Histogram] = defaultdict(Histogram)
+        self.round_trips = 0
+        self.round_trips_per_transcript = Histogram(ROUND_TRIP_BUCKETS)
+        self.rows_written: Dict[str, int] = defaultdict(int)
+        self.failures: Dict[str, int] = defaultdict(int)
+        self.retries: Dict[str, int] = defaultdict(int)
+        self.writes_avoided: Dict[str, int] = defaultdict(int)
+        self.pages: Dict[str, int] = {'cached': 0, 'extracted': 0}
+
+    def observe_stage(self, stage: str, seconds: float):
+        with self.lock:
+            self.stages[stage].observe(seconds)
+
+    @contextmanager
+    def time_stage(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(stage, time.perf_counter() - start)
+
+    def observe_statement(self, sql: str, seconds: float, round_trips: int, rowcount: int):
+        verb, table = _statement_type(sql)
+        with self.lock:
+            self.statements[(verb, table)].observe(seconds)
+            self.round_trips += round_trips
+            if verb in ('INSERT', 'REPLACE', 'UPDATE', 'DELETE') and rowcount > 0:
+                self.rows_written[table] += rowcount
+
+    def observe_transcripts(self, transcripts: int, round_trips: int):
+        """Spread the round trips of one load transaction over the transcripts it loaded"""
+        if transcripts:
+            with self.lock:
+                self.round_trips_per_transcript.observe(round_trips / transcripts, transcripts)
+
+    def fail(self, reason: str):
+        with self.lock:
+            self.failures[reason] += 1
+
+    def retry(self, reason: str):
+        with self.lock:
+            self.retries[reason] += 1
+
+    def avoid_writes(self, table: str, rows: int):
+        """Count rows the loader left alone because their stored values were already current"""
+        if rows:
+            with self.lock:
+                self.writes_avoided[table] += rows
+
+    def count_pages(self, cached: int, extracted: int):
+        """Count PDF pages served from the page cache and pages run through the PDF engine"""
+        with self.lock:
+            self.pages['cached'] += cached
+            self.pages['extracted'] += extracted
+
+    def report(self, extra: Optional[Dict] = None) -> Dict:
+        """Run report as a JSON-serialisable dict"""
+        with self.lock:
+            report = {
+                'started_at': datetime.fromtimestamp(self.started).isoformat(timespec='seconds'),
+                'duration_s': round(time.time() - self.started, 3),
+                'stages': {stage: hist.to_dict() for stage, hist in sorted(self.stages.items())},
+                'sql_statements': {f"{verb} {table}".strip(): hist.to_dict() for (verb, table), hist in sorted(self.statements.items())},
+                'sql_round_trips': self.round_trips,
+                'round_trips_per_transcript': self.round_trips_per_transcript.to_dict(),
+                'rows_written': dict(sorted(self.rows_written.items())),
+                'writes_avoided': dict(sorted(self.writes_avoided.items())),
+                'failures': dict(sorted(self.failures.items())),
+                'load_retries': dict(sorted(self.retries.items())),
+                'pdf_pages': dict(self.pages),
+            }
+        report.update(extra or {})
+        return report
+
+    def write_json(self, path: str, extra: Optional[Dict] = None):
+        _write_atomic(path, json.dumps(self.report(extra), indent=2, default=str))
+
+    def write_prometheus(self, path: str, extra_counters: Optional[Dict[str, int]] = None):
+        """Write the metrics in Prometheus text format (e.g. for the node_exporter textfile collector)"""
+        lines = []
+
+        def histogram(name: str, help_text: str, series: List[Tuple[str, Histogram]]):
+            lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} histogram"])
+            for labels, hist in series:
+                sep = ',' if labels else ''
+                for bound, total in hist.cumulative():
+                    lines.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {total}')
+                suffix = f"{{{labels}}}" if labels else ''
+                lines.append(f"{name}_sum{suffix} {hist.sum:.6f}")
+                lines.append(f"{name}_count{suffix} {hist.count}")
+
+        # Jumlah per run, bukan counter kumulatif: nilainya kembali kecil di run berikutnya, jadi diekspor sebagai gauge.
+        def gauge(name: str, help_text: str, label: str, values: Dict[str, int]):
+            lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} gauge"])
+            for key, value in sorted(values.items()):
+                lines.append(f'{name}{{{label}="{key}"}} {value}')
+
+        with self.lock:
+            histogram("etl_stage_duration_seconds", "Wall time per ETL stage invocation.",
+                      [(f'stage="{stage}"', hist) for stage, hist in sorted(self.stages.items())])
+            histogram("etl_sql_statement_duration_seconds", "Wall time per SQL statement by verb and table.",
+                      [(f'verb="{verb}",table="{table}"', hist) for (verb, table), hist in sorted(self.statements.items())])
+            histogram("etl_round_trips_per_transcript", "SQL round trips per loaded transcript.",
+                      [('', self.round_trips_per_transcript)])
+            lines.extend(["# HELP etl_sql_round_trips SQL round trips issued by the last run.", "# TYPE etl_sql_round_trips gauge",
+                          f"etl_sql_round_trips {self.round_trips}"])
+            gauge("etl_rows_written", "Rows affected by INSERT/UPDATE/DELETE statements in the last run.", 'table', self.rows_written)
+            gauge("etl_writes_avoided", "Rows the last run did not rewrite because the stored values were unchanged.", 'table', self.writes_avoided)
+            gauge("etl_failures", "Failed transcripts of the last run by reason.", 'reason', self.failures)
+            gauge("etl_load_retries", "Load transactions of the last run retried after a deadlock or lock wait timeout.", 'reason', self.retries)
+            gauge("etl_pdf_pages", "PDF pages of the last run served from the page cache or extracted by the PDF engine.", 'source', self.pages)
+        if extra_counters:
+            gauge("etl_transcripts", "Transcripts of the last run by outcome.", 'outcome', extra_counters)
+        lines.extend(["# HELP etl_run_duration_seconds Wall time of the last run.", "# TYPE etl_run_duration_seconds gauge",
+                      f"etl_run_duration_seconds {time.time() - self.started:.3f}",
+                      "# HELP etl_last_run_timestamp_seconds Start of the last run.", "# TYPE etl_last_run_timestamp_seconds gauge",
+                      f"etl_last_run_timestamp_seconds {self.started:.0f}"])
+        _write_atomic(path, '\n'.join(lines) + '\n')
+
+class InstrumentedCursor:
+    """Cursor proxy that times every statement and counts round trips and written rows"""
+
+    def __init__(self, cursor, metrics: RunMetrics):
+        self._cursor = cursor
+        self._metrics = metrics
+        # Round trip cursor ini saja; RunMetrics dipakai bersama oleh semua writer.
+        self.round_trips = 0
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def execute(self, sql: str, params=None):
+        start = time.perf_counter()
+        result = self._cursor.execute(sql, params)
+        self.round_trips += 1
+        self._metrics.observe_statement(sql, time.perf_counter() - start, 1, getattr(self._cursor, 'rowcount', -1))
+        return result
+
+    def executemany(self, sql: str, rows):
+        rows = list(rows)
+        start = time.perf_counter()
+        result = self._cursor.executemany(sql, rows)
+        # mysql-connector mengirim executemany INSERT sebagai satu statement multi-row;
+        # statement lain dieksekusi satu per baris.
+        verb, _ = _statement_type(sql)
+        round_trips = min(len(rows), 1) if verb in ('INSERT', 'REPLACE') else len(rows)
+        self.round_trips += round_trips
+        self._metrics.observe_statement(sql, time.perf_counter() - start, round_trips, getattr(self._cursor, 'rowcount', -1))
+        return result
+
+# Tabel star schema, urut dimensi lalu fakta (dipakai untuk ekspor).
+STAR_SCHEMA_TABLES = ['Dim_Mahasiswa', 'Dim_MataKuliah', 'Dim_Waktu', 'Dim_Nilai',
+                      'Fact_Transkrip', 'Fact_Kelulusan', 'Fact_Prestasi_Semester', 'Fact_Analisis_MataKuliah']
+
+# Error driver yang ditangani sebagai kegagalan database biasa, apa pun backend-nya.
+DB_ERRORS = (mysql.connector.Error, sqlite3.Error)
+
+class WarehouseBackend(ABC):
+    """Dialect and connection handling for a warehouse holding the star schema.
+
+    The ETL writes its SQL with `%s` placeholders and MySQL DDL; a backend connects,
+    adapts the DDL and renders the few statements whose syntax differs between engines.
+    """
+    name = 'base'
+    # Apakah beberapa koneksi boleh menulis bersamaan (mode multi-writer).
+    concurrent_writers = False
+
+    @abstractmethod
+    def connect(self):
+        """Open a connection with a dictionary-capable cursor()"""
+
+    def is_transient(self, err: Exception) -> bool:
+        """Whether a failed transaction can simply be retried (deadlock, lock wait timeout)"""
+        return False
+
+    def prepare_database(self, cursor):
+        """Create/select the database before the tables are created"""
+
+    def table_ddl(self, sql: str) -> str:
+        return sql
+
+    @abstractmethod
+    def ensure_index(self, cursor, table: str, index_name: str, columns: str):
+        """Create the index unless it already exists"""
+
+    @abstractmethod
+    def upsert_sql(self, table: str, columns: List[str], keys: List[str], increment: Iterable[str] = (), update: bool = True) -> str:
+        """INSERT that replaces (or, for `increment`, adds to) non-key columns on a unique key conflict; `update=False` keeps the existing row"""
+
+    def insert_key_sql(self, insert_sql: str, key_col: str) -> str:
+        """INSERT of a dimension row whose cursor.lastrowid is the row's key"""
+        return insert_sql
+
+    def row_in(self, columns: str, count: int) -> str:
+        """`(a, b) IN (...)` condition for `count` placeholder pairs"""
+        return f"({columns}) IN ({', '.join(['(%s, %s)'] * count)})"
+
+class MySQLBackend(WarehouseBackend):
+    """Production warehouse on a MySQL/MariaDB server"""
+    name = 'mysql'
+    concurrent_writers = True
+    # ER_LOCK_WAIT_TIMEOUT dan ER_LOCK_DEADLOCK.
+    TRANSIENT_ERRNOS = (1205, 1213)
+
+    def __init__(self, db_config: Dict):
+        self.db_config = db_config
+
+    def connect(self):
+        return mysql.connector.connect(**self.db_config)
+
+    def is_transient(self, err: Exception) -> bool:
+        return isinstance(err, mysql.connector.Error) and err.errno in self.TRANSIENT_ERRNOS
+
+    def prepare_database(self, cursor):
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.db_config['database']}")
+        cursor.execute(f"USE {self.db_config['database']}")
+
+    def ensure_index(self, cursor, table: str, index_name: str, columns: str):
+        cursor.execute("SELECT COUNT(*) FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s", (table, index_name))
+        if cursor.fetchone()[0] == 0:
+            logger.info(f"Adding index {index_name} on {table} ({columns})")
+            cursor.execute(f"ALTER TABLE {table} ADD INDEX {index_name} ({columns})")
+
+    def upsert_sql(self, table: str, columns: List[str], keys: List[str], increment: Iterable[str] = (), update: bool = True) -> str:
+        increment = set(increment)
+        if update:
+            assignments = [f"{col} = {col} + VALUES({col})" if col in increment else f"{col} = VALUES({col})" for col in columns if col not in keys]
+        else:
+            assignments = [f"{keys[0]} = {keys[0]}"]
+        return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))}) ON DUPLICATE KEY UPDATE {', '.join(assignments)}"
+
+    def insert_key_sql(self, insert_sql: str, key_col: str) -> str:
+        # Jika loader lain lebih dulu membuat baris yang sama, `LAST_INSERT_ID(key)`
+        # mengembalikan kunci yang sudah ada alih-alih gagal karena duplikasi.
+        return f"{insert_sql} ON DUPLICATE KEY UPDATE {key_col} = LAST_INSERT_ID({key_col})"
+
+class SQLiteCursor:
+    """DB-API cursor adapter giving sqlite3 the mysql-connector interface the ETL uses (`%s`, dictionary rows)"""
+
+    def __init__(self, cursor: sqlite3.Cursor, dictionary: bool = False):
+        self._cursor = cursor
+        self.dictionary = dictionary
+
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _translate(sql: str) -> str:
+        return sql.replace('%s', '?')
+
+    def _row(self, row):
+        if row is None or not self.dictionary:
+            return row
+        return dict(zip([col[0] for col in self._cursor.description], row))
+
+    def execute(self, sql: str, params=None):
+        self._cursor.execute(self._translate(sql), params or ())
+
+    def executemany(self, sql: str, rows):
+        self._cursor.executemany(self._translate(sql), rows)
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        if not self.dictionary:
+            return rows
+        names = [col[0] for col in self._cursor.description]
+        return [dict(zip(names, row)) for row in rows]
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def close(self):
+        self._cursor.close()
+
+class SQLiteConnection:
+    """sqlite3 connection whose cursors accept `dictionary=True` like mysql-connector"""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._connection = connection
+
+    def cursor(self, dictionary: bool = False) -> SQLiteCursor:
+        return SQLiteCursor(self._connection.cursor(), dictionary)
+
+    def commit(self):
+        self._connection.commit()
+
+    def rollback(self):
+        self._connection.rollback()
+
+    def close(self):
+        self._connection.close()
+
+class SQLiteBackend(WarehouseBackend):
+    """Embedded single-file warehouse for development and offline analytics runs"""
+    name = 'sqlite'
+
+    def __init__(self, path: str = 'warehouse.sqlite'):
+        self.path = path
+
+    def connect(self) -> SQLiteConnection:
+        # DECIMAL disimpan sebagai REAL, DATETIME sebagai teks ISO.
+        sqlite3.register_adapter(Decimal, float)
+        sqlite3.register_adapter(datetime, lambda value: value.isoformat(' ', 'seconds'))
+        # ConnectionPool boleh menyerahkan koneksi ke thread lain (tetap satu thread pada satu waktu).
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        connection.execute("PRAGMA foreign_keys = ON")
+        return SQLiteConnection(connection)
+
+    def is_transient(self, err: Exception) -> bool:
+        # Proses lain memegang kunci tulis file database lebih lama dari busy timeout.
+        return isinstance(err, sqlite3.OperationalError) and 'locked' in str(err)
+
+    def table_ddl(self, sql: str) -> str:
+        sql = re.sub(r'\bINT AUTO_INCREMENT PRIMARY KEY\b', 'INTEGER PRIMARY KEY', sql)
+        return re.sub(r'\bUNIQUE KEY \w+ \(', 'UNIQUE (', sql)
+
+    def ensure_index(self, cursor, table: str, index_name: str, columns: str):
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({columns})")
+
+    def upsert_sql(self, table: str, columns: List[str], keys: List[str], increment: Iterable[str] = (), update: bool = True) -> str:
+        increment = set(increment)
+        insert = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))}) ON CONFLICT ({', '.join(keys)})"
+        if not update:
+            return f"{insert} DO NOTHING"
+        assignments = [f"{col} = {table}.{col} + excluded.{col}" if col in increment else f"{col} = excluded.{col}" for col in columns if col not in keys]
+        return f"{insert} DO UPDATE SET {', '.join(assignments)}"
+
+    def row_in(self, columns: str, count: int) -> str:
+        # SQLite hanya menerima row value IN terhadap subquery, jadi daftar pasangan dibungkus VALUES.
+        return f"({columns}) IN (VALUES {', '.join(['(%s, %s)'] * count)})"
+
+class ParquetSink:
+    """Columnar export of the star schema, one Parquet file per table"""
+
+    def __init__(self, folder: str):
+        self.folder = folder
+
+    def export(self, cursor, tables: List[str] = STAR_SCHEMA_TABLES) -> Dict[str, int]:
+        """Write every table to `<folder>/<table>.parquet` and return the row counts"""
+        os.makedirs(self.folder, exist_ok=True)
+        counts = {}
+        for table in tables:
+            cursor.execute(f"SELECT * FROM {table}")
+            rows = cursor.fetchall()
+            columns = [col[0] for col in cursor.description]
+            frame = pd.DataFrame.from_records(rows, columns=columns)
+            frame.to_parquet(os.path.join(self.folder, f"{table}.parquet"), index=False)
+            counts[table] = len(frame)
+        return counts
+
+class AnalyticsSnapshot:
+    """Columnar in-memory copy of the star schema for interactive reads, saved as memory-mappable .npy files.
+
+    Students are sorted by NRP and courses by kode_mk, so a lookup is one binary search; the semester
+    rows of a student and the analysis rows of a course are contiguous slices found through offset
+    arrays, and rankings are precomputed argsorts. Status, tahap and periods are small integer codes.
+    """
+
+    # Per bagian: query sumber, kolom kunci untuk patch, dan (nama kolom, jenis) sesuai urutan SELECT.
+    SECTIONS = {
+        'student': ("SELECT id_mahasiswa, NRP, nama_mahasiswa, status_mahasiswa, ipk_kumulatif, sks_tempuh, sks_lulus, ip_persiapan, sks_persiapan, ip_sarjana, sks_sarjana FROM Dim_Mahasiswa",
+                    'id_mahasiswa', [('id', np.int32), ('NRP', str), ('nama_mahasiswa', str), ('status_mahasiswa', object), ('ipk_kumulatif', np.float32),
+                                     ('sks_tempuh', np.int32), ('sks_lulus', np.int32), ('ip_persiapan', np.float32), ('sks_persiapan', np.int32),
+                                     ('ip_sarjana', np.float32), ('sks_sarjana', np.int32)]),
+        'semester': ("SELECT p.id_mahasiswa, w.tahun * 2 + CASE WHEN w.semester = 'Genap' THEN 1 ELSE 0 END, p.ips, p.sks_diambil_semester, p.sks_lulus_semester, p.jumlah_mk_semester, p.ipk_saat_itu, p.perubahan_ips FROM Fact_Prestasi_Semester p JOIN Dim_Waktu w ON p.id_waktu = w.id_waktu",
+                     'p.id_mahasiswa', [('student_id', np.int32), ('period', np.int16), ('ips', np.float32), ('sks_diambil_semester', np.int16), ('sks_lulus_semester', np.int16),
+                                        ('jumlah_mk_semester', np.int16), ('ipk_saat_itu', np.float32), ('perubahan_ips', np.float32)]),
+        'course': ("SELECT id_mk, kode_mk, nama_mk, sks_mk, tahap_mk FROM Dim_MataKuliah",
+                   'id_mk', [('id', np.int32), ('kode_mk', str), ('nama_mk', str), ('sks_mk', np.int16), ('tahap_mk', object)]),
+        'analisis': ("SELECT a.id_mk, w.tahun * 2 + CASE WHEN w.semester = 'Genap' THEN 1 ELSE 0 END, a.jumlah_pengambil_mk, a.rata_rata_bobot_nilai, a.persentase_kelulusan, a.jumlah_nilai_A, a.jumlah_nilai_AB, a.jumlah_nilai_B, a.jumlah_nilai_BC, a.jumlah_nilai_C, a.jumlah_nilai_D, a.jumlah_nilai_E FROM Fact_Analisis_MataKuliah a JOIN Dim_Waktu w ON a.id_waktu = w.id_waktu",
+                     'a.id_mk', [('course_id', np.int32), ('period', np.int16), ('jumlah_pengambil_mk', np.int32), ('rata_rata_bobot_nilai', np.float32), ('persentase_kelulusan', np.float32)]
+                     + [(f'jumlah_nilai_{grade}', np.int32) for grade in ('A', 'AB', 'B', 'BC', 'C', 'D', 'E')]),
+    }
+    RANKINGS = ('ipk_kumulatif', 'ip_sarjana', 'ip_persiapan', 'sks_lulus')
+
+    def __init__(self, arrays: Dict[str, np.ndarray], meta: Dict):
+        self.arrays = arrays
+        self.meta = meta
+
+    @classmethod
+    def build(cls, cursor, run_id: Optional[int] = None) -> "AnalyticsSnapshot":
+        """Read the whole star schema into a new snapshot"""
+        return cls._from_sections({section: cls._fetch(cursor, section) for section in cls.SECTIONS}, run_id)
+
+    def patched(self, cursor, student_ids: Iterable[int], course_ids: Iterable[int], run_id: Optional[int] = None) -> "AnalyticsSnapshot":
+        """New snapshot with the rows of the given students and courses re-read from the warehouse"""
+        changed = {'student': sorted(student_ids), 'semester': sorted(student_ids), 'course': None, 'analisis': sorted(course_ids)}
+        sections = {}
+        for section, ids in changed.items():
+            # Dim_MataKuliah kecil, jadi selalu dibaca ulang utuh.
+            fresh = self._fetch(cursor, section, ids)
+            if ids is None:
+                sections[section] = fresh
+                continue
+            old = self._decoded(section)
+            keep = ~np.isin(old[self.SECTIONS[section][2][0][0]], ids)
+            sections[section] = {name: np.concatenate([old[name][keep], fresh[name]]) for name in old}
+        return self._from_sections(sections, run_id if run_id is not None else self.meta.get('run_id'))
+
+    @classmethod
+    def _fetch(cls, cursor, section: str, ids: Optional[List[int]] = None) -> Dict[str, np.ndarray]:
+        """Columns of one section, for all rows or only those of `ids`"""
+        query, key, columns = cls.SECTIONS[section]
+        rows = []
+        if ids is None:
+            cursor.execute(query)
+            rows = cursor.fetchall()
+        for start in range(0, len(ids or []), BULK_CHUNK_ROWS):
+            chunk = ids[start:start + BULK_CHUNK_ROWS]
+            cursor.execute(f"{query} WHERE {key} IN ({', '.join(['%s'] * len(chunk))})", chunk)
+            rows.extend(cursor.fetchall())
+        values = list(zip(*rows)) if rows else [()] * len(columns)
+        return {name: _snapshot_column(column, dtype) for (name, dtype), column in zip(columns, values)}
+
+    @classmethod
+    def _from_sections(cls, sections: Dict[str, Dict[str, np.ndarray]], run_id: Optional[int]) -> "AnalyticsSnapshot":
+        """Sort, index and encode decoded sections into snapshot arrays"""
+        arrays, labels = {}, {}
+        student, semester, course, analisis = (sections[name] for name in ('student', 'semester', 'course', 'analisis'))
+        for table, sort_key in ((student, 'NRP'), (course, 'kode_mk')):
+            order = np.argsort(table[sort_key], kind='stable')
+            for name in table:
+                table[name] = table[name][order]
+        # Baris anak diurutkan per (posisi induk, periode); offsets[i]:offsets[i + 1] adalah baris induk ke-i.
+        for prefix, parent, child, parent_key in (('student', student, semester, 'student_id'), ('course', course, analisis, 'course_id')):
+            position = _snapshot_positions(parent['id'], child[parent_key])
+            order = np.lexsort((child['period'], position))
+            order = order[position[order] >= 0]
+            for name in child:
+                child[name] = child[name][order]
+            arrays[f'{prefix}.offsets'] = np.searchsorted(position[order], np.arange(len(parent['id']) + 1)).astype(np.int64)
+        for prefix, table in sections.items():
+            for name, values in table.items():
+                if values.dtype == object:
+                    labels[f'{prefix}.{name}'] = sorted({value for value in values if value is not None})
+                    codes = {label: code for code, label in enumerate(labels[f'{prefix}.{name}'])}
+                    values = np.array([codes.get(value, -1) for value in values], dtype=np.int16)
+                arrays[f'{prefix}.{name}'] = values
+        ranked = {}
+        for metric in cls.RANKINGS:
+            values = student[metric].astype(np.float64)
+            values[(values < 0) | np.isnan(values)] = np.nan
+            # Urutan menurun yang stabil (NRP terkecil dulu bila nilainya sama); NULL di belakang.
+            arrays[f'rank.{metric}'] = np.argsort(-values, kind='stable').astype(np.int32)
+            ranked[metric] = int(np.count_nonzero(~np.isnan(values)))
+        meta = {'built_at': datetime.now().isoformat(timespec='seconds'), 'run_id': run_id, 'labels': labels, 'ranked': ranked,
+                'rows': {prefix: len(table[next(iter(table))]) for prefix, table in sections.items()}, 'arrays': sorted(arrays)}
+        return cls(arrays, meta)
+
+    def _decoded(self, section: str) -> Dict[str, np.ndarray]:
+        """Columns of one section with label codes turned back into values (the input form of _from_sections)"""
+        columns = {}
+        for name, _ in self.SECTIONS[section][2]:
+            values = np.asarray(self.arrays[f'{section}.{name}'])
+            if f'{section}.{name}' in self.meta['labels']:
+                values = np.array(self.meta['labels'][f'{section}.{name}'] + [None], dtype=object)[values]
+            columns[name] = values
+        return columns
+
+    def save(self, path: str):
+        """Write the snapshot as a new version folder of .npy files under `path`, then switch the pointer file to it.
+
+        Replacing the pointer is a single os.replace, so readers and a crash mid-save always leave a complete version.
+        """
+        previous = _snapshot_version(path)
+        version = f"v{time.time_ns()}"
+        os.makedirs(os.path.join(path, version))
+        for name, values in self.arrays.items():
+            np.save(os.path.join(path, version, f"{name}.npy"), values)
+        with open(os.path.join(path, version, 'meta.json'), 'w', encoding='utf-8') as file:
+            json.dump(self.meta, file, indent=2)
+        _write_atomic(os.path.join(path, SNAPSHOT_POINTER), version)
+        # Versi sebelumnya disimpan untuk pembaca yang baru saja membaca pointer lama; sisa lain
+        # (versi lebih tua atau save yang terputus) dihapus.
+        for name in os.listdir(path):
+            if name not in (version, previous) and os.path.isdir(os.path.join(path, name)):
+                shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+
+    def save_meta(self, path: str):
+        """Rewrite only the metadata of the current version at `path` (e.g. its run_id)"""
+        _write_atomic(os.path.join(path, _snapshot_version(path), 'meta.json'), json.dumps(self.meta, indent=2))
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "AnalyticsSnapshot":
+        """Open the current version of a saved snapshot; arrays are memory-mapped read-only unless `mmap` is False"""
+        for attempt in range(3):
+            version = _snapshot_version(path)
+            if version is None:
+                raise FileNotFoundError(f"No analytics snapshot at {path}")
+            try:
+                with open(os.path.join(path, version, 'meta.json'), encoding='utf-8') as file:
+                    meta = json.load(file)
+                # np.asarray melepas subclass np.memmap, yang membuat setiap indexing jauh lebih lambat.
+                arrays = {name: np.asarray(np.load(os.path.join(path, version, f"{name}.npy"), mmap_mode='r' if mmap else None)) for name in meta['arrays']}
+                return cls(arrays, meta)
+            except FileNotFoundError:
+                # Dua save selesai sejak pointer dibaca sehingga versi ini sudah dihapus; baca pointer lagi.
+                if attempt == 2:
+                    raise
+
+    def top_students(self, n: int = 10, by: str = 'ipk_kumulatif', ascending: bool = False, status: Optional[str] = None) -> List[Dict]:
+        """The `n` highest (or lowest) ranked students by one of RANKINGS, optionally only those with `status`"""
+        if by not in self.RANKINGS:
+            raise ValueError(f"Unknown ranking '{by}' (choose from {', '.join(self.RANKINGS)})")
+        order = self.arrays[f'rank.{by}'][:self.meta['ranked'][by]]
+        if ascending:
+            order = order[::-1]
+        if status is not None:
+            statuses = self.meta['labels']['student.status_mahasiswa']
+            if status not in statuses:
+                return []
+            # Peringkat disaring per potongan yang makin besar, jadi n kecil tidak memindai semua mahasiswa.
+            code, codes = statuses.index(status), self.arrays['student.status_mahasiswa']
+            picked, start, chunk = [], 0, max(4 * n, 256)
+            while len(picked) < n and start < len(order):
+                part = order[start:start + chunk]
+                picked.extend(part[codes[part] == code].tolist())
+                start, chunk = start + chunk, chunk * 2
+            order = np.array(picked, dtype=np.int64)
+        return self._rows('student', order[:n], skip=('id',))
+
+    def student(self, nrp: str) -> Optional[Dict]:
+        index = _snapshot_find(self.arrays['student.NRP'], nrp)
+        return None if index is None else self._rows('student', slice(index, index + 1), skip=('id',))[0]
+
+    def student_history(self, nrp: str) -> Optional[List[Dict]]:
+        """Fact_Prestasi_Semester rows of a student in period order, or None for an unknown NRP"""
+        index = _snapshot_find(self.arrays['student.NRP'], nrp)
+        if index is None:
+            return None
+        offsets = self.arrays['student.offsets']
+        return self._rows('semester', slice(offsets[index], offsets[index + 1]), skip=('student_id',))
+
+    def course_distribution(self, kode_mk: str, tahun: Optional[int] = None, semester: Optional[str] = None) -> Optional[List[Dict]]:
+        """Fact_Analisis_MataKuliah rows (grade counts per semester) of a course, or None for an unknown kode_mk"""
+        index = _snapshot_find(self.arrays['course.kode_mk'], kode_mk)
+        if index is None:
+            return None
+        offsets = self.arrays['course.offsets']
+        rows = self._rows('analisis', slice(offsets[index], offsets[index + 1]), skip=('course_id',))
+        return [row for row in rows if (tahun is None or row['tahun'] == tahun) and (semester is None or row['semester'] == semester)]
+
+    def _rows(self, section: str, index, skip: Tuple[str, ...] = ()) -> List[Dict]:
+        """Rows at `index` (a slice or array of positions) as dicts with the warehouse column names; NULLs come back as None"""
+        columns = {}
+        # Per kolom sekali indexing + tolist(); mengambil skalar satu per satu dari numpy jauh lebih lambat.
+        for name, dtype in self.SECTIONS[section][2]:
+            if name in skip:
+                continue
+            values = self.arrays[f'{section}.{name}'][index].tolist()
+            if name == 'period':
+                columns['tahun'] = [period // 2 for period in values]
+                columns['semester'] = ['Genap' if period % 2 else 'Gasal' for period in values]
+            elif dtype is object:
+                labels = self.meta['labels'][f'{section}.{name}']
+                columns[name] = [labels[code] if code >= 0 else None for code in values]
+            elif dtype is str:
+                columns[name] = values
+            elif dtype is np.float32:
+                # Kolom DECIMAL(x,2) disimpan sebagai float32; dibulatkan kembali ke 2 desimal.
+                columns[name] = [None if value != value else round(value, 2) for value in values]
+            else:
+                columns[name] = [None if value < 0 else value for value in values]
+        names = list(columns)
+        return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+class ConnectionPool:
+    """Fixed-size pool of warehouse connections, opened lazily and shared by the writer threads"""
+
+    def __init__(self, backend: WarehouseBackend, size: int):
+        self.backend = backend
+        self.size = size
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Take an idle connection, open a new one while under `size`, or wait for one to be returned"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            opening = self._opened < self.size
+            if opening:
+                self._opened += 1
+        if not opening:
+            return self._idle.get()
+        try:
+            return self.backend.connect()
+        except BaseException:
+            with self._lock:
+                self._opened -= 1
+            raise
+
+    def put(self, connection):
+        self._idle.put(connection)
+
+    @contextmanager
+    def connection(self):
+        connection = self.get()
+        try:
+            yield connection
+        finally:
+            self.put(connection)
+
+    def close(self):
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                connection.close()
+            except DB_ERRORS as err:
+                logger.warning(f"Error closing pooled connection: {err}")
+            with self._lock:
+                self._opened -= 1
+
+class FolderWatcher:
+    """Reports bursts of new or changed PDFs in a folder: inotify on Linux, stat polling elsewhere"""
+
+    def __init__(self, folder: str, poll_interval: float = 2.0, settle: float = WATCH_SETTLE_S, max_batch: float = WATCH_MAX_BATCH_S):
+        self.folder = folder
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self.max_batch = max_batch
+        self._fd = self._inotify_open(folder)
+        self.mode = 'inotify' if self._fd is not None else 'polling'
+        self._snapshot = self._scan() if self._fd is None else {}
+        self._last_poll = time.monotonic()
+
+    @staticmethod
+    def _inotify_open(folder: str) -> Optional[int]:
+        """inotify descriptor watching `folder`, or None where inotify is not available"""
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, os.fsencode(folder), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            os.close(fd)
+            return None
+        return fd
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                if entry.name.lower().endswith('.pdf') and entry.is_file():
+                    st = entry.stat()
+                    snapshot[entry.path] = (st.st_size, st.st_mtime_ns)
+        return snapshot
+
+    def _poll(self, timeout: float) -> Set[str]:
+        """PDFs changed within the next `timeout` seconds (empty if none)"""
+        if self._fd is not None:
+            ready, _, _ = select.select([self._fd], [], [], timeout)
+            if not ready:
+                return set()
+            changed = set()
+            while True:
+                try:
+                    data = os.read(self._fd, 65536)
+                except BlockingIOError:
+                    break
+                offset = 0
+                while offset < len(data):
+                    _, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+                    name = os.fsdecode(data[offset + INOTIFY_EVENT.size:offset + INOTIFY_EVENT.size + length].rstrip(b'\0'))
+                    offset += INOTIFY_EVENT.size + length
+                    if mask & IN_Q_OVERFLOW:
+                        # Antrean kernel penuh sehingga event hilang; semua PDF dilaporkan dan manifest melewati yang tidak berubah.
+                        changed.update(self._scan())
+                    elif name.lower().endswith('.pdf'):
+                        changed.add(os.path.join(self.folder, name))
+            return changed
+
+        # Polling: hanya stat lewat scandir, tanpa membuka file; file yang masih ditulis
+        # terus berubah ukuran/mtime sehingga micro-batch menunggu sampai selesai.
+        time.sleep(max(0.0, min(timeout, self._last_poll + self.poll_interval - time.monotonic())))
+        if time.monotonic() - self._last_poll < self.poll_interval:
+            return set()
+        self._last_poll = time.monotonic()
+        snapshot = self._scan()
+        changed = {path for path, stat in snapshot.items() if self._snapshot.get(path) != stat}
+        self._snapshot = snapshot
+        return changed
+
+    def wait(self, timeout: float = 1.0) -> Set[str]:
+        """Wait up to `timeout` for a change, then collect the rest of the burst as one micro-batch"""
+        changed = self._poll(timeout)
+        if not changed:
+            return changed
+        deadline = time.monotonic() + self.max_batch
+        while time.monotonic() < deadline:
+            more = self._poll(max(self.settle, self.poll_interval if self._fd is None else 0))
+            if not more:
+                break
+            changed |= more
+        return {path for path in changed if os.path.isfile(path)}
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
 class TranscriptETL:
     """Main ETL class for processing academic transcripts"""
 
-    def __init__(self, db_config: Dict):
+    def __init__(self, db_config: Dict, backend: Optional[WarehouseBackend] = None, shard: Optional[Tuple[int, int]] = None):
         self.db_config = db_config
+        self.backend = backend or MySQLBackend(db_config)
+        # (index, count): hanya PDF yang nama filenya ter-hash ke shard ini yang diproses.
+        self.shard = shard
         self.connection = None
+        self.dim_cache = DimensionCache()
+        self.pipeline_monitor: Optional[PipelineMonitor] = None
+        self.touched_analisis: Set[Tuple[int, int]] = set()
+        self.touched_insights = InsightChanges()
+        # Efek transaksi load yang sedang berjalan; baru dicatat setelah commit, sehingga batch yang
+        # diulang setelah deadlock tidak menghitung Insight_* dan writes_avoided dua kali.
+        self.pending_insights = InsightChanges()
+        self.pending_avoided: Dict[str, int] = defaultdict(int)
+        # Mahasiswa dan mata kuliah yang berubah sejak snapshot analitik terakhir ditulis.
+        self.snapshot: Optional[AnalyticsSnapshot] = None
+        self.snapshot_students: Set[int] = set()
+        self.snapshot_courses: Set[int] = set()
+        self.metrics = RunMetrics()
+        self.last_load_error: Optional[str] = None
+        self.last_load_transient = False
+        self.run_id: Optional[int] = None
+        # Grup yang disentuh run yang terputus tidak diketahui, jadi agregasi berikutnya harus penuh.
+        self.analisis_stale = False
+        self.snapshot_stale = False
 
     def connect_db(self) -> bool:
         """Establish database connection"""
         try:
-            self.connection = mysql.connector.connect(**self.db_config)
-            logger.info("Database connection established successfully")
+            self.connection = self.backend.connect()
+            logger.info(f"Database connection established successfully ({self.backend.name})")
             return True
-        except mysql.connector.Error as err:
+        except DB_ERRORS as err:
             logger.error(f"Database connection failed: {err}")
             return False
 
+    def _cursor(self, **kwargs) -> InstrumentedCursor:
+        """Open a cursor whose statements are recorded in the run metrics"""
+        return InstrumentedCursor(self.connection.cursor(**kwargs), self.metrics)
+
     ### ONE-TIME HISTORICAL LOAD ###
     # Fungsi ini mempersiapkan struktur database. Tujuannya adalah untuk setup awal.
     def create_warehouse_schema(self):
@@ -52,10 +1402,9 @@ class TranscriptETL:
             logger.error("No database connection available")
             return False
             
-        cursor = self.connection.cursor()
+        cursor = self._cursor()
         
-        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.db_config['database']}")
-        cursor.execute(f"USE {self.db_config['database']}")
+        self.backend.prepare_database(cursor)
         
         try:
             # Perintah `CREATE TABLE IF NOT EXISTS` memastikan skema hanya dibuat jika belum ada.
@@ -152,17 +1501,80 @@ class TranscriptETL:
                     FOREIGN KEY (id_mk) REFERENCES Dim_MataKuliah(id_mk),
                     FOREIGN KEY (id_waktu) REFERENCES Dim_Waktu(id_waktu),
                     UNIQUE KEY unique_analisis_mk (id_mk, id_waktu)
+                )""",
+
+                # Manifest file yang sudah dimuat, agar run berikutnya bisa melewati PDF yang tidak berubah.
+                """CREATE TABLE IF NOT EXISTS Etl_Manifest (
+                    file_path VARCHAR(500) PRIMARY KEY,
+                    file_size BIGINT NOT NULL,
+                    file_mtime_ns BIGINT NOT NULL,
+                    content_hash CHAR(64) NOT NULL,
+                    NRP VARCHAR(20),
+                    loaded_at DATETIME NOT NULL
+                )""",
+
+                # Tabel ringkasan (materialized) untuk query insight.sql, diperbarui oleh refresh_insights.
+                # Skala rata-rata sama dengan hasil AVG MySQL (skala kolom + 4), jadi query membaca nilai yang sama persis.
+                """CREATE TABLE IF NOT EXISTS Insight_MataKuliah (
+                    id_mk INT PRIMARY KEY,
+                    jumlah_pengambil_mk INT NOT NULL,
+                    rata_rata_bobot_nilai DECIMAL(8,6),
+                    FOREIGN KEY (id_mk) REFERENCES Dim_MataKuliah(id_mk)
+                )""",
+                """CREATE TABLE IF NOT EXISTS Insight_SebaranNilai (
+                    id_mk INT NOT NULL,
+                    id_nilai INT NOT NULL,
+                    jumlah_mahasiswa INT NOT NULL,
+                    PRIMARY KEY (id_mk, id_nilai),
+                    FOREIGN KEY (id_mk) REFERENCES Dim_MataKuliah(id_mk),
+                    FOREIGN KEY (id_nilai) REFERENCES Dim_Nilai(id_nilai)
+                )""",
+                """CREATE TABLE IF NOT EXISTS Insight_Semester (
+                    id_waktu INT PRIMARY KEY,
+                    jumlah_mahasiswa INT NOT NULL,
+                    rata_rata_ips DECIMAL(8,6),
+                    rata_rata_ipk_kumulatif DECIMAL(8,6),
+                    rata_rata_sks_diambil_aktif DECIMAL(8,4),
+                    FOREIGN KEY (id_waktu) REFERENCES Dim_Waktu(id_waktu)
+                )""",
+                """CREATE TABLE IF NOT EXISTS Insight_Status (
+                    status_mahasiswa VARCHAR(50),
+                    jumlah_mahasiswa INT NOT NULL,
+                    jumlah_ipk INT NOT NULL,
+                    total_ipk_kumulatif DECIMAL(12,2),
+                    UNIQUE KEY unique_insight_status (status_mahasiswa)
+                )""",
+                """CREATE TABLE IF NOT EXISTS Insight_Angkatan (
+                    tahun_angkatan CHAR(2) PRIMARY KEY,
+                    jumlah_mahasiswa INT NOT NULL
+                )""",
+
+                # Riwayat run process_folder; run yang terputus (status 'running') dilanjutkan dengan --resume.
+                """CREATE TABLE IF NOT EXISTS Etl_Run (
+                    run_id INT AUTO_INCREMENT PRIMARY KEY,
+                    folder_path VARCHAR(500) NOT NULL,
+                    force_reload BOOLEAN NOT NULL,
+                    status VARCHAR(16) NOT NULL,
+                    started_at DATETIME NOT NULL,
+                    finished_at DATETIME,
+                    processed INT DEFAULT 0,
+                    failed INT DEFAULT 0,
+                    skipped INT DEFAULT 0
                 )"""
             ]
             
             for sql in table_sql:
-                cursor.execute(sql)
+                cursor.execute(self.backend.table_ddl(sql))
+
+            # Index sekunder ditambahkan terpisah agar gudang data lama ikut mendapatkannya.
+            for table, index_name, columns in SECONDARY_INDEXES:
+                self.backend.ensure_index(cursor, table, index_name, columns)
             
             self.connection.commit()
             
             self._insert_reference_data()
             
-        except mysql.connector.Error as err:
+        except DB_ERRORS as err:
             logger.error(f"Error creating schema: {err}")
             self.connection.rollback()
             return False
@@ -175,7 +1587,7 @@ class TranscriptETL:
     # Mengisi tabel `Dim_Nilai` dengan data referensi yang statis.
     def _insert_reference_data(self):
         """Insert reference data for grades"""
-        cursor = self.connection.cursor()
+        cursor = self._cursor()
         
         try:
             grades = [('A', 4.0), ('AB', 3.5), ('B', 3.0), ('BC', 2.5), ('C', 2.0), ('D', 1.0), ('E', 0.0)]
@@ -186,41 +1598,36 @@ class TranscriptETL:
             
             self.connection.commit()
             
-        except mysql.connector.Error as err:
+        except DB_ERRORS as err:
             logger.error(f"Error inserting reference data: {err}")
             self.connection.rollback()
         finally:
             cursor.close()
     
-    def extract_pdf_text(self, pdf_path: str) -> str:
-        # Extraxtion logic (no changes)
+    def extract_pdf_text(self, pdf_path: str, source: Optional[Dict] = None) -> str:
+        # Extraxtion logic; engine selection and the page cache live in PageTextExtractor, text cleanup in TextNormalizer
         try:
             with open(pdf_path, 'rb') as file:
-                reader = PdfReader(file)
-                full_text = ""
-                for page in reader.pages:
-                    page_text = page.extract_text() or ""
-                    cleaned_text = re.sub(r'([a-zA-Z])\s([a-z])', r'\1\2', page_text)
-                    conjunctions = ['dan', 'atau', 'serta', 'untuk', 'ke', 'dari', 'pada']
-                    for word in conjunctions:
-                        pattern = re.compile(f'([a-z])({word}\\b)', re.IGNORECASE)
-                        cleaned_text = pattern.sub(r'\1 \2', cleaned_text)
-                    cleaned_text = re.sub(r"([a-z])([A-Z])", r"\1 \2", cleaned_text)
-                    cleaned_text = re.sub(r'\s+', ' ', cleaned_text).strip()
-                    full_text += cleaned_text + "\n"
-                return full_text
+                st = os.fstat(file.fileno())
+                data = file.read()
+            # Hash manifest dipakai ulang sebagai kunci cache selama file belum berubah sejak di-hash.
+            content_hash = None
+            if source and (st.st_size, st.st_mtime_ns) == (source['file_size'], source['file_mtime_ns']):
+                content_hash = source['content_hash']
+            text, cached, extracted = TEXT_EXTRACTOR.extract(data, content_hash)
+            self.metrics.count_pages(cached, extracted)
+            return text
         except Exception as e:
             logger.error(f"Error reading PDF {pdf_path}: {e}")
             return ""
     
     def parse_transcript(self, text: str) -> Optional[Dict]:
-        # Parsing logic (no changes)
+        # Parsing logic: one scan over the text yields both the header and the courses
         try:
             data = {'student': {}, 'courses': []}
-            student_info = self._parse_student_info(text)
+            student_info, courses = TRANSCRIPT_SCANNER.scan(text)
             if not student_info: return None
             data['student'] = student_info
-            courses = self._parse_courses(text)
             if not courses: return None
             data['courses'] = courses
             return data
@@ -229,171 +1636,340 @@ class TranscriptETL:
             return None
     
     def _parse_student_info(self, text: str) -> Optional[Dict]:
-        # Parsing logic (no changes)
-        try:
-            nrp_nama_match = re.search(r'NRP\s*/\s*Nama\s*(\d+)\s*/\s*(.*?)\s*SKS Tempuh', text, re.DOTALL)
-            sks_match = re.search(r'SKS\s*Tempuh\s*/\s*SKS\s*Lulus\s*(\d+)\s*/\s*(\d+)', text)
-            status_match = re.search(r'Status\s*(.*?)(?=\s*Tahap|---)', text, re.DOTALL)
-            ipk_match = re.search(r'IPK\s*([\d.]+)', text)
-            ip_persiapan_match = re.search(r'IP Tahap Persiapan\s*:\s*([\d.]+)', text, re.IGNORECASE)
-            sks_persiapan_match = re.search(r'Total Sks Tahap Persiapan\s*:\s*(\d+)', text, re.IGNORECASE)
-            ip_sarjana_match = re.search(r'IP Tahap Sarjana\s*:\s*([\d.]+)', text, re.IGNORECASE)
-            sks_sarjana_match = re.search(r'Total Sks Tahap Sarjana\s*:\s*(\d+)', text, re.IGNORECASE)
-            if not all([nrp_nama_match, sks_match, status_match, ipk_match]): return None
-            nama = re.sub(r'\s+', ' ', nrp_nama_match.group(2)).strip()
-            status = re.sub(r'\s+', ' ', status_match.group(1)).strip()
-            return {'nrp': nrp_nama_match.group(1).strip(), 'nama_mahasiswa': nama, 'status_mahasiswa': status, 'sks_tempuh': int(sks_match.group(1)), 'sks_lulus': int(sks_match.group(2)), 'ipk': float(ipk_match.group(1)), 'ip_persiapan': float(ip_persiapan_match.group(1)) if ip_persiapan_match else 0.0, 'sks_persiapan': int(sks_persiapan_match.group(1)) if sks_persiapan_match else 0, 'ip_sarjana': float(ip_sarjana_match.group(1)) if ip_sarjana_match else 0.0, 'sks_sarjana': int(sks_sarjana_match.group(1)) if sks_sarjana_match else 0}
+        try:
+            return TRANSCRIPT_SCANNER.scan(text)[0]
         except Exception as e:
             logger.error(f"Error parsing student info: {e}")
             return None
     
     def _parse_courses(self, text: str) -> List[Dict]:
-        # Parsing logic (no changes)
-        try:
-            courses = []
-            course_pattern = r'([A-Z]{2}\d{5,6})\s*(.*?)\s*(\d)\s*(\d{4}/(?:Gs|Gn)/[A-Z]{1,2})\s*([A-Z]{1,2})'
-            matches = re.finditer(course_pattern, text, re.DOTALL)
-            sarjana_start_match = re.search(r'Tahap:\s*Sarjana', text)
-            sarjana_start_pos = sarjana_start_match.start() if sarjana_start_match else -1
-            for match in matches:
-                course_name = re.sub(r'\s+', ' ', match.group(2)).strip()
-                sks = int(match.group(3))
-                hist_info = match.group(4)
-                grade = match.group(5)
-                year_sem_match = re.search(r'(\d{4})/(Gs|Gn)', hist_info)
-                if not year_sem_match: continue
-                year, sem_code = year_sem_match.groups()
-                phase = 'Sarjana' if sarjana_start_pos != -1 and match.start() > sarjana_start_pos else 'Persiapan'
-                semester = 'Gasal' if sem_code == 'Gs' else 'Genap'
-                courses.append({'kode_mk': match.group(1).strip(), 'nama_mk': course_name, 'sks_mk': sks, 'tahun': int(year), 'semester': semester, 'huruf_nilai': grade.strip(), 'tahap_mk': phase})
-            return courses
+        try:
+            return TRANSCRIPT_SCANNER.scan(text)[1]
         except Exception as e:
             logger.error(f"Error parsing courses: {e}")
             return []
     
     def load_to_warehouse(self, data: Dict) -> bool:
         """Load parsed data into the new data warehouse schema"""
+        return self.load_batch([data])
+
+    def load_batch(self, batch: List[Dict], refreshed: Optional[List[Dict]] = None) -> bool:
+        """Load a batch of parsed transcripts with set-based statements in a single transaction.
+
+        `refreshed` holds manifest rows of unchanged files that only need their path/mtime updated.
+        A transaction aborted by a deadlock or lock wait timeout is retried with bounded backoff.
+        """
+        for attempt in range(LOAD_RETRY_ATTEMPTS):
+            if self._load_batch_once(batch, refreshed):
+                return True
+            if not self.last_load_transient or attempt == LOAD_RETRY_ATTEMPTS - 1:
+                return False
+            base, cap = LOAD_RETRY_BACKOFF
+            delay = min(cap, base * 2 ** attempt) * random.uniform(0.5, 1.0)
+            logger.warning(f"Load transaction aborted ({self.last_load_error}), retry {attempt + 1}/{LOAD_RETRY_ATTEMPTS - 1} in {delay:.2f}s")
+            self.metrics.retry(self.last_load_error)
+            time.sleep(delay)
+        return False
+
+    def _load_batch_once(self, batch: List[Dict], refreshed: Optional[List[Dict]] = None) -> bool:
+        """One attempt of load_batch; sets last_load_error (and last_load_transient) on failure"""
+        self.last_load_error = None
+        self.last_load_transient = False
         if not self.connection:
             logger.error("No database connection available")
+            self.last_load_error = "no_connection"
             return False
         
-        cursor = self.connection.cursor(dictionary=True)
+        cursor = self._cursor(dictionary=True)
+        started = time.perf_counter()
         
         try:
-            id_mahasiswa = self._load_mahasiswa(cursor, data['student'])
-            if not id_mahasiswa:
+            if not self.dim_cache.loaded:
+                self.dim_cache.preload(cursor)
+
+            # Jika NRP yang sama muncul lebih dari sekali, transkrip terakhir yang dipakai
+            # (sama seperti memuat file satu per satu secara berurutan).
+            latest = {data['student']['nrp']: data for data in batch}
+            student_keys = self._load_mahasiswa(cursor, [data['student'] for data in latest.values()])
+            if student_keys is None:
+                self.last_load_error = "mahasiswa_upsert"
+                self._rollback_load()
                 return False
-            
-            for course in data['courses']:
-                self._load_course_fact(cursor, id_mahasiswa, course)
-            
-            self._update_prestasi_semester(cursor, id_mahasiswa, data['courses'])
 
-            self.connection.commit()
+            # Kontribusi lama mahasiswa (transkrip & kelulusan) diganti, bukan ditambahkan lagi.
+            kelulusan_counts = self._retract_mahasiswa_facts(cursor, list(student_keys.values()))
+            self._create_dimension_rows(cursor, latest.values())
+            transkrip_rows, prestasi_input = [], []
+            for data in latest.values():
+                id_mahasiswa = student_keys[data['student']['nrp']]
+                for course in data['courses']:
+                    fact = self._load_course_fact(cursor, id_mahasiswa, course)
+                    if not fact: continue
+                    transkrip_rows.append(fact)
+                    # Hitungan kelulusan diagregasi dulu per (id_mk, id_waktu) di Python.
+                    lulus = course['huruf_nilai'] not in ['D', 'E']
+                    kelulusan_counts[(fact[1], fact[2])][0 if lulus else 1] += 1
+                prestasi_input.append((id_mahasiswa, data['courses']))
+
+            self._write_course_facts(cursor, transkrip_rows)
+            self._update_prestasi_semester(cursor, prestasi_input)
+            self._record_manifest(cursor, [dict(data['source'], nrp=data['student']['nrp']) for data in batch if data.get('source')] + (refreshed or []))
+            # Counter Fact_Kelulusan dipakai bersama oleh semua writer: ditulis paling akhir agar
+            # kunci barisnya ditahan sesingkat mungkin sebelum commit.
+            self._apply_kelulusan_counts(cursor, kelulusan_counts)
+
+            self._commit_load()
+            # Grup (id_mk, id_waktu) yang berubah dicatat untuk agregasi inkremental.
+            self.touched_analisis.update(kelulusan_counts.keys())
+            self.touched_insights.courses.update(id_mk for id_mk, _ in kelulusan_counts)
+            self.snapshot_students.update(student_keys.values())
+            self.snapshot_courses.update(id_mk for id_mk, _ in kelulusan_counts)
+            self.metrics.observe_transcripts(len(latest), cursor.round_trips)
             return True
-        except mysql.connector.Error as err:
+        except Exception as err:
             logger.error(f"Database error during load: {err}")
-            self.connection.rollback()
+            self.last_load_error = f"mysql_{err.errno}" if isinstance(err, mysql.connector.Error) and err.errno else type(err).__name__
+            self.last_load_transient = self.backend.is_transient(err)
+            self._rollback_load()
             return False
         finally:
             cursor.close()
+            self.metrics.observe_stage('load', time.perf_counter() - started)
+
+    def _commit_load(self):
+        """Commit the load transaction, then record the insight keys and avoided writes it produced"""
+        self.connection.commit()
+        self.dim_cache.commit()
+        self.touched_insights.update(self.pending_insights)
+        for table, rows in self.pending_avoided.items():
+            self.metrics.avoid_writes(table, rows)
+        self.pending_insights.clear()
+        self.pending_avoided.clear()
+
+    def _rollback_load(self):
+        """Roll the load transaction back together with everything it would have recorded"""
+        self.connection.rollback()
+        self.dim_cache.rollback()
+        self.pending_insights.clear()
+        self.pending_avoided.clear()
+
+    def _executemany(self, cursor, sql: str, rows: List[Tuple]):
+        """Run a multi-row statement in chunks so a large batch stays under max_allowed_packet"""
+        for start in range(0, len(rows), BULK_CHUNK_ROWS):
+            cursor.executemany(sql, rows[start:start + BULK_CHUNK_ROWS])
     
     ### INCREMENTAL LOAD ###
-    # Menerapkan logika "Update or Insert" (UPSERT) untuk data mahasiswa.
-    def _load_mahasiswa(self, cursor, student_data: Dict) -> Optional[int]:
-        """Load or update student data and return student key"""
+    # Menerapkan logika "Update or Insert" (UPSERT) untuk data mahasiswa, hanya untuk baris yang berubah.
+    def _load_mahasiswa(self, cursor, students: List[Dict]) -> Optional[Dict[str, int]]:
+        """Insert new students and update changed ones, returning the keys of the whole batch by NRP"""
+        if not students:
+            return {}
         try:
-            cursor.execute("SELECT id_mahasiswa FROM Dim_Mahasiswa WHERE NRP = %s", (student_data['nrp'],))
-            result = cursor.fetchone()
-            
-            student_columns = (
-                student_data['nama_mahasiswa'], student_data['status_mahasiswa'],
-                student_data['ipk'], student_data['sks_tempuh'], student_data['sks_lulus'],
-                student_data['ip_persiapan'], student_data['sks_persiapan'],
-                student_data['ip_sarjana'], student_data['sks_sarjana']
-            )
+            student_rows = {student_data['nrp']: MAHASISWA_FIELDS(student_data) for student_data in students}
+
+            # Baris yang tersimpan dibaca sekali; mahasiswa yang datanya sama persis tidak ditulis ulang.
+            nrps = list(student_rows)
+            placeholders = ', '.join(['%s'] * len(nrps))
+            cursor.execute(f"SELECT id_mahasiswa, {', '.join(MAHASISWA_COLUMNS)} FROM Dim_Mahasiswa WHERE NRP IN ({placeholders})", nrps)
+            stored = {row['NRP']: row for row in cursor.fetchall()}
+            keys = {nrp: row['id_mahasiswa'] for nrp, row in stored.items()}
+            changed = [row for nrp, row in student_rows.items()
+                       if nrp not in stored or _as_stored(row, MAHASISWA_DECIMALS) != _as_stored([stored[nrp][col] for col in MAHASISWA_COLUMNS], MAHASISWA_DECIMALS)]
+            self.pending_avoided['Dim_Mahasiswa'] += len(student_rows) - len(changed)
+            if not changed:
+                return keys
+
+            # Status lama dan baru, angkatan mahasiswa baru dan semester mahasiswa lama yang berubah perlu di-refresh di Insight_*.
+            for row in changed:
+                self.pending_insights.statuses.add(row[2])
+                if row[0] in stored:
+                    self.pending_insights.statuses.add(stored[row[0]]['status_mahasiswa'])
+                    self.pending_insights.students.add(keys[row[0]])
+                else:
+                    self.pending_insights.angkatan.add(row[0][4:6])
 
             # Jika mahasiswa sudah ada, UPDATE datanya. Jika tidak, INSERT data baru.
-            if result:
-                id_mahasiswa = result['id_mahasiswa']
-                update_sql = """UPDATE Dim_Mahasiswa SET nama_mahasiswa = %s, status_mahasiswa = %s, ipk_kumulatif = %s, sks_tempuh = %s, sks_lulus = %s, ip_persiapan = %s, sks_persiapan = %s, ip_sarjana = %s, sks_sarjana = %s WHERE id_mahasiswa = %s"""
-                cursor.execute(update_sql, student_columns + (id_mahasiswa,))
-            else:
-                insert_sql = """INSERT INTO Dim_Mahasiswa (NRP, nama_mahasiswa, status_mahasiswa, ipk_kumulatif, sks_tempuh, sks_lulus, ip_persiapan, sks_persiapan, ip_sarjana, sks_sarjana) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"""
-                cursor.execute(insert_sql, (student_data['nrp'],) + student_columns)
-                id_mahasiswa = cursor.lastrowid
-            
-            return id_mahasiswa
-        except mysql.connector.Error as err:
+            upsert_sql = self.backend.upsert_sql('Dim_Mahasiswa', MAHASISWA_COLUMNS, ['NRP'])
+            self._executemany(cursor, upsert_sql, changed)
+
+            new_nrps = [row[0] for row in changed if row[0] not in keys]
+            if new_nrps:
+                placeholders = ', '.join(['%s'] * len(new_nrps))
+                cursor.execute(f"SELECT id_mahasiswa, NRP FROM Dim_Mahasiswa WHERE NRP IN ({placeholders})", new_nrps)
+                keys.update((row['NRP'], row['id_mahasiswa']) for row in cursor.fetchall())
+            return keys
+        except DB_ERRORS as err:
+            # Deadlock/lock wait timeout membatalkan transaksi: biarkan load_batch mengulanginya.
+            if self.backend.is_transient(err): raise
             logger.error(f"Error loading student data: {err}")
             return None
     
     ### INCREMENTAL LOAD ###
-    # Memuat fakta transkrip sambil memastikan tidak ada duplikasi dan memperbarui agregat.
-    def _load_course_fact(self, cursor, id_mahasiswa: int, course_data: Dict) -> bool:
-        """Load course, time, grade dimensions and the transcript fact"""
+    # Menarik kembali kontribusi lama mahasiswa sebelum transkrip barunya dimuat ulang.
+    def _retract_mahasiswa_facts(self, cursor, student_ids: List[int]) -> Dict[Tuple[int, int], List[int]]:
+        """Delete existing transcript facts of the students and return negative Fact_Kelulusan deltas"""
+        kelulusan_counts = defaultdict(lambda: [0, 0])
+        if not student_ids:
+            return kelulusan_counts
+
+        placeholders = ', '.join(['%s'] * len(student_ids))
+        cursor.execute(f"""SELECT ft.id_mk, ft.id_waktu, SUM(CASE WHEN dn.huruf_nilai NOT IN ('D', 'E') THEN 1 ELSE 0 END) AS jml_lulus, SUM(CASE WHEN dn.huruf_nilai IN ('D', 'E') THEN 1 ELSE 0 END) AS jml_tidak_lulus FROM Fact_Transkrip ft JOIN Dim_Nilai dn ON ft.id_nilai = dn.id_nilai WHERE ft.id_mahasiswa IN ({placeholders}) GROUP BY ft.id_mk, ft.id_waktu""", student_ids)
+        rows = cursor.fetchall()
+        if not rows:
+            return kelulusan_counts
+
+        for row in rows:
+            kelulusan_counts[(row['id_mk'], row['id_waktu'])][0] -= int(row['jml_lulus'])
+            kelulusan_counts[(row['id_mk'], row['id_waktu'])][1] -= int(row['jml_tidak_lulus'])
+        cursor.execute(f"DELETE FROM Fact_Transkrip WHERE id_mahasiswa IN ({placeholders})", student_ids)
+        return kelulusan_counts
+
+    ### INCREMENTAL LOAD ###
+    # Menyiapkan baris fakta transkrip (kunci dimensi sudah di-resolve) untuk ditulis secara bulk.
+    def _load_course_fact(self, cursor, id_mahasiswa: int, course_data: Dict) -> Optional[Tuple]:
+        """Resolve course, time and grade dimensions and return the transcript fact row"""
         try:
-            id_mk = self._get_or_create_key(cursor, "Dim_MataKuliah", "id_mk", "kode_mk", course_data['kode_mk'], 
-                                             "INSERT INTO Dim_MataKuliah (kode_mk, nama_mk, sks_mk, tahap_mk) VALUES (%s, %s, %s, %s)",
-                                             (course_data['kode_mk'], course_data['nama_mk'], course_data['sks_mk'], course_data['tahap_mk']))
-            
-            id_waktu = self._get_or_create_key(cursor, "Dim_Waktu", "id_waktu", "tahun = %s AND semester = %s", (course_data['tahun'], course_data['semester']),
-                                              "INSERT INTO Dim_Waktu (tahun, semester) VALUES (%s, %s)",
-                                              (course_data['tahun'], course_data['semester']))
-
-            cursor.execute("SELECT id_nilai, bobot_nilai FROM Dim_Nilai WHERE huruf_nilai = %s", (course_data['huruf_nilai'],))
-            nilai_result = cursor.fetchone()
-            if not nilai_result: return False
-            id_nilai, bobot_nilai = nilai_result['id_nilai'], nilai_result['bobot_nilai']
+            id_mk = self._get_matakuliah_key(cursor, course_data)
+            id_waktu = self._get_waktu_key(cursor, course_data['tahun'], course_data['semester'])
+
+            nilai_result = self.dim_cache.get(self.dim_cache.nilai, course_data['huruf_nilai'])
+            if not nilai_result or id_mk is None or id_waktu is None: return None
+            id_nilai, bobot_nilai = nilai_result
             bobot_matkul = course_data['sks_mk'] * bobot_nilai
 
-            # Pengecekan manual untuk mencegah duplikasi di `Fact_Transkrip`.
-            cursor.execute("SELECT id_transkrip FROM Fact_Transkrip WHERE id_mahasiswa = %s AND id_mk = %s AND id_waktu = %s", (id_mahasiswa, id_mk, id_waktu))
-            if not cursor.fetchone():
-                cursor.execute("INSERT INTO Fact_Transkrip (id_mahasiswa, id_mk, id_waktu, id_nilai, bobot_matkul) VALUES (%s, %s, %s, %s, %s)", (id_mahasiswa, id_mk, id_waktu, id_nilai, bobot_matkul))
-            
-            # `ON DUPLICATE KEY UPDATE` untuk agregasi data kelulusan secara inkremental.
-            lulus = course_data['huruf_nilai'] not in ['D', 'E']
-            if lulus:
-                upsert_sql = """INSERT INTO Fact_Kelulusan (id_mk, id_waktu, jml_mahasiswa_lulus, jml_mahasiswa_tidak_lulus) VALUES (%s, %s, 1, 0) ON DUPLICATE KEY UPDATE jml_mahasiswa_lulus = jml_mahasiswa_lulus + 1"""
-            else:
-                upsert_sql = """INSERT INTO Fact_Kelulusan (id_mk, id_waktu, jml_mahasiswa_lulus, jml_mahasiswa_tidak_lulus) VALUES (%s, %s, 0, 1) ON DUPLICATE KEY UPDATE jml_mahasiswa_tidak_lulus = jml_mahasiswa_tidak_lulus + 1"""
-            cursor.execute(upsert_sql, (id_mk, id_waktu))
-            
-            return True
-        except (mysql.connector.Error, TypeError) as err:
+            return (id_mahasiswa, id_mk, id_waktu, id_nilai, bobot_matkul)
+        except (*DB_ERRORS, TypeError) as err:
+            if self.backend.is_transient(err): raise
             logger.error(f"Error loading course fact for '{course_data['kode_mk']}': {err}")
-            return False
+            return None
+
+    ### INCREMENTAL LOAD ###
+    # Menulis fakta transkrip dan kelulusan satu batch sekaligus.
+    def _write_course_facts(self, cursor, transkrip_rows: List[Tuple]):
+        """Bulk insert transcript facts"""
+        # Unique key `unique_transcript` mencegah duplikasi; baris yang sudah ada dibiarkan apa adanya.
+        insert_sql = self.backend.upsert_sql('Fact_Transkrip', ['id_mahasiswa', 'id_mk', 'id_waktu', 'id_nilai', 'bobot_matkul'], ['id_mahasiswa', 'id_mk', 'id_waktu'], update=False)
+        self._executemany(cursor, insert_sql, transkrip_rows)
+
+    def _apply_kelulusan_counts(self, cursor, kelulusan_counts: Dict[Tuple[int, int], List[int]]):
+        """Apply the aggregated Fact_Kelulusan increments, in key order so concurrent writers lock rows in the same order"""
+        # Selisih (0, 0), mis. transkrip sama yang dimuat ulang dengan --force, tidak menyentuh (dan mengunci) baris counter.
+        deltas = [(id_mk, id_waktu, lulus, tidak_lulus) for (id_mk, id_waktu), (lulus, tidak_lulus) in sorted(kelulusan_counts.items()) if lulus or tidak_lulus]
+        # Upsert yang menambahkan selisih, untuk agregasi data kelulusan secara inkremental.
+        upsert_sql = self.backend.upsert_sql('Fact_Kelulusan', ['id_mk', 'id_waktu', 'jml_mahasiswa_lulus', 'jml_mahasiswa_tidak_lulus'], ['id_mk', 'id_waktu'], increment=['jml_mahasiswa_lulus', 'jml_mahasiswa_tidak_lulus'])
+        self._executemany(cursor, upsert_sql, deltas)
+
+        # Counter yang turun ke 0/0 (semua pengambilnya ditarik kembali) dihapus, bukan ditinggalkan sebagai baris kosong.
+        emptied = [(id_mk, id_waktu) for id_mk, id_waktu, lulus, tidak_lulus in deltas if lulus < 0 or tidak_lulus < 0]
+        for start in range(0, len(emptied), BULK_CHUNK_ROWS):
+            chunk = emptied[start:start + BULK_CHUNK_ROWS]
+            cursor.execute(f"DELETE FROM Fact_Kelulusan WHERE {self.backend.row_in('id_mk, id_waktu', len(chunk))} AND jml_mahasiswa_lulus = 0 AND jml_mahasiswa_tidak_lulus = 0",
+                           [value for key in chunk for value in key])
 
     ### INCREMENTAL LOAD ###
     # Menghitung dan memperbarui snapshot prestasi mahasiswa per semester.
-    def _update_prestasi_semester(self, cursor, id_mahasiswa: int, all_courses: List[Dict]):
-        """Calculate and load/update periodic snapshot data for each semester."""
-        cursor.execute("SELECT huruf_nilai, bobot_nilai FROM Dim_Nilai")
-        grade_weights = {row['huruf_nilai']: row['bobot_nilai'] for row in cursor.fetchall()}
-        
-        courses_by_semester = defaultdict(list)
-        for course in all_courses:
-            courses_by_semester[(course['tahun'], course['semester'])].append(course)
-
-        total_sks_kumulatif, total_poin_kumulatif, ips_sebelumnya = 0, 0, 0.0
-
-        for (tahun, semester), courses_in_sem in sorted(courses_by_semester.items()):
-            sks_diambil_semester = sum(c['sks_mk'] for c in courses_in_sem)
-            poin_semester = sum(c['sks_mk'] * grade_weights.get(c['huruf_nilai'], 0) for c in courses_in_sem)
-            ips = (poin_semester / sks_diambil_semester) if sks_diambil_semester > 0 else 0.0
-            total_sks_kumulatif += sks_diambil_semester
-            total_poin_kumulatif += poin_semester
-            ipk_saat_itu = (total_poin_kumulatif / total_sks_kumulatif) if total_sks_kumulatif > 0 else 0.0
-            id_waktu = self._get_or_create_key(cursor, "Dim_Waktu", "id_waktu", "tahun = %s AND semester = %s", (tahun, semester), "INSERT INTO Dim_Waktu (tahun, semester) VALUES (%s, %s)", (tahun, semester))
-            
-            # UPSERT: Memasukkan data prestasi semester baru atau memperbarui yang sudah ada.
-            upsert_sql = """INSERT INTO Fact_Prestasi_Semester (id_mahasiswa, id_waktu, ips, sks_diambil_semester, sks_lulus_semester, jumlah_mk_semester, ipk_saat_itu, perubahan_ips) VALUES (%s, %s, %s, %s, %s, %s, %s, %s) ON DUPLICATE KEY UPDATE ips = VALUES(ips), sks_diambil_semester = VALUES(sks_diambil_semester), sks_lulus_semester = VALUES(sks_lulus_semester), jumlah_mk_semester = VALUES(jumlah_mk_semester), ipk_saat_itu = VALUES(ipk_saat_itu), perubahan_ips = VALUES(perubahan_ips)"""
-            sks_lulus_semester = sum(c['sks_mk'] for c in courses_in_sem if c['huruf_nilai'] not in ['D', 'E'])
-            perubahan_ips = ips - ips_sebelumnya if ips_sebelumnya > 0 else 0.0
-            cursor.execute(upsert_sql, (id_mahasiswa, id_waktu, ips, sks_diambil_semester, sks_lulus_semester, len(courses_in_sem), ipk_saat_itu, perubahan_ips))
-            
-            ips_sebelumnya = ips
+    def _update_prestasi_semester(self, cursor, students: List[Tuple[int, List[Dict]]]):
+        """Calculate and load/update periodic snapshot data for each semester of each student.
+
+        Only semesters that are new or whose values changed are written; semesters that
+        disappeared from a reloaded transcript are deleted.
+        """
+        self._write_prestasi_rows(cursor, [id_mahasiswa for id_mahasiswa, _ in students], self._prestasi_semester_rows(cursor, students))
+
+    def _write_prestasi_rows(self, cursor, student_ids: List[int], prestasi_rows: List[Tuple]):
+        """Make the students' Fact_Prestasi_Semester rows equal `prestasi_rows`, writing only the differences"""
+        stored = self._stored_prestasi(cursor, student_ids)
+        changed = [row for row in prestasi_rows if stored.pop((row[0], row[1]), None) != _as_stored(row, PRESTASI_DECIMALS)]
+        self.pending_avoided['Fact_Prestasi_Semester'] += len(prestasi_rows) - len(changed)
+        self.pending_insights.semesters.update(row[1] for row in changed)
+        self.pending_insights.semesters.update(id_waktu for _, id_waktu in stored)
+
+        # UPSERT: Memasukkan data prestasi semester baru atau memperbarui yang sudah ada.
+        upsert_sql = self.backend.upsert_sql('Fact_Prestasi_Semester', PRESTASI_COLUMNS, ['id_mahasiswa', 'id_waktu'])
+        self._executemany(cursor, upsert_sql, changed)
+
+        # Yang tersisa di `stored` adalah semester yang tidak lagi ada di transkrip.
+        stale = sorted(stored)
+        for start in range(0, len(stale), BULK_CHUNK_ROWS):
+            chunk = stale[start:start + BULK_CHUNK_ROWS]
+            cursor.execute(f"DELETE FROM Fact_Prestasi_Semester WHERE {self.backend.row_in('id_mahasiswa, id_waktu', len(chunk))}", [value for key in chunk for value in key])
+
+    def _stored_prestasi(self, cursor, student_ids: List[int]) -> Dict[Tuple[int, int], Tuple]:
+        """Current Fact_Prestasi_Semester rows of the students keyed by (id_mahasiswa, id_waktu), in stored form"""
+        stored = {}
+        for start in range(0, len(student_ids), BULK_CHUNK_ROWS):
+            chunk = student_ids[start:start + BULK_CHUNK_ROWS]
+            cursor.execute(f"SELECT {', '.join(PRESTASI_COLUMNS)} FROM Fact_Prestasi_Semester WHERE id_mahasiswa IN ({', '.join(['%s'] * len(chunk))})", chunk)
+            for row in cursor.fetchall():
+                values = _as_stored([row[col] for col in PRESTASI_COLUMNS], PRESTASI_DECIMALS)
+                stored[(values[0], values[1])] = values
+        return stored
+
+    def _prestasi_semester_rows(self, cursor, students: List[Tuple[int, List[Dict]]]) -> List[Tuple]:
+        """Fact_Prestasi_Semester rows for a batch of students, computed with grouped array operations.
+
+        All courses of the batch go into flat arrays sorted by (student, period); semesters are summed
+        with `np.add.reduceat` and the running IPK uses cumulative sums that restart at each student.
+
+        Points are kept as integers in hundredths of a grade point (bobot_nilai is DECIMAL(3,2)), so
+        ips, ipk_saat_itu and perubahan_ips are exact ratios rounded the way MySQL stores DECIMAL(3,2)/(4,2).
+        """
+        counts = [len(all_courses) for _, all_courses in students]
+        if not sum(counts):
+            return []
+        tahun, semester, sks_mk, huruf = zip(*chain.from_iterable(map(COURSE_FIELDS, all_courses) for _, all_courses in students))
+
+        # Huruf nilai dan semester di-factorize menjadi kode integer; sisa perhitungan murni numerik.
+        huruf_codes, huruf_values = pd.factorize(pd.Series(huruf, dtype=object))
+        bobot = np.array([int(round(float(self.dim_cache.nilai[h][1]) * 100)) if h in self.dim_cache.nilai else 0 for h in huruf_values], dtype=np.int64)
+        lulus = np.array([h not in ['D', 'E'] for h in huruf_values], dtype=np.int64)
+        semester_codes, semester_values = pd.factorize(pd.Series(semester, dtype=object))
+        period_codes, period_values = pd.factorize(np.array(tahun, dtype=np.int64) * len(semester_values) + semester_codes)
+        # Kode periode diurutkan ulang mengikuti (tahun, semester), sama seperti urutan semester per mahasiswa.
+        periods = [(int(value) // len(semester_values), semester_values[value % len(semester_values)]) for value in period_values]
+        ordered = sorted(range(len(periods)), key=periods.__getitem__)
+        rank = np.empty(len(periods), dtype=np.int64)
+        rank[ordered] = np.arange(len(periods))
+
+        # Urutkan per (mahasiswa, periode); setiap run kunci yang sama adalah satu semester.
+        student_ids = np.repeat(np.array([id_mahasiswa for id_mahasiswa, _ in students], dtype=np.int64), counts)
+        period = rank[period_codes]
+        order = np.lexsort((period, student_ids))
+        student_ids, period = student_ids[order], period[order]
+        sks_course = np.array(sks_mk, dtype=np.int64)[order]
+        huruf_codes = huruf_codes[order]
+        starts = np.flatnonzero(np.r_[True, (student_ids[1:] != student_ids[:-1]) | (period[1:] != period[:-1])])
+        sks = np.add.reduceat(sks_course, starts)
+        poin = np.add.reduceat(sks_course * bobot[huruf_codes], starts)
+        sks_lulus = np.add.reduceat(sks_course * lulus[huruf_codes], starts)
+        jumlah_mk = np.diff(np.r_[starts, len(order)])
+        sem_student, sem_period = student_ids[starts], period[starts]
+
+        # Kumulatif dan semester sebelumnya dihitung per mahasiswa (reset di baris pertama tiap mahasiswa).
+        first = np.r_[True, sem_student[1:] != sem_student[:-1]]
+        first_index = np.maximum.accumulate(np.where(first, np.arange(len(starts)), 0))
+        cum_sks = np.cumsum(sks) - np.r_[0, np.cumsum(sks)[:-1]][first_index]
+        cum_poin = np.cumsum(poin) - np.r_[0, np.cumsum(poin)[:-1]][first_index]
+        # Semester tanpa SKS punya IPS 0 (pecahan 0/1), sama seperti perhitungan per mahasiswa.
+        ips_num, ips_den = np.where(sks > 0, poin, 0), np.where(sks > 0, sks, 1)
+        prev_num, prev_den = np.where(first, 0, np.r_[0, ips_num[:-1]]), np.where(first, 1, np.r_[1, ips_den[:-1]])
+
+        ips = _round_hundredths(ips_num, ips_den)
+        ipk = np.where(cum_sks > 0, _round_hundredths(cum_poin, np.where(cum_sks > 0, cum_sks, 1)), 0)
+        # perubahan_ips hanya dihitung bila IPS semester sebelumnya > 0.
+        delta_num, delta_den = ips_num * prev_den - prev_num * ips_den, ips_den * prev_den
+        perubahan = np.where(prev_num > 0, _round_hundredths(delta_num, delta_den), 0)
+
+        decimals = {value: Decimal(value).scaleb(-2) for value in np.unique(np.concatenate([ips, ipk, perubahan])).tolist()}
+        perubahan_ips = [decimals[value] for value in perubahan.tolist()]
+        # Selisih yang tepat di tengah dua nilai mengikuti selisih IPS desimal 28 digit seperti perhitungan lama.
+        for i in np.flatnonzero((prev_num > 0) & ((2 * np.abs(delta_num)) % (2 * delta_den) == delta_den)).tolist():
+            perubahan_ips[i] = (Decimal(int(ips_num[i])).scaleb(-2) / int(ips_den[i]) - Decimal(int(prev_num[i])).scaleb(-2) / int(prev_den[i])).quantize(Decimal('0.01'), ROUND_HALF_UP)
+
+        waktu_keys = [self._get_waktu_key(cursor, *periods[code]) for code in ordered]
+        return list(zip(sem_student.tolist(), [waktu_keys[periode] for periode in sem_period.tolist()],
+                        [decimals[value] for value in ips.tolist()], sks.tolist(), sks_lulus.tolist(), jumlah_mk.tolist(),
+                        [decimals[value] for value in ipk.tolist()], perubahan_ips))
 
     ### INCREMENTAL LOAD ###
     # Fungsi pembantu untuk mencari ID dari sebuah entitas di tabel dimensi.
@@ -408,67 +1984,916 @@ class TranscriptETL:
             if result:
                 return result[key_col]
             else:
-                cursor.execute(insert_sql, insert_val)
+                cursor.execute(self.backend.insert_key_sql(insert_sql, key_col), insert_val)
                 return cursor.lastrowid
-        except mysql.connector.Error as err:
+        except DB_ERRORS as err:
+            if self.backend.is_transient(err): raise
             logger.error(f"Error with dimension {table}: {err}")
             return None
 
-    def process_folder(self, folder_path: str) -> Dict[str, int]:
-        """Process all PDF files in a folder"""
+    def _create_dimension_rows(self, cursor, transcripts: Iterable[Dict]):
+        """Resolve the batch's uncached courses and periods up front, in sorted key order.
+
+        Writers loading at the same time then take the unique-key locks of new dimension
+        rows in the same order, so two writers adding the same course wait instead of deadlocking.
+        """
+        courses, periods = {}, set()
+        for data in transcripts:
+            for course in data['courses']:
+                if course['kode_mk'] not in self.dim_cache.matakuliah:
+                    courses.setdefault(course['kode_mk'], course)
+                if (course['tahun'], course['semester']) not in self.dim_cache.waktu:
+                    periods.add((course['tahun'], course['semester']))
+        for kode_mk in sorted(courses):
+            self._get_matakuliah_key(cursor, courses[kode_mk])
+        for tahun, semester in sorted(periods):
+            self._get_waktu_key(cursor, tahun, semester)
+
+    def _get_matakuliah_key(self, cursor, course_data: Dict) -> Optional[int]:
+        """Resolve id_mk through the dimension cache, creating the course if needed"""
+        id_mk = self.dim_cache.get(self.dim_cache.matakuliah, course_data['kode_mk'])
+        if id_mk is None:
+            id_mk = self._get_or_create_key(cursor, "Dim_MataKuliah", "id_mk", "kode_mk", course_data['kode_mk'],
+                                            "INSERT INTO Dim_MataKuliah (kode_mk, nama_mk, sks_mk, tahap_mk) VALUES (%s, %s, %s, %s)",
+                                            (course_data['kode_mk'], course_data['nama_mk'], course_data['sks_mk'], course_data['tahap_mk']))
+            if id_mk is not None:
+                self.dim_cache.add(self.dim_cache.matakuliah, course_data['kode_mk'], id_mk)
+        return id_mk
+
+    def _get_waktu_key(self, cursor, tahun: int, semester: str) -> Optional[int]:
+        """Resolve id_waktu through the dimension cache, creating the period if needed"""
+        id_waktu = self.dim_cache.get(self.dim_cache.waktu, (tahun, semester))
+        if id_waktu is None:
+            id_waktu = self._get_or_create_key(cursor, "Dim_Waktu", "id_waktu", "tahun = %s AND semester = %s", (tahun, semester),
+                                               "INSERT INTO Dim_Waktu (tahun, semester) VALUES (%s, %s)", (tahun, semester))
+            if id_waktu is not None:
+                self.dim_cache.add(self.dim_cache.waktu, (tahun, semester), id_waktu)
+        return id_waktu
+
+    ### INCREMENTAL LOAD ###
+    # Manifest berbasis hash konten: file yang tidak berubah dilewati sebelum PDF dibuka.
+    def _load_manifest(self, after=None, paths: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """Read the ingest manifest keyed by absolute file path (only rows loaded after `after`, or of `paths`, if given)"""
+        if not self.connection:
+            return {}
+        cursor = self._cursor(dictionary=True)
+        query = "SELECT file_path, file_size, file_mtime_ns, content_hash FROM Etl_Manifest"
+        try:
+            if paths is not None:
+                # Micro-batch mode watch: cukup baris manifest file yang berubah, bukan seluruh tabel.
+                file_paths = [os.path.abspath(path) for path in paths]
+                manifest = {}
+                for start in range(0, len(file_paths), BULK_CHUNK_ROWS):
+                    chunk = file_paths[start:start + BULK_CHUNK_ROWS]
+                    cursor.execute(f"{query} WHERE file_path IN ({', '.join(['%s'] * len(chunk))})", chunk)
+                    manifest.update((row['file_path'], row) for row in cursor.fetchall())
+                return manifest
+            if after is None:
+                cursor.execute(query)
+            else:
+                cursor.execute(f"{query} WHERE loaded_at > %s", (after,))
+            return {row['file_path']: row for row in cursor.fetchall()}
+        except DB_ERRORS as err:
+            logger.error(f"Error reading ingest manifest: {err}")
+            return {}
+        finally:
+            cursor.close()
+
+    def _record_manifest(self, cursor, sources: List[Dict]):
+        """Upsert manifest rows; called inside the load transaction so they commit together with the data"""
+        if not sources:
+            return
+        upsert_sql = self.backend.upsert_sql('Etl_Manifest', ['file_path', 'file_size', 'file_mtime_ns', 'content_hash', 'NRP', 'loaded_at'], ['file_path'])
+        now = datetime.now()
+        self._executemany(cursor, upsert_sql, [(src['file_path'], src['file_size'], src['file_mtime_ns'], src['content_hash'], src.get('nrp'), now) for src in sources])
+
+    ### INCREMENTAL LOAD ###
+    # Checkpoint run: baris manifest di-commit dalam transaksi yang sama dengan datanya, jadi file yang
+    # sudah di-commit sebuah run adalah baris manifest dengan loaded_at > started_at run tersebut.
+    # started_at dibulatkan ke atas ke detik penuh (DATETIME tanpa pecahan detik): file dari detik
+    # pertama run paling-paling dimuat ulang, tetapi file run sebelumnya tidak pernah dianggap selesai.
+    # Transkrip yang dimuat ulang menarik kembali kontribusi lamanya, sehingga counter Fact_Kelulusan
+    # tidak pernah diterapkan dua kali, juga untuk batch yang terputus sebelum commit.
+    def _begin_run(self, folder_path: str, force: bool, resume: bool) -> Tuple[bool, Optional[datetime]]:
+        """Register the run in Etl_Run, or take over the folder's interrupted run when resuming.
+
+        Returns the effective force flag and, for a resumed run, the time it originally started.
+        """
+        self.run_id = None
+        if not self.connection:
+            return force, None
+        folder = os.path.abspath(folder_path)
+        cursor = self._cursor(dictionary=True)
+        try:
+            cursor.execute("SELECT run_id, force_reload, started_at FROM Etl_Run WHERE folder_path = %s AND status = 'running' ORDER BY run_id DESC LIMIT 1", (folder,))
+            interrupted = cursor.fetchone()
+            self.analisis_stale = self.analisis_stale or bool(interrupted)
+            self.snapshot_stale = self.snapshot_stale or bool(interrupted)
+            if resume and interrupted:
+                self.run_id = interrupted['run_id']
+                logger.info(f"Resuming run {self.run_id} of {folder} (started {interrupted['started_at']}, force={bool(interrupted['force_reload'])})")
+                return bool(interrupted['force_reload']), interrupted['started_at']
+            if resume:
+                logger.info(f"No interrupted run of {folder} to resume; starting a new run")
+            elif interrupted:
+                logger.warning(f"Run {interrupted['run_id']} of {folder} did not finish and is abandoned (use --resume to continue an interrupted run)")
+                cursor.execute("UPDATE Etl_Run SET status = 'abandoned' WHERE run_id = %s", (interrupted['run_id'],))
+            cursor.execute("INSERT INTO Etl_Run (folder_path, force_reload, status, started_at) VALUES (%s, %s, 'running', %s)",
+                           (folder, force, datetime.fromtimestamp(int(time.time()) + 1)))
+            self.run_id = cursor.lastrowid
+            self.connection.commit()
+            return force, None
+        except DB_ERRORS as err:
+            logger.error(f"Error registering run: {err}")
+            self.connection.rollback()
+            return force, None
+        finally:
+            cursor.close()
+
+    def _finish_run(self, stats: Dict[str, int]):
+        """Mark the run completed; a run that never gets here stays 'running' and can be resumed"""
+        if not self.connection or self.run_id is None:
+            return
+        cursor = self._cursor()
+        try:
+            cursor.execute("UPDATE Etl_Run SET status = 'completed', finished_at = %s, processed = processed + %s, failed = failed + %s, skipped = skipped + %s WHERE run_id = %s",
+                           (datetime.now(), stats['processed'], stats['failed'], stats['skipped'], self.run_id))
+            self.connection.commit()
+        except DB_ERRORS as err:
+            logger.error(f"Error recording run completion: {err}")
+            self.connection.rollback()
+        finally:
+            cursor.close()
+
+    def _check_manifest(self, pdf_path: str, manifest: Dict[str, Dict], known_hashes: Dict[str, Optional[str]]) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """Return (source to process, manifest row to refresh); both None means the file is unchanged"""
+        file_path = os.path.abspath(pdf_path)
+        st = os.stat(pdf_path)
+        entry = manifest.get(file_path)
+        if entry and entry['file_size'] == st.st_size and entry['file_mtime_ns'] == st.st_mtime_ns:
+            return None, None
+
+        source = {'file_path': file_path, 'file_size': st.st_size, 'file_mtime_ns': st.st_mtime_ns, 'content_hash': _file_sha256(pdf_path)}
+        # Isi file sama (hanya disentuh atau disalin): cukup perbarui manifest.
+        if source['content_hash'] in known_hashes:
+            return None, dict(source, nrp=known_hashes[source['content_hash']])
+        return source, None
+
+    def process_folder(self, folder_path: str, workers: int = 1, batch_size: int = 100, force: bool = False, queue_size: Optional[int] = None,
+                       writers: int = 1, commit_interval: Optional[float] = None, resume: bool = False, paths: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Process new or changed PDF files in a folder through a bounded extract -> parse -> load pipeline.
+
+        A transaction is committed every `batch_size` transcripts or, with `commit_interval`, at least
+        every that many seconds. `resume` continues the interrupted run of the folder from its last commit.
+        `paths` limits the run to those files (a watch-mode micro-batch), which is not registered as a run.
+        """
         if not os.path.isdir(folder_path):
             logger.error(f"Folder not found: {folder_path}")
-            return {'processed': 0, 'failed': 0}
-        
-        stats = {'processed': 0, 'failed': 0}
-        pdf_files = [f for f in os.listdir(folder_path) if f.lower().endswith('.pdf')]
-        logger.info(f"Found {len(pdf_files)} PDF files to process")
+            return _run_stats()
         
+        stats = _run_stats()
+        if paths is not None:
+            # Micro-batch mode watch memakai cache dimensi yang sudah ada dan tidak tercatat di Etl_Run.
+            paths = sorted(paths)
+            manifest = {} if force else self._load_manifest(paths=paths)
+            self.run_id, resumed_since = None, None
+        else:
+            # Cache dimensi dimuat ulang sekali per run.
+            self.dim_cache = DimensionCache()
+            force, resumed_since = self._begin_run(folder_path, force, resume)
+        if resumed_since is not None:
+            # Run --force yang terputus: hanya file yang sudah di-commit run itu yang dilewati.
+            committed = self._load_manifest(after=resumed_since)
+            logger.info(f"{len(committed)} files were committed before the interruption and will not be extracted again")
+            manifest = committed if force else self._load_manifest()
+        elif paths is None:
+            manifest = {} if force else self._load_manifest()
+
         # Loop ini berlaku sebagai historical load (saat pertama kali) dan
         # incremental load (saat dijalankan kembali dengan file baru).
-        for filename in pdf_files:
-            pdf_path = os.path.join(folder_path, filename)
-            logger.info(f"Processing: {filename}")
+        # Scan + extract + parse berjalan di thread produsen (dan process pool bila workers > 1),
+        # sedangkan load dilakukan di thread utama, atau oleh `writers` thread writer. Antrian di
+        # antaranya dibatasi, jadi MySQL yang lambat menahan produsen alih-alih menumpuk data hasil parse.
+        parsed_queue = queue.Queue(maxsize=queue_size or batch_size)
+        monitor = PipelineMonitor(parsed_queue)
+        self.pipeline_monitor = monitor
+        stop = threading.Event()
+        errors: List[Exception] = []
+        producer = threading.Thread(target=self._produce, args=(folder_path, manifest, workers, parsed_queue, monitor, stop, errors, paths), name="etl-producer", daemon=True)
+        producer.start()
+
+        try:
+            self._consume(parsed_queue, monitor, stats, batch_size, writers, commit_interval)
+        finally:
+            stop.set()
+            producer.join()
+        if errors:
+            # File yang belum dibaca tidak terhitung di stats; run tetap 'running' supaya bisa dilanjutkan dengan --resume.
+            logger.error(f"Run stopped after {stats['processed']} transcripts; committed files are kept and --resume continues the run")
+            raise errors[0]
+        self._finish_run(stats)
+        
+        monitor.update(stats)
+        monitor.log_progress(force=True)
+        cache_stats = self.dim_cache.stats()
+        logger.info(f"Dimension cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+        return stats
+
+    def merge_shards(self, staging_dir: str, force: bool = False, batch_size: int = 1000) -> Optional[Dict[str, int]]:
+        """Merge the staging databases of a sharded run into the warehouse.
+
+        Shard-local dimension keys are mapped to warehouse keys by their natural keys, transcript facts
+        replace those of the same students, and the Fact_Kelulusan counts are added up. Only students
+        loaded since the shard's previous merge are merged, unless `force` is set.
+        """
+        if not os.path.isdir(staging_dir):
+            logger.error(f"Staging folder not found: {staging_dir}")
+            return None
+        shards = _shard_files(staging_dir)
+        counts = {count for _, count, _ in shards}
+        if len(counts) != 1 or [index for index, _, _ in shards] != list(range(counts.pop())):
+            logger.error(f"Incomplete or mixed shard set in {staging_dir}: {[os.path.basename(path) for _, _, path in shards]}")
+            return None
+
+        stats = _run_stats()
+        for index, count, path in shards:
+            logger.info(f"Merging shard {index + 1}/{count} from {path}")
+            self._merge_shard(path, force, batch_size, stats)
+        logger.info(f"Merge complete. Students merged: {stats['processed']}, failed: {stats['failed']}")
+        return stats
+
+    def _merge_shard(self, path: str, force: bool, batch_size: int, stats: Dict[str, int]):
+        """Merge one staging database, one transaction per `batch_size` students"""
+        staging = SQLiteBackend(path).connect()
+        source = staging.cursor(dictionary=True)
+        cursor = self._cursor(dictionary=True)
+        started = time.perf_counter()
+        try:
+            # Penanda merge disimpan di staging: shard yang di-run ulang hanya mengirim mahasiswa yang baru dimuat.
+            source.execute("CREATE TABLE IF NOT EXISTS Etl_Merge (merged_until DATETIME NOT NULL)")
+            source.execute("SELECT MAX(merged_until) AS merged_until FROM Etl_Merge")
+            since = None if force else source.fetchone()['merged_until']
+            source.execute("SELECT MAX(loaded_at) AS loaded_until FROM Etl_Manifest")
+            until = source.fetchone()['loaded_until']
+            if until is not None:
+                # loaded_at hanya sampai detik: tunggu detik penanda lewat, supaya tidak ada baris baru dengan
+                # loaded_at yang sama dan merge berikutnya cukup mengambil loaded_at > penanda (tanpa mengulang detik itu).
+                time.sleep(max(0.0, (datetime.fromisoformat(str(until)) + timedelta(seconds=1) - datetime.now()).total_seconds()))
+
+            keys = self._merge_dimension_keys(source, cursor)
+            if keys is None:
+                return
+            where, params = ("", []) if since is None else ("WHERE NRP IN (SELECT NRP FROM Etl_Manifest WHERE loaded_at > %s)", [since])
+            source.execute(f"SELECT id_mahasiswa, {', '.join(MAHASISWA_COLUMNS)} FROM Dim_Mahasiswa {where} ORDER BY id_mahasiswa", params)
+            students = source.fetchall()
+            merged = True
+            for start in range(0, len(students), batch_size):
+                chunk = students[start:start + batch_size]
+                if self._merge_students(source, cursor, chunk, keys, since):
+                    stats['processed'] += len(chunk)
+                else:
+                    stats['failed'] += len(chunk)
+                    merged = False
+            if merged and until is not None:
+                source.execute("INSERT INTO Etl_Merge (merged_until) VALUES (%s)", (until,))
+                staging.commit()
+        except DB_ERRORS as err:
+            logger.error(f"Error merging shard {path}: {err}")
+            self.connection.rollback()
+        finally:
+            source.close()
+            cursor.close()
+            staging.close()
+            self.metrics.observe_stage('merge', time.perf_counter() - started)
+
+    def _merge_dimension_keys(self, source, cursor) -> Optional[Dict[str, Dict]]:
+        """Create the shard's courses and periods in the warehouse and map shard keys to warehouse keys"""
+        try:
+            if not self.dim_cache.loaded:
+                self.dim_cache.preload(cursor)
+            source.execute("SELECT id_mk, kode_mk, nama_mk, sks_mk, tahap_mk FROM Dim_MataKuliah")
+            courses = sorted(source.fetchall(), key=itemgetter('kode_mk'))
+            source.execute("SELECT id_waktu, tahun, semester FROM Dim_Waktu")
+            periods = sorted(source.fetchall(), key=itemgetter('tahun', 'semester'))
+            source.execute("SELECT id_nilai, huruf_nilai FROM Dim_Nilai")
+            grades = source.fetchall()
+            # Urutan kunci alami yang sama dengan loader, jadi merge paralel ke MySQL tidak saling deadlock.
+            keys = {'matakuliah': {row['id_mk']: self._get_matakuliah_key(cursor, row) for row in courses},
+                    'waktu': {row['id_waktu']: self._get_waktu_key(cursor, row['tahun'], row['semester']) for row in periods},
+                    'nilai': {row['id_nilai']: self.dim_cache.nilai[row['huruf_nilai']] for row in grades}}
+            self.connection.commit()
+            self.dim_cache.commit()
+            return keys
+        except (*DB_ERRORS, KeyError) as err:
+            logger.error(f"Error mapping shard dimension keys: {err}")
+            self.connection.rollback()
+            self.dim_cache.rollback()
+            return None
+
+    def _merge_students(self, source, cursor, students: List[Dict], keys: Dict[str, Dict], since) -> bool:
+        """Merge one chunk of shard students with their facts and manifest rows in a single transaction"""
+        try:
+            student_keys = self._load_mahasiswa(cursor, [dict(zip(MAHASISWA_KEYS, (row[col] for col in MAHASISWA_COLUMNS))) for row in students])
+            if student_keys is None:
+                self._rollback_load()
+                return False
+            id_map = {row['id_mahasiswa']: student_keys[row['NRP']] for row in students}
+            shard_ids = list(id_map)
+            placeholders = ', '.join(['%s'] * len(shard_ids))
+
+            # Fakta lama mahasiswa yang sama (dari run atau shard sebelumnya) ditarik kembali dulu.
+            kelulusan_counts = self._retract_mahasiswa_facts(cursor, list(id_map.values()))
+            source.execute(f"SELECT ft.id_mahasiswa, ft.id_mk, ft.id_waktu, ft.id_nilai, ft.bobot_matkul, dn.huruf_nilai FROM Fact_Transkrip ft JOIN Dim_Nilai dn ON ft.id_nilai = dn.id_nilai WHERE ft.id_mahasiswa IN ({placeholders})", shard_ids)
+            transkrip_rows = []
+            for row in source.fetchall():
+                fact = (id_map[row['id_mahasiswa']], keys['matakuliah'][row['id_mk']], keys['waktu'][row['id_waktu']], keys['nilai'][row['id_nilai']][0], row['bobot_matkul'])
+                transkrip_rows.append(fact)
+                kelulusan_counts[(fact[1], fact[2])][0 if row['huruf_nilai'] not in ['D', 'E'] else 1] += 1
+            self._write_course_facts(cursor, transkrip_rows)
+
+            # Snapshot semester sudah dihitung shard; cukup ganti kuncinya.
+            source.execute(f"SELECT {', '.join(PRESTASI_COLUMNS)} FROM Fact_Prestasi_Semester WHERE id_mahasiswa IN ({placeholders})", shard_ids)
+            prestasi_rows = [(id_map[row['id_mahasiswa']], keys['waktu'][row['id_waktu']], *(row[col] for col in PRESTASI_COLUMNS[2:])) for row in source.fetchall()]
+            self._write_prestasi_rows(cursor, list(id_map.values()), prestasi_rows)
+
+            nrps = [row['NRP'] for row in students]
+            query = f"SELECT file_path, file_size, file_mtime_ns, content_hash, NRP FROM Etl_Manifest WHERE NRP IN ({', '.join(['%s'] * len(nrps))})"
+            source.execute(query if since is None else f"{query} AND loaded_at > %s", nrps if since is None else nrps + [since])
+            self._record_manifest(cursor, [dict(row, nrp=row['NRP']) for row in source.fetchall()])
+            self._apply_kelulusan_counts(cursor, kelulusan_counts)
+
+            self._commit_load()
+            self.touched_analisis.update(kelulusan_counts.keys())
+            self.touched_insights.courses.update(id_mk for id_mk, _ in kelulusan_counts)
+            self.snapshot_students.update(id_map.values())
+            self.snapshot_courses.update(id_mk for id_mk, _ in kelulusan_counts)
+            return True
+        except DB_ERRORS as err:
+            logger.error(f"Error merging {len(students)} shard students: {err}")
+            self._rollback_load()
+            return False
+
+    def load_transcripts(self, transcripts: Iterable[Dict], batch_size: int = 100, writers: int = 1) -> Dict[str, int]:
+        """Load already parsed transcripts through the same batched loader as process_folder"""
+        stats = _run_stats()
+        parsed_queue = queue.Queue()
+        for data in transcripts:
+            parsed_queue.put(('parsed', data['student']['nrp'], data))
+        parsed_queue.put(('done', '', None))
+        self._consume(parsed_queue, PipelineMonitor(parsed_queue), stats, batch_size, writers)
+        return stats
+
+    def _consume(self, parsed_queue: "queue.Queue", monitor: "PipelineMonitor", stats: Dict[str, int], batch_size: int, writers: int = 1,
+                 commit_interval: Optional[float] = None):
+        """Loader side of the pipeline: take items off the parsed queue until 'done' and load them in batches"""
+        if writers > 1 and not self.backend.concurrent_writers:
+            logger.warning(f"The {self.backend.name} backend serialises writes; loading with a single writer")
+            writers = 1
+        if writers > 1:
+            self._consume_parallel(parsed_queue, monitor, stats, batch_size, writers, commit_interval)
+            return
+
+        def next_item() -> Optional[Tuple]:
             try:
-                text = self.extract_pdf_text(pdf_path)
-                if text and (data := self.parse_transcript(text)) and self.load_to_warehouse(data):
-                    stats['processed'] += 1
+                kind, filename, payload = parsed_queue.get(timeout=1.0)
+            except queue.Empty:
+                monitor.log_progress()
+                return ()
+            if kind == 'done':
+                return None
+            if kind == 'parsed':
+                return kind, filename, payload
+            if kind == 'skipped':
+                stats['skipped'] += 1
+                return ('refresh', filename, payload) if payload else ()
+            stats['failed'] += 1
+            return ()
+
+        self._load_batches(next_item, stats, batch_size, commit_interval, lambda: monitor.update(stats))
+
+    def _load_batches(self, next_item: Callable[[], Optional[Tuple]], stats: Dict[str, int], batch_size: int, commit_interval: Optional[float],
+                      after_item: Callable[[], None] = lambda: None):
+        """Group commit loop of the single loader and of every writer thread.
+
+        `next_item` returns ('parsed', file, data) or ('refresh', file, source), () when nothing
+        arrived in time, and None once the input is exhausted.
+        """
+        # Transkrip dimuat per batch, satu transaksi per batch (group commit per N transkrip atau M detik).
+        batch: List[Tuple[str, Dict]] = []
+        refreshed: List[Dict] = []
+        last_commit = time.monotonic()
+        while (item := next_item()) is not None:
+            if item:
+                kind, filename, payload = item
+                if kind == 'refresh':
+                    refreshed.append(payload)
+                else:
+                    batch.append((filename, payload))
+            if _commit_due(batch, refreshed, batch_size, commit_interval, last_commit):
+                self._load_batch_with_fallback(batch, stats, refreshed)
+                batch, refreshed, last_commit = [], [], time.monotonic()
+            after_item()
+        if batch or refreshed:
+            self._load_batch_with_fallback(batch, stats, refreshed)
+
+    ### INCREMENTAL LOAD ###
+    # Mode multi-writer: transkrip dibagi ke N writer berdasarkan hash NRP, sehingga setiap writer
+    # memuat himpunan mahasiswa yang saling lepas (dan versi terbaru satu NRP selalu dimuat terakhir).
+    def _consume_parallel(self, parsed_queue: "queue.Queue", monitor: "PipelineMonitor", stats: Dict[str, int], batch_size: int, writers: int,
+                          commit_interval: Optional[float] = None):
+        """Route parsed transcripts to `writers` threads, each loading batches on its own pooled connection"""
+        logger.info(f"Loading with {writers} concurrent writers")
+        pool = ConnectionPool(self.backend, writers)
+        loaders = [self._writer_loader() for _ in range(writers)]
+        inboxes = [queue.Queue(maxsize=batch_size * 2) for _ in range(writers)]
+        writer_stats = [_run_stats() for _ in range(writers)]
+        threads = [threading.Thread(target=loader._writer_loop, args=(pool, inbox, counts, batch_size, commit_interval), name=f"etl-writer-{i}", daemon=True)
+                   for i, (loader, inbox, counts) in enumerate(zip(loaders, inboxes, writer_stats))]
+        for thread in threads:
+            thread.start()
+
+        def progress() -> Dict[str, int]:
+            return {key: stats[key] + sum(counts[key] for counts in writer_stats) for key in stats}
+
+        try:
+            while True:
+                try:
+                    kind, filename, payload = parsed_queue.get(timeout=1.0)
+                except queue.Empty:
+                    monitor.log_progress()
+                    continue
+                if kind == 'done':
+                    break
+                if kind == 'skipped':
+                    stats['skipped'] += 1
+                    if payload:
+                        inboxes[_hash_partition(payload['file_path'], writers)].put(('refresh', filename, payload))
+                elif kind == 'parsed':
+                    inboxes[_hash_partition(payload['student']['nrp'], writers)].put((kind, filename, payload))
                 else:
                     stats['failed'] += 1
-            except Exception as e:
-                logger.error(f"Error processing {filename}: {e}")
+                monitor.update(progress())
+        finally:
+            for inbox in inboxes:
+                inbox.put(None)
+            for thread in threads:
+                thread.join()
+            pool.close()
+
+        for loader, counts in zip(loaders, writer_stats):
+            stats['processed'] += counts['processed']
+            stats['failed'] += counts['failed']
+            self.touched_analisis |= loader.touched_analisis
+            self.touched_insights.update(loader.touched_insights)
+            self.snapshot_students |= loader.snapshot_students
+            self.snapshot_courses |= loader.snapshot_courses
+            self.dim_cache.hits += loader.dim_cache.hits
+            self.dim_cache.misses += loader.dim_cache.misses
+
+    def _writer_loader(self) -> "TranscriptETL":
+        """ETL instance for one writer thread: own connection and dimension cache, shared backend and metrics"""
+        loader = TranscriptETL(self.db_config, self.backend)
+        loader.metrics = self.metrics
+        loader.run_id = self.run_id
+        return loader
+
+    def _writer_loop(self, pool: ConnectionPool, inbox: "queue.Queue", stats: Dict[str, int], batch_size: int, commit_interval: Optional[float] = None):
+        """Writer thread: batch the transcripts routed to this writer until the None sentinel"""
+        try:
+            self.connection = pool.get()
+        except DB_ERRORS as err:
+            # Tanpa koneksi, load_batch gagal per transkrip dan antrian tetap dikosongkan.
+            logger.error(f"Writer could not get a database connection: {err}")
+
+        def next_item() -> Optional[Tuple]:
+            try:
+                return inbox.get(timeout=1.0 if commit_interval else None)
+            except queue.Empty:
+                return ()
+
+        try:
+            self._load_batches(next_item, stats, batch_size, commit_interval)
+        except Exception as e:
+            logger.error(f"Writer thread failed: {e}")
+            # Sisa antrian tetap dikonsumsi agar dispatcher tidak terblokir pada antrian yang penuh.
+            while (item := inbox.get()) is not None:
+                if item[0] != 'refresh':
+                    stats['failed'] += 1
+        finally:
+            if self.connection:
+                pool.put(self.connection)
+                self.connection = None
+
+    def _produce(self, folder_path: str, manifest: Dict[str, Dict], workers: int, out_queue: "queue.Queue", monitor: "PipelineMonitor", stop: threading.Event,
+                 errors: List[Exception], paths: Optional[List[str]] = None):
+        """Producer thread: scan the folder, extract and parse PDFs, and feed the bounded queue.
+
+        A failure of the stage itself (listing the folder, the worker pool) is appended to `errors`
+        after the loaders are told to finish, so process_folder can raise it.
+        """
+        def emit(item: Tuple[str, str, Optional[Dict]]):
+            # `put` dengan timeout agar produsen bisa berhenti bila loader sudah selesai/gagal.
+            while not stop.is_set():
+                try:
+                    out_queue.put(item, timeout=0.5)
+                    return
+                except queue.Full:
+                    continue
+
+        def emit_parsed(filename: str, source: Dict, result: Tuple[Optional[Dict], Dict]):
+            data, timings = result
+            monitor.count('parsed')
+            for stage in ('extract', 'parse', 'pdf'):
+                if stage in timings:
+                    self.metrics.observe_stage(stage, timings[stage])
+            if 'pages' in timings:
+                self.metrics.count_pages(**timings['pages'])
+            if timings.get('error'):
+                self.metrics.fail(timings['error'])
+            if data:
+                data['source'] = source
+                emit(('parsed', filename, data))
+            else:
+                emit(('failed', filename, None))
+
+        try:
+            candidates = self._scan_folder(folder_path, manifest, monitor, paths)
+            if workers <= 1:
+                for status, filename, pdf_path, payload in candidates:
+                    if stop.is_set(): break
+                    if status != 'new':
+                        emit((status, filename, payload))
+                        continue
+                    logger.info(f"Processing: {filename}")
+                    emit_parsed(filename, payload, _extract_and_parse(pdf_path, payload))
+                return
+
+            logger.info(f"Extracting and parsing with {workers} worker processes")
+            # Jendela future dibatasi dan diambil sesuai urutan, sehingga urutan load (dan kunci
+            # dimensi yang terbentuk) sama dengan mode serial dan memori tidak tumbuh.
+            in_flight = deque()
+            # Worker yang di-spawn (bukan fork) memilih engine dan cache yang sama lewat initializer.
+            with ProcessPoolExecutor(max_workers=workers, initializer=configure_extraction, initargs=TEXT_EXTRACTOR.settings) as executor:
+                for status, filename, pdf_path, payload in candidates:
+                    if stop.is_set(): break
+                    if status != 'new':
+                        emit((status, filename, payload))
+                        continue
+                    in_flight.append((filename, payload, executor.submit(_extract_and_parse, pdf_path, payload)))
+                    monitor.in_flight = len(in_flight)
+                    if len(in_flight) >= workers * 2:
+                        filename, source, future = in_flight.popleft()
+                        logger.info(f"Processing: {filename}")
+                        emit_parsed(filename, source, future.result())
+                while in_flight and not stop.is_set():
+                    filename, source, future = in_flight.popleft()
+                    monitor.in_flight = len(in_flight)
+                    logger.info(f"Processing: {filename}")
+                    emit_parsed(filename, source, future.result())
+                for _, _, future in in_flight:
+                    future.cancel()
+        except Exception as e:
+            logger.error(f"Error in extract/parse stage: {e}")
+            errors.append(e)
+        finally:
+            monitor.in_flight = 0
+            emit(('done', '', None))
+
+    def _scan_folder(self, folder_path: str, manifest: Dict[str, Dict], monitor: "PipelineMonitor", paths: Optional[List[str]] = None) -> Iterator[Tuple[str, str, str, Optional[Dict]]]:
+        """Lazily yield (status, filename, path, payload) for the PDFs in a folder (or just `paths`).
+
+        status is 'new' (payload = manifest source), 'skipped' (payload = manifest row to refresh, if any)
+        or 'failed' (the file could not be read).
+        """
+        known_hashes = {row['content_hash']: row.get('NRP') for row in manifest.values()}
+        for name, path in _folder_entries(folder_path, paths):
+            if not name.lower().endswith('.pdf'):
+                continue
+            # File milik shard lain diproses oleh node lain.
+            if self.shard and _hash_partition(name, self.shard[1]) != self.shard[0]:
+                continue
+            monitor.count('scanned')
+            try:
+                with self.metrics.time_stage('manifest_check'):
+                    source, refresh = self._check_manifest(path, manifest, known_hashes)
+            except OSError as e:
+                logger.error(f"Error reading {name}: {e}")
+                self.metrics.fail('read_error')
+                yield 'failed', name, path, None
+                continue
+            if source:
+                yield 'new', name, path, source
+            else:
+                monitor.count('skipped')
+                yield 'skipped', name, path, refresh
+
+    def _load_batch_with_fallback(self, batch: List[Tuple[str, Dict]], stats: Dict[str, int], refreshed: Optional[List[Dict]] = None):
+        """Load a batch in one transaction; if it fails, retry per transcript to isolate bad files"""
+        if self.load_batch([data for _, data in batch], refreshed):
+            stats['processed'] += len(batch)
+            return
+        if refreshed and batch:
+            self.load_batch([], refreshed)
+        if len(batch) == 1:
+            logger.error(f"Failed to load {batch[0][0]}")
+            self.metrics.fail(f"load_{self.last_load_error}")
+            stats['failed'] += 1
+            return
+
+        if batch:
+            logger.warning(f"Batch of {len(batch)} transcripts failed, retrying one by one")
+        for filename, data in batch:
+            if self.load_batch([data]):
+                stats['processed'] += 1
+            else:
+                logger.error(f"Failed to load {filename}")
+                self.metrics.fail(f"load_{self.last_load_error}")
                 stats['failed'] += 1
-        
-        return stats
-    
+
+    ### INCREMENTAL LOAD ###
+    # Mode daemon: setelah mengejar isi folder, PDF baru/berubah dimuat per micro-batch begitu muncul,
+    # dan refresh Fact_Analisis_MataKuliah digabung untuk satu rentetan upload.
+    def watch_folder(self, folder_path: str, workers: int = 1, batch_size: int = 100, writers: int = 1, commit_interval: Optional[float] = None,
+                     force: bool = False, resume: bool = False, poll_interval: float = 2.0, stop: Optional[threading.Event] = None,
+                     on_refresh: Optional[Callable[[Dict[str, int]], None]] = None, full_rebuild: bool = False) -> Dict[str, int]:
+        """Ingest the folder, then keep ingesting new or changed PDFs until `stop` is set (or Ctrl+C).
+
+        `full_rebuild` recomputes the aggregates completely after the catch-up; later refreshes stay incremental.
+        """
+        stop = stop or threading.Event()
+        options = {'workers': workers, 'batch_size': batch_size, 'writers': writers, 'commit_interval': commit_interval}
+        # Watcher dibuat sebelum catch-up: PDF yang ditulis selama catch-up ada di listing-nya atau dilaporkan sebagai event.
+        watcher = FolderWatcher(folder_path, poll_interval)
+        totals = _run_stats()
+        last_change = pending_since = None
+        try:
+            totals = self.process_folder(folder_path, force=force, resume=resume, **options)
+            self.refresh_aggregates(full_rebuild=full_rebuild)
+            if on_refresh:
+                on_refresh(totals)
+
+            logger.info(f"Watching {folder_path} for new or changed transcripts ({watcher.mode})")
+            while not stop.is_set():
+                paths = watcher.wait(timeout=1.0)
+                now = time.monotonic()
+                if paths:
+                    logger.info(f"{len(paths)} new or changed PDFs in {folder_path}")
+                    stats = self.process_folder(folder_path, paths=paths, **options)
+                    for key in totals:
+                        totals[key] += stats[key]
+                    last_change = now
+                    if (self.touched_analisis or self.touched_insights) and pending_since is None:
+                        pending_since = now
+                if pending_since is not None and (now - last_change >= AGGREGATE_QUIET_S or now - pending_since >= AGGREGATE_MAX_DELAY_S):
+                    self.refresh_aggregates()
+                    pending_since = None
+                    if on_refresh:
+                        on_refresh(totals)
+        except KeyboardInterrupt:
+            logger.info("Watch mode interrupted")
+        finally:
+            watcher.close()
+
+        if pending_since is not None:
+            self.refresh_aggregates()
+            if on_refresh:
+                on_refresh(totals)
+        logger.info(f"Stopped watching {folder_path}")
+        return totals
+
+    def refresh_aggregates(self, full_rebuild: bool = False):
+        """Final aggregation stage: the Insight_* summary tables and Fact_Analisis_MataKuliah"""
+        full_rebuild = full_rebuild or self.analisis_stale
+        self.refresh_insights(full_rebuild)
+        self.populate_analisis_matakuliah(full_rebuild)
+
+    ### INCREMENTAL LOAD ###
+    # Memperbarui tabel ringkasan Insight_* hanya untuk mata kuliah, semester, status dan angkatan
+    # yang disentuh load, sehingga dashboard membaca baris ber-index alih-alih mengagregasi tabel fakta.
+    def refresh_insights(self, full_rebuild: bool = False):
+        """Recompute the Insight_* rows made stale since the last refresh (all rows with `full_rebuild`)"""
+        if not self.connection:
+            logger.error("No database connection available for the insight refresh.")
+            return
+        touched = self.touched_insights
+        if not full_rebuild and not touched:
+            logger.info("No insight rows changed in this run; Insight_* tables are up to date.")
+            return
+
+        cursor = self._cursor(dictionary=True)
+        started = time.perf_counter()
+        try:
+            keys = None
+            if not full_rebuild:
+                # Perubahan IPK/status mahasiswa lama memengaruhi rata-rata semua semester yang pernah ia tempuh.
+                semesters = set(touched.semesters)
+                students = sorted(touched.students)
+                for start in range(0, len(students), BULK_CHUNK_ROWS):
+                    chunk = students[start:start + BULK_CHUNK_ROWS]
+                    cursor.execute(f"SELECT DISTINCT id_waktu FROM Fact_Prestasi_Semester WHERE id_mahasiswa IN ({', '.join(['%s'] * len(chunk))})", chunk)
+                    semesters.update(row['id_waktu'] for row in cursor.fetchall())
+                keys = {'Insight_MataKuliah': touched.courses, 'Insight_SebaranNilai': touched.courses, 'Insight_Semester': semesters,
+                        'Insight_Status': touched.statuses, 'Insight_Angkatan': touched.angkatan}
+
+            refreshed = {}
+            for table, columns, key_col, key_expr, query in INSIGHT_TABLES:
+                refreshed[table] = self._refresh_insight_table(cursor, table, columns, key_col, key_expr, query, None if keys is None else keys[table])
+            self.connection.commit()
+            touched.clear()
+            logger.info(f"Refreshed insight tables ({'full rebuild' if full_rebuild else 'incremental'}): " + ', '.join(f"{table} {rows}" for table, rows in refreshed.items()))
+        except DB_ERRORS as err:
+            logger.error(f"Error refreshing insight tables: {err}")
+            self.connection.rollback()
+        finally:
+            cursor.close()
+            self.metrics.observe_stage('insights', time.perf_counter() - started)
+
+    def _refresh_insight_table(self, cursor, table: str, columns: List[str], key_col: str, key_expr: str, query: str, keys: Optional[Set]) -> int:
+        """Replace the rows of `keys` (every row if None) with freshly aggregated ones; returns the rows written"""
+        rows = []
+        if keys is None:
+            cursor.execute(query.format(where=""))
+            rows = cursor.fetchall()
+            cursor.execute(f"DELETE FROM {table}")
+        else:
+            # Status kosong (NULL) tidak bisa dicocokkan dengan IN, jadi barisnya dihitung ulang terpisah.
+            if None in keys:
+                cursor.execute(query.format(where=f"WHERE {key_expr} IS NULL"))
+                rows.extend(cursor.fetchall())
+                cursor.execute(f"DELETE FROM {table} WHERE {key_col} IS NULL")
+            keys = sorted(key for key in keys if key is not None)
+            for start in range(0, len(keys), BULK_CHUNK_ROWS):
+                chunk = keys[start:start + BULK_CHUNK_ROWS]
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(query.format(where=f"WHERE {key_expr} IN ({placeholders})"), chunk)
+                rows.extend(cursor.fetchall())
+                cursor.execute(f"DELETE FROM {table} WHERE {key_col} IN ({placeholders})", chunk)
+        insert_sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+        self._executemany(cursor, insert_sql, [tuple(row[col] for col in columns) for row in rows])
+        return len(rows)
+
     ### INCREMENTAL LOAD ###
     # Mengagregasi data dari `Fact_Transkrip` ke tabel analisis.
-    def populate_analisis_matakuliah(self):
+    # Secara default hanya grup (id_mk, id_waktu) yang disentuh load ini yang dihitung ulang;
+    # `full_rebuild` menghitung ulang seluruh tabel (untuk perbaikan).
+    def populate_analisis_matakuliah(self, full_rebuild: bool = False):
         """Populate the Fact_Analisis_MataKuliah table by aggregating data from other tables."""
         if not self.connection:
             logger.error("No database connection available for final aggregation.")
             return
+        if self.analisis_stale and not full_rebuild:
+            logger.info("An interrupted run left course-semester groups unaggregated; rebuilding Fact_Analisis_MataKuliah in full.")
+            full_rebuild = True
+        self.analisis_stale = False
+        if not full_rebuild and not self.touched_analisis:
+            logger.info("No course-semester groups changed in this run; Fact_Analisis_MataKuliah is up to date.")
+            return
 
-        logger.info("Starting final aggregation for Fact_Analisis_MataKuliah...")
-        cursor = self.connection.cursor(dictionary=True)
+        cursor = self._cursor(dictionary=True)
+        started = time.perf_counter()
         try:
-            query = """SELECT ft.id_mk, ft.id_waktu, COUNT(ft.id_transkrip) AS jumlah_pengambil_mk, SUM(CASE WHEN dn.huruf_nilai NOT IN ('D', 'E') THEN 1 ELSE 0 END) AS jml_lulus, AVG(dn.bobot_nilai) AS rata_rata_bobot_nilai, SUM(CASE WHEN dn.huruf_nilai = 'A' THEN 1 ELSE 0 END) AS jumlah_nilai_A, SUM(CASE WHEN dn.huruf_nilai = 'AB' THEN 1 ELSE 0 END) AS jumlah_nilai_AB, SUM(CASE WHEN dn.huruf_nilai = 'B' THEN 1 ELSE 0 END) AS jumlah_nilai_B, SUM(CASE WHEN dn.huruf_nilai = 'BC' THEN 1 ELSE 0 END) AS jumlah_nilai_BC, SUM(CASE WHEN dn.huruf_nilai = 'C' THEN 1 ELSE 0 END) AS jumlah_nilai_C, SUM(CASE WHEN dn.huruf_nilai = 'D' THEN 1 ELSE 0 END) AS jumlah_nilai_D, SUM(CASE WHEN dn.huruf_nilai = 'E' THEN 1 ELSE 0 END) AS jumlah_nilai_E FROM Fact_Transkrip ft JOIN Dim_Nilai dn ON ft.id_nilai = dn.id_nilai GROUP BY ft.id_mk, ft.id_waktu;"""
-            cursor.execute(query)
-            results = cursor.fetchall()
+            query = """SELECT ft.id_mk, ft.id_waktu, COUNT(ft.id_transkrip) AS jumlah_pengambil_mk, SUM(CASE WHEN dn.huruf_nilai NOT IN ('D', 'E') THEN 1 ELSE 0 END) AS jml_lulus, AVG(dn.bobot_nilai) AS rata_rata_bobot_nilai, SUM(CASE WHEN dn.huruf_nilai = 'A' THEN 1 ELSE 0 END) AS jumlah_nilai_A, SUM(CASE WHEN dn.huruf_nilai = 'AB' THEN 1 ELSE 0 END) AS jumlah_nilai_AB, SUM(CASE WHEN dn.huruf_nilai = 'B' THEN 1 ELSE 0 END) AS jumlah_nilai_B, SUM(CASE WHEN dn.huruf_nilai = 'BC' THEN 1 ELSE 0 END) AS jumlah_nilai_BC, SUM(CASE WHEN dn.huruf_nilai = 'C' THEN 1 ELSE 0 END) AS jumlah_nilai_C, SUM(CASE WHEN dn.huruf_nilai = 'D' THEN 1 ELSE 0 END) AS jumlah_nilai_D, SUM(CASE WHEN dn.huruf_nilai = 'E' THEN 1 ELSE 0 END) AS jumlah_nilai_E FROM Fact_Transkrip ft JOIN Dim_Nilai dn ON ft.id_nilai = dn.id_nilai {where} GROUP BY ft.id_mk, ft.id_waktu"""
+            if full_rebuild:
+                logger.info("Starting full rebuild of Fact_Analisis_MataKuliah...")
+                cursor.execute(query.format(where=""))
+                results = cursor.fetchall()
+                # Hapus grup yang sudah tidak punya transkrip sama sekali.
+                cursor.execute("DELETE FROM Fact_Analisis_MataKuliah WHERE NOT EXISTS (SELECT 1 FROM Fact_Transkrip ft WHERE ft.id_mk = Fact_Analisis_MataKuliah.id_mk AND ft.id_waktu = Fact_Analisis_MataKuliah.id_waktu)")
+            else:
+                keys = sorted(self.touched_analisis)
+                logger.info(f"Starting incremental aggregation of Fact_Analisis_MataKuliah for {len(keys)} course-semester combinations...")
+                results = []
+                for start in range(0, len(keys), BULK_CHUNK_ROWS):
+                    chunk = keys[start:start + BULK_CHUNK_ROWS]
+                    params = [value for key in chunk for value in key]
+                    cursor.execute(query.format(where=f"WHERE {self.backend.row_in('ft.id_mk, ft.id_waktu', len(chunk))}"), params)
+                    chunk_results = cursor.fetchall()
+                    results.extend(chunk_results)
+                    # Grup yang transkripnya sudah ditarik semua tidak lagi muncul di hasil agregasi.
+                    found = {(row['id_mk'], row['id_waktu']) for row in chunk_results}
+                    emptied = [value for key in chunk if key not in found for value in key]
+                    if emptied:
+                        cursor.execute(f"DELETE FROM Fact_Analisis_MataKuliah WHERE {self.backend.row_in('id_mk, id_waktu', len(emptied) // 2)}", emptied)
+
+            analisis_rows = []
             for row in results:
                 persentase_kelulusan = (row['jml_lulus'] / row['jumlah_pengambil_mk'] * 100) if row['jumlah_pengambil_mk'] > 0 else 0
-                
-                # UPSERT: Mengisi atau memperbarui tabel agregat dengan hasil analisis terbaru.
-                upsert_sql = """INSERT INTO Fact_Analisis_MataKuliah (id_mk, id_waktu, rata_rata_bobot_nilai, persentase_kelulusan, jumlah_pengambil_mk, jumlah_nilai_A, jumlah_nilai_AB, jumlah_nilai_B, jumlah_nilai_BC, jumlah_nilai_C, jumlah_nilai_D, jumlah_nilai_E) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) ON DUPLICATE KEY UPDATE rata_rata_bobot_nilai = VALUES(rata_rata_bobot_nilai), persentase_kelulusan = VALUES(persentase_kelulusan), jumlah_pengambil_mk = VALUES(jumlah_pengambil_mk), jumlah_nilai_A = VALUES(jumlah_nilai_A), jumlah_nilai_AB = VALUES(jumlah_nilai_AB), jumlah_nilai_B = VALUES(jumlah_nilai_B), jumlah_nilai_BC = VALUES(jumlah_nilai_BC), jumlah_nilai_C = VALUES(jumlah_nilai_C), jumlah_nilai_D = VALUES(jumlah_nilai_D), jumlah_nilai_E = VALUES(jumlah_nilai_E)"""
-                cursor.execute(upsert_sql, (row['id_mk'], row['id_waktu'], row['rata_rata_bobot_nilai'], persentase_kelulusan, row['jumlah_pengambil_mk'], row['jumlah_nilai_A'], row['jumlah_nilai_AB'], row['jumlah_nilai_B'], row['jumlah_nilai_BC'], row['jumlah_nilai_C'], row['jumlah_nilai_D'], row['jumlah_nilai_E']))
+                analisis_rows.append((row['id_mk'], row['id_waktu'], row['rata_rata_bobot_nilai'], persentase_kelulusan, row['jumlah_pengambil_mk'], row['jumlah_nilai_A'], row['jumlah_nilai_AB'], row['jumlah_nilai_B'], row['jumlah_nilai_BC'], row['jumlah_nilai_C'], row['jumlah_nilai_D'], row['jumlah_nilai_E']))
+
+            # UPSERT: Mengisi atau memperbarui tabel agregat dengan hasil analisis terbaru.
+            upsert_sql = self.backend.upsert_sql('Fact_Analisis_MataKuliah', ['id_mk', 'id_waktu', 'rata_rata_bobot_nilai', 'persentase_kelulusan', 'jumlah_pengambil_mk', 'jumlah_nilai_A', 'jumlah_nilai_AB', 'jumlah_nilai_B', 'jumlah_nilai_BC', 'jumlah_nilai_C', 'jumlah_nilai_D', 'jumlah_nilai_E'], ['id_mk', 'id_waktu'])
+            self._executemany(cursor, upsert_sql, analisis_rows)
 
             self.connection.commit()
+            self.touched_analisis.clear()
             logger.info(f"Successfully populated/updated Fact_Analisis_MataKuliah for {len(results)} course-semester combinations.")
-        except mysql.connector.Error as err:
+        except DB_ERRORS as err:
             logger.error(f"Error during final aggregation: {err}")
             self.connection.rollback()
         finally:
             cursor.close()
+            self.metrics.observe_stage('aggregate', time.perf_counter() - started)
+
+    def write_run_report(self, json_path: Optional[str] = None, prometheus_path: Optional[str] = None, stats: Optional[Dict[str, int]] = None):
+        """Export the run metrics as a JSON report and/or a Prometheus text-format file"""
+        extra = {'transcripts': stats or {}, 'dimension_cache': self.dim_cache.stats()}
+        if self.pipeline_monitor:
+            extra['pipeline'] = self.pipeline_monitor.snapshot()
+        try:
+            if json_path:
+                self.metrics.write_json(json_path, extra)
+                logger.info(f"Run report written to {json_path}")
+            if prometheus_path:
+                self.metrics.write_prometheus(prometheus_path, stats)
+                logger.info(f"Prometheus metrics written to {prometheus_path}")
+        except OSError as e:
+            logger.error(f"Error writing run report: {e}")
+
+    def profile_document(self, pdf_path: str, output: Optional[str] = None, load: bool = False) -> Optional[Dict]:
+        """Run extract -> parse (-> load) for a single PDF under cProfile and log the hottest functions"""
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            text = self.extract_pdf_text(pdf_path)
+            data = self.parse_transcript(text) if text else None
+            if load and data:
+                self.load_to_warehouse(data)
+        finally:
+            profiler.disable()
+        if output:
+            profiler.dump_stats(output)
+            logger.info(f"Profile of {os.path.basename(pdf_path)} written to {output}")
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(25)
+        logger.info(f"Profile of {os.path.basename(pdf_path)}:\n{stream.getvalue()}")
+        return data
+
+    def refresh_snapshot(self, path: str = SNAPSHOT_PATH, full_rebuild: bool = False) -> Optional[AnalyticsSnapshot]:
+        """Patch the analytics snapshot at `path` with the students and courses changed since it was written, or rebuild it"""
+        if not self.connection:
+            logger.error("No database connection available for the analytics snapshot.")
+            return None
+        cursor = self._cursor()
+        started = time.perf_counter()
+        try:
+            base = None if full_rebuild or self.snapshot_stale else self._snapshot_base(cursor, path)
+            if base is not None and not (self.snapshot_students or self.snapshot_courses):
+                logger.info("No rows changed in this run; analytics snapshot is up to date.")
+                if self.run_id is not None and base.meta.get('run_id') != self.run_id:
+                    base.meta['run_id'] = self.run_id
+                    base.save_meta(path)
+                self.snapshot = base
+                return base
+            if base is None:
+                snapshot = AnalyticsSnapshot.build(cursor, self.run_id)
+            else:
+                snapshot = base.patched(cursor, self.snapshot_students, self.snapshot_courses, self.run_id)
+            snapshot.save(path)
+            logger.info(f"Analytics snapshot {'rebuilt' if base is None else 'patched'} at {path}: "
+                        f"{snapshot.meta['rows']['student']} students, {snapshot.meta['rows']['semester']} semester rows, {snapshot.meta['rows']['analisis']} course-semester rows")
+            self.snapshot = snapshot
+            self.snapshot_stale = False
+            self.snapshot_students.clear()
+            self.snapshot_courses.clear()
+            return snapshot
+        except (*DB_ERRORS, OSError) as err:
+            logger.error(f"Error refreshing the analytics snapshot: {err}")
+            return None
+        finally:
+            cursor.close()
+            self.metrics.observe_stage('snapshot', time.perf_counter() - started)
+
+    def _snapshot_base(self, cursor, path: str) -> Optional[AnalyticsSnapshot]:
+        """Snapshot that can be patched with this process's changes: ours, or the one written right after the previous run"""
+        if self.snapshot is not None:
+            return self.snapshot
+        if self.run_id is None or not os.path.isdir(path):
+            return None
+        try:
+            snapshot = AnalyticsSnapshot.load(path, mmap=False)
+        except (OSError, ValueError, KeyError) as err:
+            logger.warning(f"Analytics snapshot at {path} is unreadable ({err}); rebuilding it")
+            return None
+        # Run lain tanpa refresh snapshot (mis. yang terputus) membuat perubahan yang tidak tercatat di sini.
+        cursor.execute("SELECT MAX(run_id) FROM Etl_Run WHERE run_id < %s", (self.run_id,))
+        previous = cursor.fetchone()[0]
+        return snapshot if previous is not None and snapshot.meta.get('run_id') == previous else None
+
+    def export_parquet(self, folder: str) -> bool:
+        """Export the star schema tables to Parquet files for columnar analytics"""
+        if not self.connection:
+            logger.error("No database connection available for export")
+            return False
+        cursor = self._cursor()
+        try:
+            counts = ParquetSink(folder).export(cursor)
+            logger.info(f"Exported {sum(counts.values())} rows from {len(counts)} tables to {folder}")
+            return True
+        except (*DB_ERRORS, ImportError, OSError) as err:
+            logger.error(f"Error exporting to Parquet: {err}")
+            return False
+        finally:
+            cursor.close()
 
     def close_connection(self):
         """Close database connection"""
@@ -476,8 +2901,179 @@ class TranscriptETL:
             self.connection.close()
             logger.info("Database connection closed")
 
+def _file_sha256(path: str) -> str:
+    """Hash file contents in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _folder_entries(folder_path: str, paths: Optional[List[str]] = None) -> Iterator[Tuple[str, str]]:
+    """(name, path) of the folder's entries, or of `paths` when given"""
+    if paths is not None:
+        for path in paths:
+            yield os.path.basename(path), path
+        return
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            yield entry.name, entry.path
+
+def _run_stats() -> Dict[str, int]:
+    """Fresh transcript counts of a run, a merge or one writer"""
+    return {'processed': 0, 'failed': 0, 'skipped': 0}
+
+def _commit_due(batch: List, refreshed: List, batch_size: int, commit_interval: Optional[float], last_commit: float) -> bool:
+    """Whether the pending batch should be committed now: it is full, or `commit_interval` seconds have passed"""
+    if len(batch) >= batch_size:
+        return True
+    return bool(batch or refreshed) and commit_interval is not None and time.monotonic() - last_commit >= commit_interval
+
+def _hash_partition(key: str, partitions: int) -> int:
+    """Stable writer or shard assignment for an NRP or file name, independent of PYTHONHASHSEED and the machine"""
+    return zlib.crc32(key.encode('utf-8')) % partitions
+
+def shard_staging_path(staging_dir: str, index: int, count: int) -> str:
+    """Staging database of shard `index` of `count`"""
+    return os.path.join(staging_dir, SHARD_STAGING_FILE.format(index=index, count=count))
+
+def _shard_files(staging_dir: str) -> List[Tuple[int, int, str]]:
+    """(index, count, path) of the shard staging databases in a folder, by index"""
+    shards = []
+    for name in os.listdir(staging_dir):
+        match = SHARD_STAGING_PATTERN.match(name)
+        if match:
+            shards.append((int(match.group(1)), int(match.group(2)), os.path.join(staging_dir, name)))
+    return sorted(shards)
+
+def _shard_spec(value: str) -> Tuple[int, int]:
+    """argparse type for --shard INDEX/COUNT"""
+    match = re.fullmatch(r'(\d+)/(\d+)', value)
+    if not match or int(match.group(1)) >= int(match.group(2)):
+        raise argparse.ArgumentTypeError(f"expected INDEX/COUNT with 0 <= INDEX < COUNT, got '{value}'")
+    return int(match.group(1)), int(match.group(2))
+
+def _snapshot_column(values: Tuple, dtype) -> np.ndarray:
+    """Snapshot column from fetched values; NULL becomes NaN in float and -1 in integer columns"""
+    if dtype is object:
+        return np.array(values, dtype=object)
+    if dtype is str:
+        return np.array(['' if value is None else value for value in values], dtype=str) if values else np.array([], dtype='U1')
+    if np.issubdtype(dtype, np.floating):
+        return np.array([np.nan if value is None else float(value) for value in values], dtype=dtype)
+    return np.array([-1 if value is None else int(value) for value in values], dtype=dtype)
+
+def _snapshot_positions(keys: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Position of each value in the (unsorted, unique) `keys` array, or -1 when it is missing"""
+    if not len(keys):
+        return np.full(len(values), -1, dtype=np.int64)
+    sorter = np.argsort(keys)
+    found = np.minimum(np.searchsorted(keys, values, sorter=sorter), len(keys) - 1)
+    return np.where(keys[sorter[found]] == values, sorter[found], -1)
+
+def _snapshot_version(path: str) -> Optional[str]:
+    """Name of the snapshot version folder the pointer file at `path` names, or None if there is none"""
+    try:
+        with open(os.path.join(path, SNAPSHOT_POINTER), encoding='utf-8') as file:
+            return file.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def _snapshot_find(sorted_keys: np.ndarray, key: str) -> Optional[int]:
+    """Index of `key` in a sorted string array, or None"""
+    index = int(np.searchsorted(sorted_keys, key))
+    return index if index < len(sorted_keys) and sorted_keys[index] == key else None
+
+def _as_stored(row, decimal_positions: Tuple[int, ...]) -> Tuple:
+    """Row with its DECIMAL(x,2) values rounded as the column stores them, so parsed and stored rows compare equal"""
+    values = list(row)
+    for i in decimal_positions:
+        if values[i] is not None:
+            values[i] = Decimal(str(values[i])).quantize(Decimal('0.01'), ROUND_HALF_UP)
+    return tuple(values)
+
+def _round_hundredths(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """numerator / denominator (hundredths, denominator > 0) rounded to an integer, half away from zero"""
+    return np.sign(numerator) * ((2 * np.abs(numerator) + denominator) // (2 * denominator))
+
+def _write_atomic(path: str, content: str):
+    """Write a file through a temporary sibling so readers never see it half-written"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        file.write(content)
+    os.replace(tmp_path, path)
+
+def _extract_and_parse(pdf_path: str, source: Optional[Dict] = None) -> Tuple[Optional[Dict], Dict]:
+    """Extract and parse a single PDF; runs in worker processes so it never touches the database.
+
+    `source` is the file's manifest entry, whose content hash keys the page cache.
+
+    Returns the parsed transcript (or None) and the stage timings plus failure reason, if any.
+    """
+    timings = {}
+    started = time.perf_counter()
+    try:
+        etl = TranscriptETL({})
+        text = etl.extract_pdf_text(pdf_path, source)
+        timings['extract'] = time.perf_counter() - started
+        timings['pages'] = dict(etl.metrics.pages)
+        if not text:
+            timings['error'] = 'extract_empty'
+            return None, timings
+        data = etl.parse_transcript(text)
+        timings['parse'] = time.perf_counter() - started - timings['extract']
+        if not data:
+            timings['error'] = 'parse_failed'
+        return data, timings
+    except Exception as e:
+        logger.error(f"Error processing {os.path.basename(pdf_path)}: {e}")
+        timings['error'] = f"exception_{type(e).__name__}"
+        return None, timings
+    finally:
+        timings['pdf'] = time.perf_counter() - started
+
 def main():
-    etl = TranscriptETL(DB_CONFIG)
+    parser = argparse.ArgumentParser(description="ETL pipeline for academic transcript PDFs")
+    parser.add_argument('--workers', type=int, default=1, help="Number of processes for PDF extraction/parsing (default: 1)")
+    parser.add_argument('--batch-size', type=int, default=100, help="Transcripts loaded per database transaction (default: 100)")
+    parser.add_argument('--force', action='store_true', help="Reprocess every PDF, ignoring the ingest manifest")
+    parser.add_argument('--full-rebuild', action='store_true', help="Recompute all of Fact_Analisis_MataKuliah instead of only the course-semesters touched by this run")
+    parser.add_argument('--queue-size', type=int, default=None, help="Parsed transcripts allowed to wait for the loader (default: batch size)")
+    parser.add_argument('--commit-interval', type=float, default=None, metavar='SECONDS', help="Also commit a partial batch once this many seconds have passed since the last commit")
+    parser.add_argument('--resume', action='store_true', help="Continue the interrupted run of the folder from its last commit instead of starting a new run")
+    parser.add_argument('--writers', type=int, default=1, help="Concurrent database writers, each loading a disjoint set of students on its own connection (default: 1; MySQL only)")
+    parser.add_argument('--backend', choices=['mysql', 'sqlite'], default='mysql', help="Warehouse backend: MySQL server (default) or an embedded SQLite file")
+    parser.add_argument('--sqlite-path', default='warehouse.sqlite', help="Database file for --backend sqlite (default: warehouse.sqlite)")
+    parser.add_argument('--parquet', metavar='DIR', default=None, help="After the run, export the star schema tables to Parquet files in DIR")
+    parser.add_argument('--report', default='etl_run_report.json', help="JSON run report with per-stage/per-query timings (default: etl_run_report.json)")
+    parser.add_argument('--prometheus', default=None, help="Also write the run metrics in Prometheus text format to this file")
+    parser.add_argument('--watch', action='store_true', help="Keep running and ingest new or changed PDFs as they appear in the source folder (stop with Ctrl+C or SIGTERM)")
+    parser.add_argument('--poll-interval', type=float, default=2.0, help="Seconds between folder scans in --watch mode where inotify is not available (default: 2)")
+    parser.add_argument('--shard', type=_shard_spec, default=None, metavar='INDEX/COUNT',
+                        help="Process only the PDFs whose file name hashes to this shard (e.g. 0/4) into a staging database under --staging")
+    parser.add_argument('--staging', default='staging', help="Folder with the shard staging databases (default: staging)")
+    parser.add_argument('--merge', action='store_true', help="Merge the shard staging databases in --staging into the warehouse, then run the final aggregation")
+    parser.add_argument('--snapshot', default=SNAPSHOT_PATH, help=f"Folder of the columnar analytics snapshot refreshed after each run (default: {SNAPSHOT_PATH})")
+    parser.add_argument('--no-snapshot', action='store_true', help="Do not refresh the analytics snapshot")
+    parser.add_argument('--pdf-engine', choices=['auto'] + [engine.name for engine in PDF_ENGINES], default='pypdf2',
+                        help="PDF text engine; 'auto' uses the fastest installed library, falling back to PyPDF2 (default: pypdf2)")
+    parser.add_argument('--page-cache', default=PAGE_CACHE_PATH, help=f"Cache file for extracted page text, reused across runs (default: {PAGE_CACHE_PATH})")
+    parser.add_argument('--page-cache-size', type=int, default=PAGE_CACHE_MAX_BYTES >> 20, metavar='MB', help=f"Page cache size limit in MB (default: {PAGE_CACHE_MAX_BYTES >> 20})")
+    parser.add_argument('--no-page-cache', action='store_true', help="Always extract page text from the PDFs")
+    parser.add_argument('--profile', metavar='PDF', default=None, help="Profile extract/parse/load of a single PDF with cProfile instead of processing the folder")
+    args = parser.parse_args()
+    if args.shard and args.merge:
+        parser.error("--merge runs on the warehouse node, not with --shard")
+
+    configure_extraction(args.pdf_engine, None if args.no_page_cache else args.page_cache, args.page_cache_size << 20)
+    logger.info(f"PDF engine: {TEXT_EXTRACTOR.engine.name}, page cache: {'off' if args.no_page_cache else args.page_cache}")
+    if args.shard:
+        # Node shard menulis ke staging SQLite miliknya sendiri; warehouse baru disentuh saat --merge.
+        os.makedirs(args.staging, exist_ok=True)
+        backend = SQLiteBackend(shard_staging_path(args.staging, *args.shard))
+    else:
+        backend = SQLiteBackend(args.sqlite_path) if args.backend == 'sqlite' else MySQLBackend(DB_CONFIG)
+    etl = TranscriptETL(DB_CONFIG, backend, shard=args.shard)
     
     try:
         if not etl.connect_db():
@@ -487,19 +3083,59 @@ def main():
         if not etl.create_warehouse_schema():
             return
         
+        if args.profile:
+            etl.profile_document(args.profile, output='etl_profile.prof', load=True)
+            return
+
+        if args.merge:
+            stats = etl.merge_shards(args.staging, force=args.force, batch_size=args.batch_size)
+            if stats is None:
+                return
+            etl.refresh_aggregates(full_rebuild=args.full_rebuild)
+            if not args.no_snapshot:
+                etl.refresh_snapshot(args.snapshot, full_rebuild=True)
+            if args.parquet:
+                etl.export_parquet(args.parquet)
+            etl.write_run_report(args.report, args.prometheus, stats)
+            return
+
         folder_path = 'source/'
         if not os.path.exists(folder_path):
             os.makedirs(folder_path)
             logger.info(f"Input folder '{folder_path}' created. Please add PDF files to this folder.")
             return
 
+        if args.watch:
+            # Mode daemon: langkah 2 dan 3 berulang setiap ada PDF baru; laporan run ditulis ulang setiap refresh agregat.
+            stop = threading.Event()
+            signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+
+            def after_refresh(totals: Dict[str, int]):
+                if not args.no_snapshot:
+                    # --full-rebuild berlaku untuk refresh pertama (setelah catch-up) saja.
+                    etl.refresh_snapshot(args.snapshot, full_rebuild=args.full_rebuild and etl.snapshot is None)
+                etl.write_run_report(args.report, args.prometheus, totals)
+
+            stats = etl.watch_folder(folder_path, workers=args.workers, batch_size=args.batch_size, writers=args.writers, commit_interval=args.commit_interval,
+                                     force=args.force, resume=args.resume, poll_interval=args.poll_interval, stop=stop, on_refresh=after_refresh,
+                                     full_rebuild=args.full_rebuild)
+            logger.info(f"Watch mode finished. Processed: {stats['processed']}, Failed: {stats['failed']}, Skipped (unchanged): {stats['skipped']}")
+            return
+
         # Langkah 2: Proses semua file (historical/incremental load).
         logger.info("Starting transcript processing...")
-        stats = etl.process_folder(folder_path)
-        logger.info(f"Processing Complete. Processed: {stats['processed']}, Failed: {stats['failed']}")
+        stats = etl.process_folder(folder_path, workers=args.workers, batch_size=args.batch_size, force=args.force, queue_size=args.queue_size,
+                                   writers=args.writers, commit_interval=args.commit_interval, resume=args.resume)
+        logger.info(f"Processing Complete. Processed: {stats['processed']}, Failed: {stats['failed']}, Skipped (unchanged): {stats['skipped']}")
         
-        # Langkah 3: Lakukan agregasi akhir (incremental update).
-        etl.populate_analisis_matakuliah()
+        # Langkah 3: Lakukan agregasi akhir (incremental update); run shard diagregasi sekali setelah --merge.
+        if not args.shard:
+            etl.refresh_aggregates(full_rebuild=args.full_rebuild)
+            if not args.no_snapshot:
+                etl.refresh_snapshot(args.snapshot, full_rebuild=args.full_rebuild)
+        if args.parquet:
+            etl.export_parquet(args.parquet)
+        etl.write_run_report(args.report, args.prometheus, stats)
 
     except Exception as e:
         logger.error(f"Unexpected error in main execution: {e}")
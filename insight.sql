@@ -18,22 +18,22 @@ SELECT NRP, nama_mahasiswa, sks_lulus FROM Dim_Mahasiswa ORDER BY sks_lulus ASC;
 
 -- 7. Distribusi Mahasiswa Berdasarkan Status
 -- Insight: Memahami komposisi mahasiswa (misal: aktif, cuti, lulus)
-SELECT status_mahasiswa, COUNT(id_mahasiswa) AS jumlah_mahasiswa FROM Dim_Mahasiswa GROUP BY status_mahasiswa;
+SELECT status_mahasiswa, jumlah_mahasiswa FROM Insight_Status;
 
 -- 8. Perbandingan IP Tahap Persiapan vs. Sarjana
 SELECT NRP, nama_mahasiswa, ip_persiapan, ip_sarjana, (ip_sarjana - ip_persiapan) AS perubahan_ip FROM Dim_Mahasiswa WHERE status_mahasiswa = 'Normal/Aktif' ORDER BY perubahan_ip DESC;
 
 -- 9. Mata Kuliah dengan Nilai Rata-rata Tertinggi/Terendah
-SELECT dm.kode_mk, dm.nama_mk, AVG(dn.bobot_nilai) AS rata_rata_bobot_nilai FROM Fact_Transkrip ft JOIN Dim_MataKuliah dm ON ft.id_mk = dm.id_mk JOIN Dim_Nilai dn ON ft.id_nilai = dn.id_nilai GROUP BY dm.kode_mk, dm.nama_mk ORDER BY rata_rata_bobot_nilai DESC;
+SELECT dm.kode_mk, dm.nama_mk, im.rata_rata_bobot_nilai FROM Insight_MataKuliah im JOIN Dim_MataKuliah dm ON im.id_mk = dm.id_mk ORDER BY im.rata_rata_bobot_nilai DESC;
 
 -- 10. Mata Kuliah Paling banyak Diambil
-SELECT dm.kode_mk, dm.nama_mk, COUNT(ft.id_transkrip) AS jumlah_pengambil FROM Fact_Transkrip ft JOIN Dim_MataKuliah dm ON ft.id_mk = dm.id_mk GROUP BY dm.kode_mk, dm.nama_mk ORDER BY jumlah_pengambil DESC;
+SELECT dm.kode_mk, dm.nama_mk, im.jumlah_pengambil_mk AS jumlah_pengambil FROM Insight_MataKuliah im JOIN Dim_MataKuliah dm ON im.id_mk = dm.id_mk ORDER BY im.jumlah_pengambil_mk DESC;
 
 -- 11. Sebaran Nilai untuk Mata Kuliah Tertentu (Sistem Basis Data)
-SELECT dm.nama_mk, dn.huruf_nilai, COUNT(ft.id_transkrip) AS jumlah_mahasiswa FROM Fact_Transkrip ft JOIN Dim_MataKuliah dm ON ft.id_mk = dm.id_mk JOIN Dim_Nilai dn ON ft.id_nilai = dn.id_nilai WHERE dm.nama_mk = 'Sistem Basis Data' GROUP BY dm.nama_mk, dn.huruf_nilai ORDER BY dn.bobot_nilai DESC;
+SELECT dm.nama_mk, dn.huruf_nilai, SUM(isn.jumlah_mahasiswa) AS jumlah_mahasiswa FROM Insight_SebaranNilai isn JOIN Dim_MataKuliah dm ON isn.id_mk = dm.id_mk JOIN Dim_Nilai dn ON isn.id_nilai = dn.id_nilai WHERE dm.nama_mk = 'Sistem Basis Data' GROUP BY dm.nama_mk, dn.huruf_nilai, dn.bobot_nilai ORDER BY dn.bobot_nilai DESC;
 
 -- 12. Sebaran Nilai untuk Mata Kuliah Tertentu (Administrasi Basis Data)
-SELECT dm.nama_mk, dn.huruf_nilai, COUNT(ft.id_transkrip) AS jumlah_mahasiswa FROM Fact_Transkrip ft JOIN Dim_MataKuliah dm ON ft.id_mk = dm.id_mk JOIN Dim_Nilai dn ON ft.id_nilai = dn.id_nilai WHERE dm.nama_mk = 'Administrasi Basis Data' GROUP BY dm.nama_mk, dn.huruf_nilai ORDER BY dn.bobot_nilai DESC;
+SELECT dm.nama_mk, dn.huruf_nilai, SUM(isn.jumlah_mahasiswa) AS jumlah_mahasiswa FROM Insight_SebaranNilai isn JOIN Dim_MataKuliah dm ON isn.id_mk = dm.id_mk JOIN Dim_Nilai dn ON isn.id_nilai = dn.id_nilai WHERE dm.nama_mk = 'Administrasi Basis Data' GROUP BY dm.nama_mk, dn.huruf_nilai, dn.bobot_nilai ORDER BY dn.bobot_nilai DESC;
 
 -- 13. Mata Kuliah dengan Tingkat Kelulusan Tertinggi/Terendah per Semester
 SELECT dm.nama_mk, dw.tahun, dw.semester, fk.jml_mahasiswa_lulus AS jumlah_lulus, fk.jml_mahasiswa_tidak_lulus AS jumlah_tidak_lulus, (fk.jml_mahasiswa_lulus * 100.0 / (fk.jml_mahasiswa_lulus + fk.jml_mahasiswa_tidak_lulus)) AS persentase_kelulusan FROM Fact_Kelulusan fk JOIN Dim_MataKuliah dm ON fk.id_mk = dm.id_mk JOIN Dim_Waktu dw ON fk.id_waktu = dw.id_waktu ORDER BY persentase_kelulusan DESC;
@@ -54,7 +54,7 @@ SELECT dm.NRP, dm.nama_mahasiswa, dw.tahun, dw.semester, fps.perubahan_ips FROM
 SELECT dm.kode_mk, dm.nama_mk, fam.rata_rata_bobot_nilai, dw.tahun, dw.semester FROM Fact_Analisis_MataKuliah fam JOIN Dim_MataKuliah dm ON fam.id_mk = dm.id_mk JOIN Dim_Waktu dw ON fam.id_waktu = dw.id_waktu ORDER BY fam.rata_rata_bobot_nilai DESC;
 
 -- 19. Rata  rata IPK Kumulatif tiap semester
-SELECT dw.tahun, dw.semester, AVG(dm.ipk_kumulatif) AS rata_rata_ipk_kumulatif FROM Dim_Mahasiswa dm JOIN Fact_Prestasi_Semester fps ON dm.id_mahasiswa = fps.id_mahasiswa JOIN Dim_Waktu dw ON fps.id_waktu = dw.id_waktu GROUP BY dw.tahun, dw.semester ORDER BY dw.tahun ASC, dw.semester ASC;
+SELECT dw.tahun, dw.semester, ise.rata_rata_ipk_kumulatif FROM Insight_Semester ise JOIN Dim_Waktu dw ON ise.id_waktu = dw.id_waktu ORDER BY dw.tahun ASC, dw.semester ASC;
 
 -- 20. Distribusi Nilai (A, AB, B, dst.) per Mata Kuliah (Administrasi Basis Data)
 SELECT dm.nama_mk, fam.jumlah_nilai_A, fam.jumlah_nilai_AB, fam.jumlah_nilai_B, fam.jumlah_nilai_BC, fam.jumlah_nilai_C, fam.jumlah_nilai_D, fam.jumlah_nilai_E, dw.tahun, dw.semester FROM Fact_Analisis_MataKuliah fam JOIN Dim_MataKuliah dm ON fam.id_mk = dm.id_mk JOIN Dim_Waktu dw ON fam.id_waktu = dw.id_waktu WHERE dm.nama_mk = 'Administrasi Basis Data' ORDER BY dw.tahun DESC, dw.semester DESC;
@@ -63,7 +63,7 @@ SELECT dm.nama_mk, fam.jumlah_nilai_A, fam.jumlah_nilai_AB, fam.jumlah_nilai_B,
 SELECT dm.nama_mk, fam.jumlah_nilai_A, fam.jumlah_nilai_AB, fam.jumlah_nilai_B, fam.jumlah_nilai_BC, fam.jumlah_nilai_C, fam.jumlah_nilai_D, fam.jumlah_nilai_E, dw.tahun, dw.semester FROM Fact_Analisis_MataKuliah fam JOIN Dim_MataKuliah dm ON fam.id_mk = dm.id_mk JOIN Dim_Waktu dw ON fam.id_waktu = dw.id_waktu WHERE dm.nama_mk = 'Sistem Basis Data' ORDER BY dw.tahun DESC, dw.semester DESC;
 
 -- 22 . Mahasiswa dengan IPK Kumulatif di atas rata-rata
-SELECT NRP, nama_mahasiswa, ipk_kumulatif FROM Dim_Mahasiswa WHERE ipk_kumulatif > (SELECT AVG(ipk_kumulatif) FROM Dim_Mahasiswa);
+SELECT NRP, nama_mahasiswa, ipk_kumulatif FROM Dim_Mahasiswa WHERE ipk_kumulatif > (SELECT SUM(total_ipk_kumulatif) / SUM(jumlah_ipk) FROM Insight_Status);
 
 -- 23 . 10 Mata Kuliah dengan SKS Terbesar
 SELECT kode_mk, nama_mk, sks_mk FROM Dim_MataKuliah ORDER BY sks_mk DESC LIMIT 10;
@@ -75,16 +75,16 @@ SELECT dm.tahap_mk, COUNT(DISTINCT ft.id_mahasiswa) AS jumlah_mahasiswa FROM Fac
 SELECT NRP, nama_mahasiswa, ip_sarjana FROM Dim_Mahasiswa WHERE status_mahasiswa = 'Normal/Aktif' ORDER BY ip_sarjana ASC LIMIT 5;
 
 -- 26 . Semester dengan Rata-rata IPK Tertinggi
-SELECT dw.tahun, dw.semester, AVG(fps.ips) AS rata_rata_ips_semester FROM Fact_Prestasi_Semester fps JOIN Dim_Waktu dw ON fps.id_waktu = dw.id_waktu GROUP BY dw.tahun, dw.semester ORDER BY rata_rata_ips_semester DESC;
+SELECT dw.tahun, dw.semester, ise.rata_rata_ips AS rata_rata_ips_semester FROM Insight_Semester ise JOIN Dim_Waktu dw ON ise.id_waktu = dw.id_waktu ORDER BY ise.rata_rata_ips DESC;
 
 -- 27 . Mata Kuliah dengan Jumlah Mahasiswa Tidak Lulus Terbanyak per Semester
 SELECT dm.nama_mk, dw.tahun, dw.semester, fk.jml_mahasiswa_tidak_lulus FROM Fact_Kelulusan fk JOIN Dim_MataKuliah dm ON fk.id_mk = dm.id_mk JOIN Dim_Waktu dw ON fk.id_waktu = dw.id_waktu ORDER BY fk.jml_mahasiswa_tidak_lulus DESC;
 
 -- 28 . Rata-rata SKS Diambil per Semester oleh Mahasiswa Aktif
-SELECT dw.tahun, dw.semester, AVG(fps.sks_diambil_semester) AS rata_rata_sks_diambil FROM Fact_Prestasi_Semester fps JOIN Dim_Waktu dw ON fps.id_waktu = dw.id_waktu JOIN Dim_Mahasiswa dm ON fps.id_mahasiswa = dm.id_mahasiswa WHERE dm.status_mahasiswa = 'Normal/Aktif' GROUP BY dw.tahun, dw.semester ORDER BY dw.tahun ASC, dw.semester ASC;
+SELECT dw.tahun, dw.semester, ise.rata_rata_sks_diambil_aktif AS rata_rata_sks_diambil FROM Insight_Semester ise JOIN Dim_Waktu dw ON ise.id_waktu = dw.id_waktu WHERE ise.rata_rata_sks_diambil_aktif IS NOT NULL ORDER BY dw.tahun ASC, dw.semester ASC;
 
 -- 29 . Jumlah Mahasiswa Baru per Tahun (Berdasarkan NRP unik dan tahun awal tercatat)
-SELECT SUBSTRING(NRP, 5, 2) AS tahun_angkatan, COUNT(DISTINCT id_mahasiswa) AS jumlah_mahasiswa FROM Dim_Mahasiswa GROUP BY tahun_angkatan ORDER BY tahun_angkatan ASC;
+SELECT tahun_angkatan, jumlah_mahasiswa FROM Insight_Angkatan ORDER BY tahun_angkatan ASC;
 
 -- 30 . Mata Kuliah dengan Variasi Nilai Terbanyak
-SELECT dm.nama_mk, COUNT(DISTINCT dn.huruf_nilai) AS jumlah_variasi_nilai FROM Fact_Transkrip ft JOIN Dim_MataKuliah dm ON ft.id_mk = dm.id_mk JOIN Dim_Nilai dn ON ft.id_nilai = dn.id_nilai GROUP BY dm.nama_mk ORDER BY jumlah_variasi_nilai DESC;
+SELECT dm.nama_mk, COUNT(DISTINCT dn.huruf_nilai) AS jumlah_variasi_nilai FROM Insight_SebaranNilai isn JOIN Dim_MataKuliah dm ON isn.id_mk = dm.id_mk JOIN Dim_Nilai dn ON isn.id_nilai = dn.id_nilai GROUP BY dm.nama_mk ORDER BY jumlah_variasi_nilai DESC;